@@ -26,17 +26,44 @@ class Settings(BaseSettings):
 
     # Crawl4AI configuration
     CRAWL4AI_MAX_PAGES: int = int(os.getenv("CRAWL4AI_MAX_PAGES", "6"))
+    # Try a plain HTTP fetch first and only launch the browser for JS-rendered pages
+    CRAWL_HTTP_FIRST: bool = os.getenv("CRAWL_HTTP_FIRST", "True").lower() == "true"
     
     # HubSpot API
     HUBSPOT_API_KEY: str = os.getenv("HUBSPOT_API_KEY", "")
     HUBSPOT_OAUTH_CLIENT_ID: str = os.getenv("HUBSPOT_OAUTH_CLIENT_ID", "")
     HUBSPOT_OAUTH_CLIENT_SECRET: str = os.getenv("HUBSPOT_OAUTH_CLIENT_SECRET", "")
     HUBSPOT_REDIRECT_URI: str = os.getenv("HUBSPOT_REDIRECT_URI", "http://localhost:8000/api/v1/hubspot/callback")
+    # Private app limit is 100 requests per 10 s per portal (150 on Pro/Enterprise)
+    HUBSPOT_RATE_LIMIT_PER_10S: int = int(os.getenv("HUBSPOT_RATE_LIMIT_PER_10S", "100"))
+    HUBSPOT_BATCH_CONCURRENCY: int = int(os.getenv("HUBSPOT_BATCH_CONCURRENCY", "4"))
+    # Domain for synthetic lead emails when a business has none (.example is reserved, never delivered)
+    LEAD_PLACEHOLDER_EMAIL_DOMAIN: str = os.getenv("LEAD_PLACEHOLDER_EMAIL_DOMAIN", "business.example")
+    # Seconds a contact search result page is served from cache (0 disables)
+    HUBSPOT_SEARCH_CACHE_TTL: int = int(os.getenv("HUBSPOT_SEARCH_CACHE_TTL", "30"))
+    
+    # Pooled HTTP sessions for CRM APIs (keep-alive connections per provider)
+    HTTP_POOL_MAXSIZE: int = int(os.getenv("HTTP_POOL_MAXSIZE", "20"))
+    HTTP_MAX_RETRIES: int = int(os.getenv("HTTP_MAX_RETRIES", "3"))
+    # Bulk CRM push pipeline: max concurrent calls per provider and batches buffered ahead of the workers
+    CRM_PUSH_MAX_CONCURRENCY: int = int(os.getenv("CRM_PUSH_MAX_CONCURRENCY", "8"))
+    CRM_PUSH_QUEUE_SIZE: int = int(os.getenv("CRM_PUSH_QUEUE_SIZE", "16"))
+    # A running push job whose owner has not written a heartbeat for this long may be claimed by another worker
+    CRM_PUSH_LEASE_SECONDS: int = int(os.getenv("CRM_PUSH_LEASE_SECONDS", "120"))
     
     # Search Settings
     SEARCH_RADIUS: int = 5000  # meters
     MAX_RESULTS: int = 50
     FREE_USER_MAX_RESULTS: int = int(os.getenv("FREE_USER_MAX_RESULTS", "2"))
+    # Entity resolution compares records pairwise only inside blocks up to this size
+    ENTITY_MAX_BLOCK_SIZE: int = int(os.getenv("ENTITY_MAX_BLOCK_SIZE", "200"))
+    # Streamed provider uploads are mapped and deduplicated this many items at a time
+    IMPORT_STREAM_BATCH_SIZE: int = int(os.getenv("IMPORT_STREAM_BATCH_SIZE", "500"))
+    # CSV / Parquet / XLSX exports convert and write this many rows at a time
+    EXPORT_CHUNK_SIZE: int = int(os.getenv("EXPORT_CHUNK_SIZE", "5000"))
+    # Successful searches close their credit reservation in batches of this size (or after this many seconds)
+    CREDIT_SETTLE_BATCH_SIZE: int = int(os.getenv("CREDIT_SETTLE_BATCH_SIZE", "50"))
+    CREDIT_SETTLE_INTERVAL: float = float(os.getenv("CREDIT_SETTLE_INTERVAL", "5"))
     
     # Server Configuration
     API_HOST: str = os.getenv("API_HOST", "0.0.0.0")
@@ -52,20 +79,41 @@ class Settings(BaseSettings):
     IP_WHITELIST: str = os.getenv("IP_WHITELIST", "")
     # Admin bypass token: if provided in header 'x-admin-bypass-token' will bypass limits
     ADMIN_BYPASS_TOKEN: str = os.getenv("ADMIN_BYPASS_TOKEN", "")
+    # Anonymous limit counters: "sqlite" (shared per host), "redis" (shared across hosts) or "memory"
+    # (per process, flushed to SQLite; only valid with a single worker)
+    RATE_LIMIT_BACKEND: str = os.getenv("RATE_LIMIT_BACKEND", "sqlite")
+    RATE_LIMIT_REDIS_URL: str = os.getenv("RATE_LIMIT_REDIS_URL", "redis://localhost:6379/0")
+    RATE_LIMIT_FLUSH_INTERVAL: float = float(os.getenv("RATE_LIMIT_FLUSH_INTERVAL", "5"))
     # Zoho CRM
     ZOHO_ACCESS_TOKEN: str = os.getenv("ZOHO_ACCESS_TOKEN", "")
     ZOHO_BASE_URL: str = os.getenv("ZOHO_BASE_URL", "https://www.zohoapis.com/crm/v2")
+    # Zoho caps concurrent calls per org (10+ depending on edition) and bills API credits per call
+    ZOHO_RATE_LIMIT_PER_MINUTE: int = int(os.getenv("ZOHO_RATE_LIMIT_PER_MINUTE", "100"))
+    ZOHO_BATCH_CONCURRENCY: int = int(os.getenv("ZOHO_BATCH_CONCURRENCY", "4"))
 
     # Salesforce
     SALESFORCE_ACCESS_TOKEN: str = os.getenv("SALESFORCE_ACCESS_TOKEN", "")
     SALESFORCE_INSTANCE_URL: str = os.getenv("SALESFORCE_INSTANCE_URL", "")
     SALESFORCE_API_VERSION: str = os.getenv("SALESFORCE_API_VERSION", "52.0")
+    # Batches at or above this size use Bulk API 2.0 jobs instead of sObject Collections
+    SALESFORCE_BULK_THRESHOLD: int = int(os.getenv("SALESFORCE_BULK_THRESHOLD", "2000"))
+    SALESFORCE_BATCH_CONCURRENCY: int = int(os.getenv("SALESFORCE_BATCH_CONCURRENCY", "4"))
     
     # Logging Configuration
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
 
     # Database
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./leadgen.sqlite")
+    # Async routes; derived from DATABASE_URL (aiosqlite/asyncpg/aiomysql) when empty
+    DATABASE_ASYNC_URL: str = os.getenv("DATABASE_ASYNC_URL", "")
+    # Connection pool for server databases (ignored for SQLite)
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    DB_POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    # SQLite: wait this long for the write lock instead of failing with "database is locked"
+    SQLITE_BUSY_TIMEOUT_MS: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    SQLITE_MMAP_SIZE: int = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
 
     # Auth
     GOOGLE_CLIENT_ID: str = os.getenv("GOOGLE_CLIENT_ID", "")
@@ -73,6 +121,9 @@ class Settings(BaseSettings):
     JWT_ALGORITHM: str = os.getenv("JWT_ALGORITHM", "HS256")
     JWT_EXPIRES_MINUTES: int = int(os.getenv("JWT_EXPIRES_MINUTES", "10080"))
     COOKIE_SECURE: bool = os.getenv("COOKIE_SECURE", "False").lower() == "true"
+    # Seconds a verified token / loaded user is reused before checking again
+    AUTH_TOKEN_CACHE_TTL: int = int(os.getenv("AUTH_TOKEN_CACHE_TTL", "300"))
+    AUTH_USER_CACHE_TTL: int = int(os.getenv("AUTH_USER_CACHE_TTL", "30"))
 
     # Stripe
     STRIPE_SECRET_KEY: str = os.getenv("STRIPE_SECRET_KEY", "")
@@ -1,5 +1,5 @@
 """Database package exports."""
-from app.db.session import Base, SessionLocal, get_db, init_db
+from app.db.session import Base, SessionLocal, create_db_engine, get_async_db, get_db, init_db
 from app.db import models
 
-__all__ = ["Base", "SessionLocal", "get_db", "init_db", "models"]
+__all__ = ["Base", "SessionLocal", "create_db_engine", "get_async_db", "get_db", "init_db", "models"]
@@ -1,6 +1,6 @@
-"""Database models for auth and billing."""
+"""Database models for auth, billing, credit ledger, stored leads, saved searches and CRM sync/push state."""
 from datetime import datetime
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, UniqueConstraint
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Index, Integer, String, Text, UniqueConstraint
 from sqlalchemy.orm import relationship
 from app.db.session import Base
 
@@ -39,3 +39,194 @@ class CreditCheckout(Base):
     completed_at = Column(DateTime, nullable=True)
 
     user = relationship("User", back_populates="checkouts")
+
+
+class CrmContact(Base):
+    """Local copy of a CRM contact, indexed for duplicate checks before pushes."""
+
+    __tablename__ = "crm_contacts"
+    __table_args__ = (
+        UniqueConstraint("provider", "external_id", name="uq_crm_contact"),
+        Index("ix_crm_contacts_email", "provider", "email"),
+        Index("ix_crm_contacts_email_domain", "provider", "email_domain"),
+        Index("ix_crm_contacts_website_domain", "provider", "website_domain"),
+        Index("ix_crm_contacts_phone", "provider", "phone_key"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    provider = Column(String(32), nullable=False)
+    external_id = Column(String(64), nullable=False)
+    email = Column(String(255), nullable=True)
+    email_domain = Column(String(255), nullable=True)
+    website_domain = Column(String(255), nullable=True)
+    phone = Column(String(64), nullable=True)
+    phone_key = Column(String(16), nullable=True)
+    firstname = Column(String(255), nullable=True)
+    lastname = Column(String(255), nullable=True)
+    company = Column(String(255), nullable=True)
+    website = Column(String(512), nullable=True)
+    modified_at = Column(DateTime, nullable=True)
+    synced_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+
+class CrmSyncState(Base):
+    """Incremental sync cursor per CRM provider."""
+
+    __tablename__ = "crm_sync_state"
+
+    provider = Column(String(32), primary_key=True)
+    modified_cursor = Column(DateTime, nullable=True)
+    last_synced_at = Column(DateTime, nullable=True)
+    contacts = Column(Integer, nullable=False, default=0)
+
+
+class CrmPushJob(Base):
+    """A bulk push of leads to a CRM, checkpointed so it can resume after a restart."""
+
+    __tablename__ = "crm_push_jobs"
+
+    id = Column(String(36), primary_key=True)
+    provider = Column(String(32), nullable=False)
+    # Owner of the pushed leads; None for anonymous pushes
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True, index=True)
+    status = Column(String(16), nullable=False, default="queued", index=True)
+    # Worker process running the job; updated_at doubles as its heartbeat
+    owner = Column(String(128), nullable=True)
+    total = Column(Integer, nullable=False, default=0)
+    succeeded = Column(Integer, nullable=False, default=0)
+    failed = Column(Integer, nullable=False, default=0)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+    finished_at = Column(DateTime, nullable=True)
+
+
+class CrmPushItem(Base):
+    """One lead of a push job and its outcome."""
+
+    __tablename__ = "crm_push_items"
+    __table_args__ = (Index("ix_crm_push_items_job_status", "job_id", "status", "seq"),)
+
+    id = Column(Integer, primary_key=True)
+    job_id = Column(String(36), ForeignKey("crm_push_jobs.id"), nullable=False)
+    seq = Column(Integer, nullable=False)
+    payload = Column(Text, nullable=False)
+    # pending -> sending (call in flight) -> done/failed; resend = may have been applied, send as an upsert
+    status = Column(String(16), nullable=False, default="pending")
+    external_id = Column(String(64), nullable=True)
+    error = Column(Text, nullable=True)
+
+
+class Business(Base):
+    """A business seen in search results, upserted on its place_id (or cid)."""
+
+    __tablename__ = "businesses"
+    __table_args__ = (
+        Index("ix_businesses_domain", "domain"),
+        Index("ix_businesses_phone_key", "phone_key"),
+        Index("ix_businesses_geohash", "geohash"),
+        Index("ix_businesses_lat_lng", "latitude", "longitude"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    # place_id, or "cid:<cid>" for provider results without one
+    source_key = Column(String(255), unique=True, nullable=False)
+    place_id = Column(String(255), nullable=True)
+    cid = Column(String(64), nullable=True, index=True)
+    # "google_places", "provider" or "import"; decides which values win on upsert and merge
+    source = Column(String(32), nullable=True)
+    # Smallest business id of the real-world business this row belongs to (see EntityResolver)
+    entity_id = Column(Integer, nullable=True, index=True)
+    name = Column(String(512), nullable=False)
+    primary_type = Column(String(128), nullable=True)
+    phone = Column(String(64), nullable=True)
+    phone_key = Column(String(16), nullable=True)
+    website = Column(String(1024), nullable=True)
+    domain = Column(String(255), nullable=True)
+    formatted_address = Column(Text, nullable=True)
+    city = Column(String(255), nullable=True)
+    state = Column(String(255), nullable=True)
+    country = Column(String(255), nullable=True)
+    postal_code = Column(String(32), nullable=True)
+    latitude = Column(Float, nullable=True)
+    longitude = Column(Float, nullable=True)
+    geohash = Column(String(12), nullable=True)
+    rating = Column(Float, nullable=True)
+    user_ratings_total = Column(Integer, nullable=True)
+    # Latest full BusinessResponse payload
+    data = Column(Text, nullable=False)
+    contacts_enriched_at = Column(DateTime, nullable=True)
+    contacts_confidence = Column(Float, nullable=True)
+    first_seen_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+
+class BusinessContact(Base):
+    """A contact found on a stored business's website."""
+
+    __tablename__ = "business_contacts"
+
+    id = Column(Integer, primary_key=True)
+    business_id = Column(Integer, ForeignKey("businesses.id"), nullable=False, index=True)
+    name = Column(String(255), nullable=False)
+    title = Column(String(255), nullable=True)
+    email = Column(String(255), nullable=True, index=True)
+    phone = Column(String(64), nullable=True)
+    phone_key = Column(String(16), nullable=True, index=True)
+    source_url = Column(String(1024), nullable=True)
+    # Full extracted Contact payload
+    data = Column(Text, nullable=False)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+
+class SearchRunResult(Base):
+    """Ordered link from a saved search run to the businesses it returned."""
+
+    __tablename__ = "search_run_results"
+
+    search_run_id = Column(String(36), ForeignKey("search_runs.id"), primary_key=True)
+    position = Column(Integer, primary_key=True)
+    business_id = Column(Integer, ForeignKey("businesses.id"), nullable=False, index=True)
+
+
+class SearchRun(Base):
+    """Results of a business search, kept so they can be exported server side."""
+
+    __tablename__ = "search_runs"
+
+    id = Column(String(36), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True, index=True)
+    route = Column(String(64), nullable=False)
+    query = Column(Text, nullable=False)
+    total_results = Column(Integer, nullable=False, default=0)
+    # Results without a place_id or cid; the others are linked through search_run_results
+    results = Column(Text, nullable=False)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
+
+
+class CreditReservation(Base):
+    """Credits held for an in-flight search; settled when it succeeds, refunded otherwise."""
+
+    __tablename__ = "credit_reservations"
+    __table_args__ = (Index("ix_credit_reservations_status", "status", "created_at"),)
+
+    id = Column(String(36), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    amount = Column(Integer, nullable=False)
+    reason = Column(String(64), nullable=False)
+    status = Column(String(16), nullable=False, default="reserved")
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    resolved_at = Column(DateTime, nullable=True)
+
+
+class CreditLedgerEntry(Base):
+    """Append-only audit log of every change to a user's credit balance."""
+
+    __tablename__ = "credit_ledger"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    delta = Column(Integer, nullable=False)
+    reason = Column(String(64), nullable=False)
+    reference = Column(String(255), nullable=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
@@ -1,5 +1,7 @@
 """Database session and initialization."""
-from sqlalchemy import create_engine
+from typing import Any, Dict, Optional
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
 from app.config import settings
 
@@ -8,11 +10,57 @@ class Base(DeclarativeBase):
     """Base class for ORM models."""
 
 
-connect_args = {}
-if settings.DATABASE_URL.startswith("sqlite"):
-    connect_args = {"check_same_thread": False}
+# Async drivers used when no DATABASE_ASYNC_URL is configured
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "mysql": "mysql+aiomysql",
+}
 
-engine = create_engine(settings.DATABASE_URL, connect_args=connect_args)
+
+def _is_sqlite_file(url: str) -> bool:
+    parsed = make_url(url)
+    return parsed.get_backend_name() == "sqlite" and parsed.database not in (None, "", ":memory:")
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """Per-connection SQLite tuning: WAL lets readers run alongside the single writer."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+    cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+    cursor.close()
+
+
+def _engine_options(url: str) -> Dict[str, Any]:
+    if make_url(url).get_backend_name() == "sqlite":
+        return {"connect_args": {"check_same_thread": False, "timeout": settings.SQLITE_BUSY_TIMEOUT_MS / 1000}}
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": True,
+    }
+
+
+def create_db_engine(url: Optional[str] = None, **overrides: Any) -> Engine:
+    """Create an engine tuned for the database behind `url`.
+
+    SQLite files get WAL, synchronous=NORMAL, a busy timeout and mmap on every
+    connection; server databases get a sized, pre-pinged connection pool.
+    """
+    url = url or settings.DATABASE_URL
+    options = _engine_options(url)
+    options.update(overrides)
+    db_engine = create_engine(url, **options)
+    if _is_sqlite_file(url):
+        event.listen(db_engine, "connect", _set_sqlite_pragmas)
+    return db_engine
+
+
+engine = create_db_engine()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
@@ -30,3 +78,51 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def _async_url(url: str) -> str:
+    # The sync driver named in DATABASE_URL (e.g. postgresql+psycopg2) is replaced, not kept
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is None:
+        raise ValueError(f"No async driver known for {parsed.get_backend_name()}; set DATABASE_ASYNC_URL")
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+
+def create_async_db_engine(url: Optional[str] = None, **overrides: Any):
+    """Create an AsyncEngine with the same tuning as create_db_engine.
+
+    Needs the async driver for the backend (aiosqlite, asyncpg, ...).
+    """
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    url = url or settings.DATABASE_ASYNC_URL or _async_url(settings.DATABASE_URL)
+    options = _engine_options(url)
+    if make_url(url).get_backend_name() == "sqlite":
+        options["connect_args"] = {"timeout": settings.SQLITE_BUSY_TIMEOUT_MS / 1000}
+    options.update(overrides)
+    async_engine = create_async_engine(url, **options)
+    if _is_sqlite_file(url):
+        event.listen(async_engine.sync_engine, "connect", _set_sqlite_pragmas)
+    return async_engine
+
+
+_async_engine = None
+_async_session_factory = None
+
+
+def get_async_session_factory():
+    """Return the process-wide async_sessionmaker, creating the engine on first use."""
+    global _async_engine, _async_session_factory
+    if _async_session_factory is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker
+
+        _async_engine = create_async_db_engine()
+        _async_session_factory = async_sessionmaker(_async_engine, autoflush=False, expire_on_commit=False)
+    return _async_session_factory
+
+
+async def get_async_db():
+    """Provide an AsyncSession for async routes."""
+    async with get_async_session_factory()() as db:
+        yield db
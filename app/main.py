@@ -7,7 +7,7 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import settings
 from app.db import init_db
-from app.routes import businesses, hubspot, zoho, salesforce, enrichment, auth, billing, agent
+from app.routes import businesses, hubspot, zoho, salesforce, crm, enrichment, auth, billing, agent
 
 # Configure logging early so app/service loggers emit output
 logging.basicConfig(
@@ -41,6 +41,7 @@ app.include_router(businesses.router, prefix="/api/v1", tags=["businesses"])
 app.include_router(hubspot.router, prefix="/api/v1", tags=["hubspot"])
 app.include_router(zoho.router, prefix="/api/v1", tags=["zoho"])
 app.include_router(salesforce.router, prefix="/api/v1", tags=["salesforce"])
+app.include_router(crm.router, prefix="/api/v1", tags=["crm"])
 app.include_router(enrichment.router, tags=["enrichment"])
 app.include_router(auth.router, prefix="/api/v1", tags=["auth"])
 app.include_router(billing.router, prefix="/api/v1", tags=["billing"])
@@ -49,8 +50,9 @@ app.include_router(agent.router, tags=["agent"])
 
 @app.on_event("startup")
 def on_startup():
-    """Initialize database tables."""
+    """Initialize database tables and resume interrupted CRM pushes."""
     init_db()
+    crm.get_push_pipeline().resume_unfinished()
 
 
 @app.get("/health")
@@ -10,7 +10,7 @@ from google.oauth2 import id_token as google_id_token
 from app.config import settings
 from app.db import models
 from app.db.session import get_db
-from app.utils.auth import TOKEN_COOKIE_NAME, create_access_token, get_current_user
+from app.utils.auth import TOKEN_COOKIE_NAME, create_access_token, get_current_user, invalidate_user
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -78,6 +78,7 @@ def login_with_google(payload: GoogleAuthRequest, response: Response, db: Sessio
 
     db.commit()
     db.refresh(user)
+    invalidate_user(google_sub)
 
     token = create_access_token(subject=google_sub)
     response.set_cookie(
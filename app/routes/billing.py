@@ -8,6 +8,7 @@ import stripe
 from app.config import settings
 from app.db import models
 from app.db.session import get_db
+from app.services.credit_ledger import get_credit_ledger
 from app.utils.auth import get_current_user
 
 router = APIRouter()
@@ -127,7 +128,7 @@ async def stripe_webhook(request: Request, db: Session = Depends(get_db)):
             if checkout and checkout.status != "completed":
                 user = db.query(models.User).filter(models.User.id == checkout.user_id).first()
                 if user:
-                    user.credits += checkout.credits
+                    get_credit_ledger().grant(db, user.id, checkout.credits, "purchase", session_id, commit=False)
                 checkout.status = "completed"
                 checkout.completed_at = datetime.utcnow()
                 db.commit()
@@ -137,7 +138,7 @@ async def stripe_webhook(request: Request, db: Session = Depends(get_db)):
                 pack_id = metadata.get("pack_id", "unknown")
                 user = db.query(models.User).filter(models.User.id == user_id).first()
                 if user and credits > 0:
-                    user.credits += credits
+                    get_credit_ledger().grant(db, user.id, credits, "purchase", session_id, commit=False)
                     new_checkout = models.CreditCheckout(
                         user_id=user.id,
                         stripe_session_id=session_id,
@@ -1,7 +1,7 @@
 """Business Routes"""
-import io
 import json
 import logging
+import uuid
 from fastapi import APIRouter, HTTPException, Query, Depends, Body, UploadFile, File
 from fastapi.responses import StreamingResponse
 from typing import Optional, Any, Dict, List
@@ -20,24 +20,87 @@ from app.services.natural_language_search_service import (
     is_website_input,
     suggest_customer_queries_from_website,
 )
+from app.services.credit_ledger import CreditHold, get_credit_ledger
+from app.services.entity_resolution import EntityResolver
+from app.services.export_service import enrichment_rows
+from app.services.lead_store import LeadStore, source_key
+from app.services.provider_mapping import map_provider_items
 from app.utils.auth import get_optional_user
+from app.utils.json_stream import JsonArrayReader
+from app.utils.responses import JSONModelResponse, dumps_json, export_response
 from app.db.session import get_db
 from app.db import models
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# Where each search route's results come from, for source precedence in the lead store
+ROUTE_SOURCES = {
+    "/search": "google_places",
+    "/search/by-address": "google_places",
+    "/search/natural": "google_places",
+    "/search/business": "provider",
+}
 
-def _is_paid_user(user: Optional[models.User]) -> bool:
-    return bool(user and user.credits > 0)
+# Members of a provider export object that may hold its items, in order of preference
+PROVIDER_ITEM_KEYS = ("items", "data", "results")
 
 
-def _resolve_max_results(user: Optional[models.User], max_results: Optional[int]) -> int:
-    if _is_paid_user(user):
+def _resolve_max_results(hold: CreditHold, max_results: Optional[int]) -> int:
+    """Reserve a credit for signed-in users who have one; paid searches get the full result limit."""
+    if hold.reserve():
         return min(max_results or settings.MAX_RESULTS, settings.MAX_RESULTS)
     return min(max_results or settings.FREE_USER_MAX_RESULTS, settings.FREE_USER_MAX_RESULTS)
 
 
+def _save_search_run(
+    db: Session,
+    route_name: str,
+    response_payload: SearchResultsResponse,
+    user: Optional[models.User],
+) -> None:
+    """Persist a signed-in user's results in the lead store so they can be reused; adds query["search_id"].
+
+    Results are stored once, as businesses linked to the run. Only results
+    without a place_id or cid, which cannot be stored that way, are kept as
+    JSON on the run. Anonymous searches are not saved.
+    """
+    if user is None or not response_payload.results:
+        return
+    search_id = str(uuid.uuid4())
+    results = [result.model_dump() for result in response_payload.results]
+    unlinked = [result for result in results if source_key(result) is None]
+    try:
+        db.add(models.SearchRun(
+            id=search_id,
+            user_id=user.id,
+            route=route_name,
+            query=json.dumps(response_payload.query, default=str),
+            total_results=response_payload.total_results,
+            results=json.dumps(unlinked, default=str),
+        ))
+        db.flush()
+        LeadStore(db).save_search_run(search_id, results, ROUTE_SOURCES.get(route_name))
+        db.commit()
+    except Exception as e:
+        # Saving is best effort; the search itself already succeeded
+        db.rollback()
+        logger.warning("Could not save search run for %s: %s", route_name, str(e))
+        return
+    response_payload.query["search_id"] = search_id
+
+
+def _dedupe_results(results: List[BusinessResponse], source: str) -> List[BusinessResponse]:
+    """Merge results describing the same business (provider datasets often list a place twice)."""
+    if len(results) < 2:
+        return results
+    merged = EntityResolver().resolve([result.model_dump() for result in results], source)
+    if len(merged) == len(results):
+        return results
+    logger.info("Merged %s duplicate %s results", len(results) - len(merged), source)
+    return [BusinessResponse(**record) for record in merged]
+
+
 def _log_response_debug(route_name: str, response_obj: SearchResultsResponse) -> None:
     if not settings.DEBUG:
         return
@@ -55,6 +118,7 @@ def _log_response_debug(route_name: str, response_obj: SearchResultsResponse) ->
 @router.post("/search", response_model=SearchResultsResponse)
 async def search_businesses(
     search_query: BusinessSearch,
+    pretty: bool = Query(False, description="Indent the JSON response"),
     user: Optional[models.User] = Depends(get_optional_user),
     db: Session = Depends(get_db),
 ):
@@ -67,8 +131,9 @@ async def search_businesses(
     Returns:
         List of nearby businesses
     """
+    hold = CreditHold(get_credit_ledger(), db, user)
     try:
-        search_query.max_results = _resolve_max_results(user, search_query.max_results)
+        search_query.max_results = _resolve_max_results(hold, search_query.max_results)
 
         # Initialize Google Maps service
         maps_service = GoogleMapsService()
@@ -85,9 +150,7 @@ async def search_businesses(
         # Convert to response format
         results = [BusinessResponse(**business.to_dict()) for business in businesses]
 
-        if _is_paid_user(user):
-            user.credits -= 1
-            db.commit()
+        hold.settle()
         
         response_payload = SearchResultsResponse(
             total_results=len(results),
@@ -99,8 +162,9 @@ async def search_businesses(
                 "radius": search_query.radius,
             }
         )
+        _save_search_run(db, "/search", response_payload, user)
         _log_response_debug("/search", response_payload)
-        return response_payload
+        return JSONModelResponse(response_payload, pretty=pretty)
         
     except ValueError as e:
         logger.error(f"Validation error: {str(e)}")
@@ -110,6 +174,8 @@ async def search_businesses(
     except Exception as e:
         logger.error(f"Error searching businesses: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal server error")
+    finally:
+        hold.release()
 
 
 @router.get("/search/by-address", response_model=SearchResultsResponse)
@@ -118,6 +184,7 @@ async def search_by_address(
     business_type: str = Query(..., description="Type of business to search for"),
     radius: Optional[int] = Query(5000, description="Search radius in meters"),
     max_results: Optional[int] = Query(50, description="Maximum number of results"),
+    pretty: bool = Query(False, description="Indent the JSON response"),
     user: Optional[models.User] = Depends(get_optional_user),
     db: Session = Depends(get_db),
 ):
@@ -133,6 +200,7 @@ async def search_by_address(
     Returns:
         List of nearby businesses
     """
+    hold = CreditHold(get_credit_ledger(), db, user)
     try:
         maps_service = GoogleMapsService()
         
@@ -143,7 +211,7 @@ async def search_by_address(
         
         latitude, longitude = coordinates
         
-        max_results = _resolve_max_results(user, max_results)
+        max_results = _resolve_max_results(hold, max_results)
 
         # Search nearby businesses
         businesses = maps_service.search_nearby_businesses(
@@ -156,9 +224,7 @@ async def search_by_address(
         
         results = [BusinessResponse(**business.to_dict()) for business in businesses]
 
-        if _is_paid_user(user):
-            user.credits -= 1
-            db.commit()
+        hold.settle()
         
         response_payload = SearchResultsResponse(
             total_results=len(results),
@@ -171,20 +237,24 @@ async def search_by_address(
                 "longitude": longitude,
             }
         )
+        _save_search_run(db, "/search/by-address", response_payload, user)
         _log_response_debug("/search/by-address", response_payload)
-        return response_payload
+        return JSONModelResponse(response_payload, pretty=pretty)
         
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Error searching by address: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal server error")
+    finally:
+        hold.release()
 
 
 @router.get("/search/natural", response_model=SearchResultsResponse)
 async def search_natural_language(
     query: str = Query(..., description="Natural language search query (e.g., 'cafe in new york city')"),
     max_results: Optional[int] = Query(50, description="Maximum number of results"),
+    pretty: bool = Query(False, description="Indent the JSON response"),
     user: Optional[models.User] = Depends(get_optional_user),
     db: Session = Depends(get_db),
 ):
@@ -203,10 +273,11 @@ async def search_natural_language(
     Returns:
         List of businesses matching the query
     """
+    hold = CreditHold(get_credit_ledger(), db, user)
     try:
         maps_service = GoogleMapsService()
         
-        max_results = _resolve_max_results(user, max_results)
+        max_results = _resolve_max_results(hold, max_results)
 
         # Text search
         businesses = maps_service.text_search_businesses(
@@ -216,26 +287,28 @@ async def search_natural_language(
         
         results = [BusinessResponse(**business.to_dict()) for business in businesses]
 
-        if _is_paid_user(user):
-            user.credits -= 1
-            db.commit()
+        hold.settle()
         
         response_payload = SearchResultsResponse(
             total_results=len(results),
             results=results,
             query={"query": query, "type": "natural_language"}
         )
+        _save_search_run(db, "/search/natural", response_payload, user)
         _log_response_debug("/search/natural", response_payload)
-        return response_payload
+        return JSONModelResponse(response_payload, pretty=pretty)
         
     except Exception as e:
         logger.error(f"Error in natural language search: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal server error")
+    finally:
+        hold.release()
 
 
 @router.post("/search/business", response_model=SearchResultsResponse)
 async def search_businesses_external(
     search_query: NaturalLanguageBusinessSearch,
+    pretty: bool = Query(False, description="Indent the JSON response"),
     user: Optional[models.User] = Depends(get_optional_user),
     db: Session = Depends(get_db),
 ):
@@ -246,6 +319,7 @@ async def search_businesses_external(
     returns 5 suggested natural-language queries to help find potential
     customers for that business.
     """
+    hold = CreditHold(get_credit_ledger(), db, user)
     try:
         logger.info("/search/business request received")
         logger.debug("Search query: %s", search_query.query)
@@ -265,9 +339,9 @@ async def search_businesses_external(
                 },
             )
             _log_response_debug("/search/business", response_payload)
-            return response_payload
+            return JSONModelResponse(response_payload, pretty=pretty)
 
-        max_results = _resolve_max_results(user, None)
+        max_results = _resolve_max_results(hold, None)
         parsed = parse_natural_language_query(search_query.query)
         logger.info(
             "Parsed query -> searchItem=%s, location=%s, language=%s",
@@ -305,18 +379,16 @@ async def search_businesses_external(
                     },
                 )
                 _log_response_debug("/search/business", response_payload)
-                return response_payload
+                return JSONModelResponse(response_payload, pretty=pretty)
             logger.error("Search provider error: %s - %s", error_code, error_desc)
             raise HTTPException(status_code=502, detail="Search provider error")
 
-        results = [_map_provider_item(item) for item in items]
+        results = _dedupe_results(map_provider_items(items), "provider")
         empty_results = sum(1 for result in results if not result.name and not result.place_id)
         if empty_results:
             logger.warning("Mapped %s empty results", empty_results)
 
-        if _is_paid_user(user):
-            user.credits -= 1
-            db.commit()
+        hold.settle()
 
         response_payload = SearchResultsResponse(
             total_results=len(results),
@@ -327,8 +399,9 @@ async def search_businesses_external(
                 "language": parsed.get("language", "en"),
             },
         )
+        _save_search_run(db, "/search/business", response_payload, user)
         _log_response_debug("/search/business", response_payload)
-        return response_payload
+        return JSONModelResponse(response_payload, pretty=pretty)
 
     except ValueError as e:
         logger.error(f"Validation error: {str(e)}")
@@ -338,11 +411,14 @@ async def search_businesses_external(
     except Exception as e:
         logger.error(f"Error searching businesses: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal server error")
+    finally:
+        hold.release()
 
 
 @router.post("/search/business/import", response_model=SearchResultsResponse)
 async def import_provider_businesses(
     provider_payload: Any = Body(..., description="Raw JSON returned by provider API"),
+    pretty: bool = Query(False, description="Indent the JSON response"),
 ):
     """
     Import raw provider dataset response and convert it to /search/business response format.
@@ -352,7 +428,10 @@ async def import_provider_businesses(
     - Object containing one of: items, data, results
     """
     try:
-        return _build_import_response(provider_payload, route_name="/search/business/import")
+        return JSONModelResponse(
+            _build_import_response(provider_payload, route_name="/search/business/import"),
+            pretty=pretty,
+        )
     except ValueError as e:
         logger.error("Validation error in provider import: %s", str(e))
         raise HTTPException(status_code=400, detail=str(e))
@@ -366,6 +445,7 @@ async def import_provider_businesses(
 @router.post("/search/business/import/upload")
 async def import_provider_businesses_upload(
     file: UploadFile = File(..., description="Provider JSON export file"),
+    pretty: bool = Query(False, description="Indent the JSON response"),
 ):
     """
     Upload provider JSON file and download converted /search/business formatted JSON.
@@ -375,23 +455,26 @@ async def import_provider_businesses_upload(
         if filename and not filename.endswith(".json"):
             raise HTTPException(status_code=400, detail="Please upload a .json file")
 
-        content = await file.read()
-        if not content:
-            raise ValueError("Uploaded file is empty")
-
-        try:
-            provider_payload = json.loads(content.decode("utf-8"))
-        except Exception as parse_error:
-            raise ValueError("Uploaded file is not valid JSON") from parse_error
-
-        response_payload = _build_import_response(
-            provider_payload,
-            route_name="/search/business/import/upload",
-        )
-        response_json = _response_payload_to_json(response_payload)
+        reader = JsonArrayReader(file.read, array_keys=PROVIDER_ITEM_KEYS)
+        items = reader.items()
+        # Read ahead two items: a lone error item gets an error response before streaming starts
+        head: List[Dict[str, Any]] = []
+        async for item in items:
+            head.append(_ensure_dict_item(item))
+            if len(head) == 2:
+                break
+
+        if _is_provider_error(head):
+            response_payload = _build_import_response(
+                {**reader.fields, "items": head},
+                route_name="/search/business/import/upload",
+            )
+            body = _iter_bytes(dumps_json(response_payload, pretty=pretty))
+        else:
+            body = _stream_import_response(head, items, reader, pretty)
 
         return StreamingResponse(
-            io.BytesIO(response_json.encode("utf-8")),
+            body,
             media_type="application/json",
             headers={
                 "Content-Disposition": "attachment; filename=converted_businesses.json"
@@ -407,6 +490,120 @@ async def import_provider_businesses_upload(
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+EXPORT_FORMAT_QUERY = Query("csv", alias="format", description="Export format: csv, parquet or xlsx")
+EXPORT_FIELDS_QUERY = Query(None, description="Comma-separated fields to include (fields without data are dropped)")
+
+
+@router.post("/search/export")
+async def export_search_results(
+    search_results: SearchResultsResponse,
+    file_format: str = EXPORT_FORMAT_QUERY,
+    fields: Optional[str] = EXPORT_FIELDS_QUERY,
+):
+    """
+    Download submitted search results as CSV, Parquet or XLSX
+    """
+    records = [result.model_dump() for result in search_results.results]
+    return export_response(records, file_format, fields, "search_results")
+
+
+@router.get("/search/{search_id}/export")
+async def export_search_run(
+    search_id: str,
+    file_format: str = EXPORT_FORMAT_QUERY,
+    fields: Optional[str] = EXPORT_FIELDS_QUERY,
+    user: Optional[models.User] = Depends(get_optional_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Download a saved search's results as CSV, Parquet or XLSX
+
+    Args:
+        search_id: search_id returned in the search response's query
+        file_format: csv, parquet or xlsx
+        fields: Optional comma-separated fields to include
+    """
+    run = _get_search_run(db, search_id, user)
+    records = LeadStore(db).search_run_records(run)
+    return export_response(records, file_format, fields, f"search_{search_id}")
+
+
+@router.get("/search/{search_id}/contacts/export")
+async def export_search_run_contacts(
+    search_id: str,
+    file_format: str = EXPORT_FORMAT_QUERY,
+    fields: Optional[str] = EXPORT_FIELDS_QUERY,
+    user: Optional[models.User] = Depends(get_optional_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Download the stored enrichment contacts of a saved search, one row per contact
+    """
+    run = _get_search_run(db, search_id, user)
+    records = enrichment_rows(LeadStore(db).run_contacts(run.id))
+    return export_response(records, file_format, fields, f"contacts_{search_id}")
+
+
+def _get_search_run(db: Session, search_id: str, user: Optional[models.User]) -> models.SearchRun:
+    """Return the user's saved search run; runs without an owner are not readable"""
+    run = db.get(models.SearchRun, search_id)
+    if run is None or user is None or run.user_id != user.id:
+        raise HTTPException(status_code=404, detail="Search not found")
+    return run
+
+
+async def _iter_bytes(content: bytes):
+    yield content
+
+
+async def _stream_import_response(head: List[Dict[str, Any]], items, reader: JsonArrayReader, pretty: bool = False):
+    """
+    Write the /search/business response for an uploaded export while it is parsed
+
+    Items are mapped and deduplicated in batches of IMPORT_STREAM_BATCH_SIZE, so
+    memory does not grow with the file. total_results and query follow the
+    results because they are only known once the whole file has been read.
+    """
+    # Compact by default; with `pretty` the layout matches dumps_json(..., pretty=True)
+    indent, newline = ("  ", "\n") if pretty else ("", "")
+    item_break = (newline + indent * 2).encode("utf-8")
+    total = 0
+    batch = list(head)
+
+    def render(batch: List[Dict[str, Any]]) -> tuple[bytes, int]:
+        parts = []
+        for result in _dedupe_results(map_provider_items(batch), "import"):
+            body = dumps_json(result, pretty=pretty)
+            if pretty:
+                body = body.replace(b"\n", item_break)
+            parts.append((b"," if total + len(parts) else b"") + item_break + body)
+        return b"".join(parts), len(parts)
+
+    try:
+        yield f'{{{newline}{indent}"results":{" " if pretty else ""}['.encode("utf-8")
+        async for item in items:
+            batch.append(_ensure_dict_item(item))
+            if len(batch) >= settings.IMPORT_STREAM_BATCH_SIZE:
+                chunk, count = render(batch)
+                total += count
+                batch = []
+                yield chunk
+        chunk, count = render(batch)
+        total += count
+        query = {"query": _provider_query_text(reader.fields), "type": "natural_language"}
+        query_json = dumps_json(query, pretty=pretty).decode("utf-8").replace("\n", newline + indent)
+        separator = ": " if pretty else ":"
+        closing = f"{newline}{indent}]" if total else "]"
+        yield chunk + (
+            f'{closing},{newline}{indent}"total_results"{separator}{total},'
+            f'{newline}{indent}"query"{separator}{query_json}{newline}}}'
+        ).encode("utf-8")
+    except Exception as e:
+        # Headers are already sent; abort so the client does not keep a truncated file as complete
+        logger.error("Error streaming provider upload after %s results: %s", total, str(e))
+        raise
+
+
 def _build_import_response(provider_payload: Any, route_name: str) -> SearchResultsResponse:
     items, query_text = _extract_provider_items_and_query(provider_payload)
 
@@ -425,7 +622,7 @@ def _build_import_response(provider_payload: Any, route_name: str) -> SearchResu
         logger.error("Provider error: %s - %s", error_code, error_desc)
         raise HTTPException(status_code=400, detail="Invalid provider payload")
 
-    results = [_map_provider_item(item) for item in items]
+    results = _dedupe_results(map_provider_items(items), "import")
     response_payload = SearchResultsResponse(
         total_results=len(results),
         results=results,
@@ -435,14 +632,6 @@ def _build_import_response(provider_payload: Any, route_name: str) -> SearchResu
     return response_payload
 
 
-def _response_payload_to_json(response_payload: SearchResultsResponse) -> str:
-    if hasattr(response_payload, "model_dump"):
-        payload = response_payload.model_dump()
-    else:
-        payload = response_payload.dict()
-    return json.dumps(payload, ensure_ascii=False, indent=2)
-
-
 def _extract_provider_items_and_query(payload: Any) -> tuple[List[Dict[str, Any]], str]:
     if isinstance(payload, list):
         return _ensure_dict_items(payload), "provider_import"
@@ -450,11 +639,11 @@ def _extract_provider_items_and_query(payload: Any) -> tuple[List[Dict[str, Any]
     if not isinstance(payload, dict):
         raise ValueError("Payload must be a JSON object or array")
 
-    items_candidate = payload.get("items")
-    if items_candidate is None:
-        items_candidate = payload.get("data")
-    if items_candidate is None:
-        items_candidate = payload.get("results")
+    items_candidate = None
+    for key in PROVIDER_ITEM_KEYS:
+        items_candidate = payload.get(key)
+        if items_candidate is not None:
+            break
 
     if items_candidate is None:
         if payload:
@@ -462,6 +651,10 @@ def _extract_provider_items_and_query(payload: Any) -> tuple[List[Dict[str, Any]
         else:
             items_candidate = []
 
+    return _ensure_dict_items(items_candidate), _provider_query_text(payload)
+
+
+def _provider_query_text(payload: Dict[str, Any]) -> str:
     query_text = (
         payload.get("query")
         or payload.get("searchQuery")
@@ -469,8 +662,7 @@ def _extract_provider_items_and_query(payload: Any) -> tuple[List[Dict[str, Any]
         or payload.get("searchString")
         or "provider_import"
     )
-
-    return _ensure_dict_items(items_candidate), str(query_text)
+    return str(query_text)
 
 
 def _ensure_dict_items(items: Any) -> List[Dict[str, Any]]:
@@ -478,196 +670,13 @@ def _ensure_dict_items(items: Any) -> List[Dict[str, Any]]:
         return []
     if not isinstance(items, list):
         raise ValueError("Provider payload items must be an array")
-    normalized: List[Dict[str, Any]] = []
-    for item in items:
-        if not isinstance(item, dict):
-            raise ValueError("Each provider item must be a JSON object")
-        normalized.append(item)
-    return normalized
-
-
-def _map_provider_item(item: dict) -> BusinessResponse:
-    def first_non_null(*values):
-        for value in values:
-            if value is not None:
-                return value
-        return None
-
-    def first_non_empty_str(*values):
-        for value in values:
-            if isinstance(value, str) and value.strip():
-                return value
-        return None
-
-    name = (
-        item.get("title")
-        or item.get("name")
-        or item.get("businessName")
-        or ""
-    )
-
-    place_id = item.get("placeId") or item.get("place_id") or ""
-
-    category = item.get("categoryName") or item.get("category")
-    types = item.get("types") or item.get("type") or ([] if not category else [category])
-    if isinstance(types, str):
-        types = [types]
-    if not isinstance(types, list):
-        types = []
-
-    categories = item.get("categories")
-    if isinstance(categories, str):
-        categories = [categories]
-    if not isinstance(categories, list):
-        categories = []
-    if not categories and types:
-        categories = types
-
-    location = item.get("location") if isinstance(item.get("location"), dict) else {}
-    google_maps_url = first_non_empty_str(
-        item.get("googleMapsUrl"),
-        item.get("googleMapsUri"),
-        item.get("placeUrl"),
-        item.get("url"),
-    )
-    formatted_address = first_non_empty_str(
-        item.get("formattedAddress"),
-        item.get("address"),
-        item.get("fullAddress"),
-        item.get("streetAddress"),
-        location.get("formattedAddress"),
-        location.get("address"),
-        item.get("location") if isinstance(item.get("location"), str) else None,
-    )
+    return [_ensure_dict_item(item) for item in items]
 
-    latitude = first_non_null(
-        item.get("lat"),
-        item.get("latitude"),
-        location.get("lat"),
-        location.get("latitude"),
-        0,
-    )
-    longitude = first_non_null(
-        item.get("lng"),
-        item.get("longitude"),
-        location.get("lng"),
-        location.get("longitude"),
-        0,
-    )
 
-    rating = first_non_null(item.get("rating"), item.get("stars"), item.get("totalScore"))
-    user_ratings_total = (
-        first_non_null(
-            item.get("reviewsCount"),
-            item.get("reviewCount"),
-            item.get("totalReviews"),
-            item.get("user_ratings_total"),
-        )
-    )
-
-    photos = (
-        item.get("imageUrls")
-        or item.get("images")
-        or item.get("photoUrls")
-        or item.get("photos")
-    )
-    if photos is not None and not isinstance(photos, list):
-        photos = [photos]
-    if isinstance(photos, list):
-        cleaned_photos = []
-        for photo in photos:
-            if isinstance(photo, str):
-                cleaned_photos.append(photo)
-            elif isinstance(photo, dict):
-                url = photo.get("url") or photo.get("photoUrl") or photo.get("imageUrl")
-                if url:
-                    cleaned_photos.append(url)
-        photos = cleaned_photos or None
-
-    opening_hours = None
-    raw_opening_hours = item.get("openingHours")
-    if isinstance(raw_opening_hours, dict):
-        opening_hours = {
-            "open_now": raw_opening_hours.get("openNow"),
-            "weekday_text": raw_opening_hours.get("weekdayText"),
-        }
-    elif isinstance(raw_opening_hours, list):
-        weekday_text = []
-        for entry in raw_opening_hours:
-            if not isinstance(entry, dict):
-                continue
-            day = entry.get("day")
-            hours = entry.get("hours")
-            if day and hours:
-                weekday_text.append(f"{day}: {hours}")
-        opening_hours = {
-            "open_now": None,
-            "weekday_text": weekday_text or None,
-        }
-    opening_hours_raw = raw_opening_hours if isinstance(raw_opening_hours, list) else None
-
-    photos = photos or ([item.get("imageUrl")] if item.get("imageUrl") else None)
-
-    business_status = first_non_null(item.get("businessStatus"), item.get("status"))
-    if business_status is None:
-        if item.get("permanentlyClosed") is True:
-            business_status = "CLOSED_PERMANENTLY"
-        elif item.get("temporarilyClosed") is True:
-            business_status = "CLOSED_TEMPORARILY"
-        else:
-            business_status = "OPERATIONAL"
-
-    country = first_non_null(item.get("country"), item.get("countryName"), item.get("countryCode"))
-
-    result = BusinessResponse(
-        name=name,
-        place_id=place_id,
-        types=types,
-        primary_type=types[0] if types else None,
-        business_status=business_status,
-        google_maps_url=google_maps_url,
-        formatted_address=formatted_address,
-        latitude=float(latitude or 0),
-        longitude=float(longitude or 0),
-        city=item.get("city"),
-        state=item.get("state"),
-        country=country,
-        postal_code=item.get("postalCode") or item.get("zip"),
-        formatted_phone_number=item.get("phone") or item.get("phoneNumber"),
-        international_phone_number=first_non_null(
-            item.get("internationalPhoneNumber"),
-            item.get("phoneUnformatted"),
-            item.get("internationalPhone"),
-        ),
-        website=item.get("website") or item.get("domain"),
-        rating=rating,
-        user_ratings_total=user_ratings_total,
-        price_level=first_non_null(item.get("priceLevel"), item.get("price")),
-        opening_hours=opening_hours,
-        photos=photos,
-        categories=categories,
-        neighborhood=item.get("neighborhood"),
-        street=item.get("street"),
-        claim_this_business=item.get("claimThisBusiness"),
-        rank=item.get("rank"),
-        image_url=item.get("imageUrl"),
-        images_count=item.get("imagesCount"),
-        reviews_distribution=item.get("reviewsDistribution"),
-        temporarily_closed=item.get("temporarilyClosed"),
-        permanently_closed=item.get("permanentlyClosed"),
-        is_advertisement=item.get("isAdvertisement"),
-        cid=item.get("cid"),
-        fid=item.get("fid"),
-        kgmid=item.get("kgmid"),
-        search_string=item.get("searchString"),
-        search_page_url=item.get("searchPageUrl"),
-        scraped_at=item.get("scrapedAt"),
-        additional_info=item.get("additionalInfo"),
-        opening_hours_raw=opening_hours_raw,
-    )
-    if not result.name and not result.place_id:
-        logger.debug("Empty mapping for item keys: %s", list(item.keys()))
-    return result
+def _ensure_dict_item(item: Any) -> Dict[str, Any]:
+    if not isinstance(item, dict):
+        raise ValueError("Each provider item must be a JSON object")
+    return item
 
 
 def _is_provider_error(items: list) -> bool:
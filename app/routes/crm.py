@@ -0,0 +1,248 @@
+"""CRM routes shared across providers (contact mirror)"""
+import logging
+from typing import Any, Optional
+from fastapi import APIRouter, HTTPException, Depends, Query
+from pydantic import BaseModel, Field, model_validator
+from sqlalchemy.orm import Session
+from app.db import models
+from app.db.session import get_db
+from app.routes.hubspot import get_hubspot_service
+from app.routes.salesforce import get_sf_service
+from app.routes.zoho import get_zoho_service
+from app.schemas.hubspot import HubSpotBatchLeadsCreate
+from app.services.crm_mirror_service import CrmMirrorService, PROVIDERS
+from app.services.crm_push_pipeline import CrmPushPipeline
+from app.services.lead_store import LeadStore
+from app.utils.auth import get_optional_user
+from app.utils.crm_mapping import business_to_lead
+from app.utils.http_client import get_http_stats
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/crm", tags=["crm"])
+
+
+class ExportRequest(BaseModel):
+    search_id: Optional[str] = Field(None, description="search_id returned in a search response's query")
+    job_id: Optional[str] = Field(None, description="Existing push job whose leads should be re-exported")
+    skip_existing: bool = Field(False, description="Skip leads already in the local CRM mirror")
+
+    @model_validator(mode="after")
+    def _one_source(self):
+        if bool(self.search_id) == bool(self.job_id):
+            raise ValueError("Provide exactly one of search_id or job_id")
+        return self
+
+
+def get_provider_service(provider: str) -> Any:
+    """Return the connected service for a CRM provider"""
+    if provider == "hubspot":
+        return get_hubspot_service()
+    if provider == "zoho":
+        return get_zoho_service()
+    if provider == "salesforce":
+        return get_sf_service()
+    raise HTTPException(status_code=404, detail=f"Unknown CRM provider: {provider}")
+
+
+_push_pipeline = None
+
+
+def get_push_pipeline() -> CrmPushPipeline:
+    """Return the process-wide push pipeline"""
+    global _push_pipeline
+    if _push_pipeline is None:
+        _push_pipeline = CrmPushPipeline(service_factory=get_provider_service)
+    return _push_pipeline
+
+
+def _owns(record: Any, user: Optional[models.User]) -> bool:
+    """Whether a record exists and is readable by the user (unowned ones are shared)"""
+    return record is not None and (record.user_id is None or (user is not None and user.id == record.user_id))
+
+
+def _check_provider(provider: str) -> None:
+    if provider not in PROVIDERS:
+        raise HTTPException(status_code=404, detail=f"Unknown CRM provider: {provider}")
+
+
+@router.get("/http-stats")
+async def http_stats():
+    """Connection reuse and estimated handshake time saved per CRM provider"""
+    return {"providers": get_http_stats()}
+
+
+@router.post("/{provider}/sync")
+def sync_mirror(
+    provider: str,
+    full: bool = Query(False, description="Re-read every contact instead of only changed ones"),
+    max_pages: Optional[int] = Query(None, ge=1),
+    db: Session = Depends(get_db)
+):
+    """Mirror contacts changed since the last sync into the local database
+
+    Args:
+        provider: CRM provider
+        full: Ignore the modified-since cursor
+        max_pages: Optional page cap for a partial sync
+        db: Database session
+
+    Returns:
+        Sync summary
+    """
+    service = get_provider_service(provider)
+    try:
+        result = CrmMirrorService(db).sync(provider, service, full=full, max_pages=max_pages)
+        if not result.get("success"):
+            raise HTTPException(status_code=502, detail=result.get("error", "CRM sync failed"))
+        return result
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error syncing {provider} mirror: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/{provider}/mirror")
+async def mirror_status(provider: str, db: Session = Depends(get_db)):
+    """Return the size and sync cursor of a provider's contact mirror"""
+    _check_provider(provider)
+    return CrmMirrorService(db).status(provider)
+
+
+@router.post("/{provider}/mirror/match")
+async def match_leads(provider: str, batch: HubSpotBatchLeadsCreate, db: Session = Depends(get_db)):
+    """Split leads into new ones and ones already present in the CRM mirror
+
+    Args:
+        provider: CRM provider
+        batch: Leads to check
+        db: Database session
+
+    Returns:
+        New leads and existing matches (by email, phone or domain)
+    """
+    _check_provider(provider)
+    try:
+        new_leads, existing = CrmMirrorService(db).partition_new(
+            provider, [lead.model_dump() for lead in batch.leads]
+        )
+        return {"success": True, "new": new_leads, "existing": existing}
+    except Exception as e:
+        logger.error(f"Error matching leads against {provider} mirror: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/{provider}/push", status_code=202)
+async def push_leads(
+    provider: str,
+    batch: HubSpotBatchLeadsCreate,
+    skip_existing: bool = Query(False, description="Skip leads already in the local CRM mirror"),
+    user: Optional[models.User] = Depends(get_optional_user),
+    db: Session = Depends(get_db)
+):
+    """Queue leads for a checkpointed background push to a CRM
+
+    Args:
+        provider: CRM provider
+        batch: Leads to push
+        skip_existing: Drop leads matching the local CRM mirror first
+        user: Current user, if signed in
+        db: Database session
+
+    Returns:
+        Job id to poll with GET /crm/push/{job_id}
+    """
+    _check_provider(provider)
+    try:
+        leads = [lead.model_dump() for lead in batch.leads]
+        skipped = 0
+        if skip_existing:
+            leads, existing = CrmMirrorService(db).partition_new(provider, leads)
+            skipped = len(existing)
+        result = get_push_pipeline().submit(provider, leads, user_id=user.id if user else None)
+        return {"success": True, "skipped": skipped, **result}
+    except Exception as e:
+        logger.error(f"Error queueing {provider} push: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/push/{job_id}")
+async def push_status(
+    job_id: str,
+    failures: int = Query(0, ge=0, le=1000),
+    user: Optional[models.User] = Depends(get_optional_user),
+    db: Session = Depends(get_db)
+):
+    """Progress of a push job, optionally with the first failed items"""
+    if not _owns(db.get(models.CrmPushJob, job_id), user):
+        raise HTTPException(status_code=404, detail="Push job not found")
+    pipeline = get_push_pipeline()
+    try:
+        result = pipeline.status(job_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Push job not found")
+    if failures:
+        result["failures"] = pipeline.failures(job_id, limit=failures)
+    return result
+
+
+@router.post("/push/{job_id}/resume")
+async def resume_push(
+    job_id: str,
+    retry_failed: bool = Query(False),
+    user: Optional[models.User] = Depends(get_optional_user),
+    db: Session = Depends(get_db)
+):
+    """Continue a push job from its last checkpoint"""
+    if not _owns(db.get(models.CrmPushJob, job_id), user):
+        raise HTTPException(status_code=404, detail="Push job not found")
+    try:
+        return get_push_pipeline().resume(job_id, retry_failed=retry_failed)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Push job not found")
+
+
+@router.post("/{provider}/export", status_code=202)
+async def export_to_crm(
+    provider: str,
+    request: ExportRequest,
+    user: Optional[models.User] = Depends(get_optional_user),
+    db: Session = Depends(get_db)
+):
+    """Push a saved search (or a previous push job) to a CRM without sending leads through the client
+
+    Args:
+        provider: CRM provider
+        request: search_id or job_id to export
+        user: Current user, if signed in
+        db: Database session
+
+    Returns:
+        Push job id to poll with GET /crm/push/{job_id}
+    """
+    _check_provider(provider)
+    pipeline = get_push_pipeline()
+    if request.search_id:
+        run = db.get(models.SearchRun, request.search_id)
+        # Saved searches always belong to a user; unlike push jobs, unowned runs are not shared
+        if run is None or run.user_id is None or not _owns(run, user):
+            raise HTTPException(status_code=404, detail="Search not found")
+        # Stored businesses carry the latest data seen for each place
+        businesses = LeadStore(db).search_run_records(run)
+        leads = (business_to_lead(business) for business in businesses)
+    else:
+        if not _owns(db.get(models.CrmPushJob, request.job_id), user):
+            raise HTTPException(status_code=404, detail="Push job not found")
+        leads = pipeline.iter_leads(request.job_id)
+
+    try:
+        skipped = 0
+        if request.skip_existing:
+            leads, existing = CrmMirrorService(db).partition_new(provider, list(leads))
+            skipped = len(existing)
+        result = pipeline.submit(provider, leads, user_id=user.id if user else None)
+        return {"success": True, "skipped": skipped, "source": request.search_id or request.job_id, **result}
+    except Exception as e:
+        logger.error(f"Error exporting to {provider}: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
@@ -2,7 +2,7 @@
 Enrichment Routes - API endpoints for enriching business data with contact information
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel
 from typing import List, Optional
 import logging
@@ -13,6 +13,13 @@ from app.services.contact_extractor_service import (
     Contact
 )
 from app.config import settings
+from app.db import models
+from app.db.session import SessionLocal
+from app.services.export_service import enrichment_rows
+from app.services.lead_store import LeadStore
+from app.utils.auth import get_optional_user
+from app.utils.helpers import extract_domain
+from app.utils.responses import export_response
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/v1/enrichment", tags=["enrichment"])
@@ -25,6 +32,7 @@ contact_extractor = ContactExtractorService(
     max_pages=settings.CRAWL4AI_MAX_PAGES,
     gemini_api_key=settings.GEMINI_API_KEY or None,
     gemini_model=settings.GEMINI_MODEL or None,
+    http_first=settings.CRAWL_HTTP_FIRST,
 )
 
 
@@ -34,6 +42,10 @@ class EnrichmentRequest(BaseModel):
     name: str
     website: str
     address: Optional[str] = None
+    # When set and `website` is the saved business's own site, contacts are stored on it
+    # (signed-in users only) and reused until refresh is requested
+    place_id: Optional[str] = None
+    refresh: bool = False
 
 
 class EnrichmentResponse(BaseModel):
@@ -59,8 +71,48 @@ class BatchEnrichmentResponse(BaseModel):
     results: List[EnrichmentResponse]
 
 
+def _stored_response(request: EnrichmentRequest) -> Optional[EnrichmentResponse]:
+    """Contacts from an earlier enrichment of the same stored business, if any"""
+    if not request.place_id or request.refresh:
+        return None
+    db = SessionLocal()
+    try:
+        stored = LeadStore(db).get_contacts(request.place_id, extract_domain(request.website))
+    finally:
+        db.close()
+    if stored is None:
+        return None
+    return EnrichmentResponse(
+        name=request.name,
+        website=request.website,
+        contacts=[Contact(**contact) for contact in stored["contacts"]],
+        confidence=stored["confidence"],
+        scraped_content_length=0,
+        status="success" if stored["contacts"] else "no_contacts_found"
+    )
+
+
+def _store_contacts(
+    request: EnrichmentRequest,
+    result: ContactExtractionResult,
+    user: Optional[models.User],
+) -> None:
+    if not request.place_id or user is None:
+        return
+    db = SessionLocal()
+    try:
+        contacts = [contact.model_dump() for contact in result.contacts]
+        LeadStore(db).save_contacts(request.place_id, extract_domain(request.website), contacts, result.confidence)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.warning(f"Could not store contacts for {request.place_id}: {str(e)}")
+    finally:
+        db.close()
+
+
 @router.post("/enrich", response_model=EnrichmentResponse)
-def enrich_business(request: EnrichmentRequest):
+def enrich_business(request: EnrichmentRequest, user: Optional[models.User] = Depends(get_optional_user)):
     """
     Enrich a single business record with contact information
     
@@ -70,17 +122,24 @@ def enrich_business(request: EnrichmentRequest):
     
     Args:
         request: Business information to enrich
+        user: Current user, if signed in (required to store contacts)
         
     Returns:
         EnrichmentResponse with extracted contacts
     """
     try:
+        stored = _stored_response(request)
+        if stored is not None:
+            logger.info(f"Using stored contacts: business={request.name} place_id={request.place_id}")
+            return stored
+
         logger.info(f"Extracting contacts via Crawl4AI: business={request.name}")
         result = contact_extractor.extract_contacts(
             business_name=request.name,
             website_url=request.website,
             address=request.address
         )
+        _store_contacts(request, result, user)
 
         logger.info(
             f"Enrichment completed: business={request.name} contacts={len(result.contacts)} confidence={result.confidence}"
@@ -104,12 +163,13 @@ def enrich_business(request: EnrichmentRequest):
 
 
 @router.post("/batch-enrich", response_model=BatchEnrichmentResponse)
-def batch_enrich_businesses(request: BatchEnrichmentRequest):
+def batch_enrich_businesses(request: BatchEnrichmentRequest, user: Optional[models.User] = Depends(get_optional_user)):
     """
     Enrich multiple business records with contact information
     
     Args:
         request: Multiple businesses to enrich
+        user: Current user, if signed in (required to store contacts)
         
     Returns:
         BatchEnrichmentResponse with results for all businesses
@@ -120,12 +180,19 @@ def batch_enrich_businesses(request: BatchEnrichmentRequest):
     
     for business_req in request.businesses:
         try:
+            stored = _stored_response(business_req)
+            if stored is not None:
+                results.append(stored)
+                successful += 1
+                continue
+
             # Extract contacts
             extraction_result = contact_extractor.extract_contacts(
                 business_name=business_req.name,
                 website_url=business_req.website,
                 address=business_req.address
             )
+            _store_contacts(business_req, extraction_result, user)
             
             response = EnrichmentResponse(
                 name=extraction_result.business_name,
@@ -161,6 +228,30 @@ def batch_enrich_businesses(request: BatchEnrichmentRequest):
     )
 
 
+@router.post("/export")
+def export_enrichment_results(
+    request: BatchEnrichmentResponse,
+    file_format: str = Query("csv", alias="format", description="Export format: csv, parquet or xlsx"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to include"),
+):
+    """
+    Download enrichment results as CSV, Parquet or XLSX
+    
+    Each extracted contact becomes a row carrying its business name, website,
+    status and confidence; businesses without contacts keep one row.
+    
+    Args:
+        request: Batch enrichment response to export
+        file_format: csv, parquet or xlsx
+        fields: Optional comma-separated columns to keep
+        
+    Returns:
+        Streamed file download
+    """
+    records = enrichment_rows([result.model_dump() for result in request.results])
+    return export_response(records, file_format, fields, "enrichment_results")
+
+
 @router.get("/health")
 def enrichment_health():
     """Check if enrichment service is available"""
@@ -175,5 +266,7 @@ def enrichment_health():
             resp["crawl4ai_max_pages"] = getattr(contact_extractor, 'max_pages', None)
         except Exception:
             resp["crawl4ai_max_pages"] = None
+        resp["http_first"] = contact_extractor.http_first
+        resp["crawl_stats"] = contact_extractor.stats.snapshot()
 
     return resp
@@ -1,8 +1,12 @@
 """HubSpot API Routes"""
 import logging
-from typing import Optional
+from typing import Optional, Union
 from fastapi import APIRouter, HTTPException, Depends, Query
+from sqlalchemy.orm import Session
+from app.db.session import get_db
+from app.services.crm_mirror_service import CrmMirrorService
 from app.services.hubspot_service import HubSpotService
+from app.utils.crm_mapping import business_to_lead
 from app.schemas.hubspot import (
     HubSpotLeadCreate,
     HubSpotBatchLeadsCreate,
@@ -96,30 +100,51 @@ async def create_lead(
 
 
 @router.post("/leads/batch", response_model=HubSpotBatchLeadsResponse)
-async def create_batch_leads(
+def create_batch_leads(
     batch: HubSpotBatchLeadsCreate,
-    service: HubSpotService = Depends(get_hubspot_service)
+    skip_existing: bool = Query(False, description="Skip leads already in the local CRM mirror"),
+    service: HubSpotService = Depends(get_hubspot_service),
+    db: Session = Depends(get_db)
 ):
     """Create multiple contacts/leads in HubSpot
     
     Args:
         batch: HubSpotBatchLeadsCreate with list of leads
+        skip_existing: Drop leads matching a mirrored contact by email, phone or domain
         service: HubSpot service instance
+        db: Database session
     
     Returns:
         HubSpotBatchLeadsResponse with creation results
     """
     try:
         lead_dicts = [lead.model_dump() for lead in batch.leads]
+        skipped = 0
+        if skip_existing:
+            lead_dicts, existing = CrmMirrorService(db).partition_new("hubspot", lead_dicts)
+            skipped = len(existing)
         result = service.batch_create_leads(lead_dicts)
+        created = result.get("created", 0)
         
-        if result.get("success"):
+        # Partial success is still reported so callers can retry only the failed leads
+        if created or result.get("success"):
+            failed = result.get("failed", 0)
+            message = f"Successfully created {created} contacts"
+            if failed:
+                message += f", {failed} failed"
+            if skipped:
+                message += f", {skipped} already in HubSpot"
             return HubSpotBatchLeadsResponse(
-                success=True,
-                total=result.get("total", len(batch.leads)),
-                created=result.get("total", len(batch.leads)),
-                message=f"Successfully created {len(batch.leads)} contacts",
-                data=result.get("data")
+                success=result.get("success", False),
+                total=len(batch.leads),
+                created=created,
+                failed=failed,
+                skipped=skipped,
+                message=message,
+                data=result.get("data"),
+                outcomes=result.get("outcomes"),
+                leads_per_second=result.get("leads_per_second"),
+                error=result.get("error")
             )
         else:
             raise HTTPException(
@@ -133,25 +158,47 @@ async def create_batch_leads(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/leads/upsert", response_model=HubSpotLeadResponse)
-async def upsert_lead(
-    lead: HubSpotLeadCreate,
+@router.post("/leads/upsert", response_model=Union[HubSpotBatchLeadsResponse, HubSpotLeadResponse])
+def upsert_lead(
+    lead: Union[HubSpotBatchLeadsCreate, HubSpotLeadCreate],
     service: HubSpotService = Depends(get_hubspot_service)
 ):
-    """Create or update a contact in HubSpot
+    """Create or update one or many contacts in HubSpot
     
     Args:
-        lead: HubSpotLeadCreate object with contact information
+        lead: A single HubSpotLeadCreate or a HubSpotBatchLeadsCreate with many leads
         service: HubSpot service instance
     
     Returns:
-        HubSpotLeadResponse with upserted contact info
+        HubSpotLeadResponse for a single lead, HubSpotBatchLeadsResponse for a batch
     """
     try:
+        if isinstance(lead, HubSpotBatchLeadsCreate):
+            result = service.batch_upsert_leads([item.model_dump() for item in lead.leads])
+            created, updated = result.get("created", 0), result.get("updated", 0)
+            if created or updated or result.get("success"):
+                return HubSpotBatchLeadsResponse(
+                    success=result.get("success", False),
+                    total=result.get("total", len(lead.leads)),
+                    created=created,
+                    updated=updated,
+                    failed=result.get("failed", 0),
+                    message=f"Created {created} and updated {updated} contacts",
+                    data=result.get("data"),
+                    outcomes=result.get("outcomes"),
+                    leads_per_second=result.get("leads_per_second"),
+                    error=result.get("error")
+                )
+            raise HTTPException(
+                status_code=400,
+                detail=result.get("error", "Failed to upsert contacts")
+            )
+
         result = service.create_or_update_lead(lead.model_dump())
         if result.get("success"):
             return HubSpotLeadResponse(
                 success=True,
+                contact_id=result.get("contact_id"),
                 message="Contact created or updated successfully",
                 data=result.get("data")
             )
@@ -204,37 +251,57 @@ async def create_deal(
 
 @router.post("/contacts/search")
 async def search_contacts(
-    query: str = Query(..., min_length=1, description="Search query"),
+    query: Optional[str] = Query(None, min_length=1, description="Search query; optional when a filter is given"),
     limit: int = Query(10, ge=1, le=100),
-    service: HubSpotService = Depends(get_hubspot_service)
+    after: Optional[str] = Query(None, description="Cursor from the previous page's next_after"),
+    email: Optional[str] = Query(None, description="Exact email filter"),
+    domain: Optional[str] = Query(None, description="Exact email domain filter"),
+    company: Optional[str] = Query(None, description="Exact company name filter"),
+    source: str = Query("live", pattern="^(live|mirror)$", description="Search HubSpot or the local mirror"),
+    service: HubSpotService = Depends(get_hubspot_service),
+    db: Session = Depends(get_db)
 ):
     """Search for contacts in HubSpot
     
     Args:
         query: Search query string
         limit: Maximum number of results
+        after: Pagination cursor
+        email: Exact email filter
+        domain: Exact email domain filter
+        company: Exact company name filter
+        source: "live" for the HubSpot search API, "mirror" for the synced local copy
         service: HubSpot service instance
+        db: Database session
     
     Returns:
-        List of matching contacts
+        Page of matching contacts with the total match count and next cursor
     """
+    if not (query or email or domain or company):
+        raise HTTPException(status_code=422, detail="Provide a query or at least one of email, domain or company")
     try:
-        result = service.get_contacts(limit=limit)
+        if source == "mirror":
+            result = CrmMirrorService(db).search(
+                "hubspot", query, limit=limit, after=after, email=email, domain=domain, company=company
+            )
+        else:
+            result = service.search_contacts(
+                query=query,
+                limit=limit,
+                after=after,
+                filters={"email": email, "hs_email_domain": domain, "company": company},
+            )
         if result.get("success"):
-            # Simple filtering on client side
-            contacts = result.get("data", {}).get("results", [])
-            filtered = [
-                c for c in contacts
-                if query.lower() in str(c).lower()
-            ][:limit]
-            
             return {
                 "success": True,
-                "total": len(filtered),
-                "contacts": filtered
+                "total": result.get("total", 0),
+                "contacts": result.get("contacts", []),
+                "next_after": result.get("next_after"),
+                "cached": result.get("cached", False),
+                "source": source
             }
         else:
-            raise HTTPException(status_code=400, detail="Failed to search contacts")
+            raise HTTPException(status_code=400, detail=result.get("error", "Failed to search contacts"))
     except HTTPException:
         raise
     except Exception as e:
@@ -255,23 +322,7 @@ async def convert_google_to_hubspot(
         HubSpotLeadCreate ready for HubSpot API
     """
     try:
-        # Extract email from website if possible, otherwise create placeholder
-        email = f"{business.name.lower().replace(' ', '.')}@business.local"
-        
-        lead = HubSpotLeadCreate(
-            email=email,
-            firstname=business.name.split()[0] if business.name else "Business",
-            lastname=" ".join(business.name.split()[1:]) if len(business.name.split()) > 1 else business.name,
-            phone=business.phone,
-            company=business.name,
-            website=business.website,
-            address=business.address,
-            business_type=business.business_type,
-            rating=business.rating,
-            review_count=business.review_count,
-            latitude=business.latitude,
-            longitude=business.longitude
-        )
+        lead = HubSpotLeadCreate(**business_to_lead(business.model_dump()))
         
         return {
             "success": True,
@@ -1,7 +1,10 @@
 """Salesforce routes mirroring HubSpot endpoints (minimal)"""
 import logging
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query
 from typing import Optional
+from sqlalchemy.orm import Session
+from app.db.session import get_db
+from app.services.crm_mirror_service import CrmMirrorService
 from app.services.salesforce_service import SalesforceService
 from app.schemas.hubspot import (
     HubSpotLeadCreate,
@@ -43,17 +46,42 @@ async def create_lead(lead: HubSpotLeadCreate, service: SalesforceService = Depe
 
 
 @router.post("/leads/batch")
-async def create_batch(batch: HubSpotBatchLeadsCreate, service: SalesforceService = Depends(get_sf_service)):
+def create_batch(
+    batch: HubSpotBatchLeadsCreate,
+    skip_existing: bool = Query(False, description="Skip leads already in the local CRM mirror"),
+    service: SalesforceService = Depends(get_sf_service),
+    db: Session = Depends(get_db),
+):
     try:
         leads = [l.model_dump() for l in batch.leads]
-        return service.batch_create_leads(leads)
+        if not skip_existing:
+            return service.batch_create_leads(leads)
+        leads, existing = CrmMirrorService(db).partition_new("salesforce", leads)
+        if not leads:
+            return {"success": True, "data": [], "skipped": existing}
+        return {**service.batch_create_leads(leads), "skipped": existing}
+    except Exception as e:
+        logger.error(str(e))
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/jobs/{job_id}")
+async def bulk_job_status(job_id: str, service: SalesforceService = Depends(get_sf_service)):
+    """State of a Bulk API 2.0 ingest job, with per-record results once it has finished"""
+    try:
+        result = service.get_bulk_job(job_id)
+        if not result.get("success"):
+            raise HTTPException(status_code=400, detail=result.get("error"))
+        return result
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(str(e))
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.post("/leads/upsert")
-async def upsert_lead(lead: HubSpotLeadCreate, service: SalesforceService = Depends(get_sf_service)):
+def upsert_lead(lead: HubSpotLeadCreate, service: SalesforceService = Depends(get_sf_service)):
     try:
         return service.create_or_update_lead(lead.model_dump())
     except Exception as e:
@@ -68,3 +96,18 @@ async def create_deal(deal: HubSpotDealCreate, service: SalesforceService = Depe
     except Exception as e:
         logger.error(str(e))
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/contacts/search")
+async def search_contacts(
+    query: str = Query(..., min_length=1),
+    limit: int = Query(10, ge=1, le=100),
+    after: Optional[str] = Query(None),
+    db: Session = Depends(get_db),
+):
+    """Search the local mirror of Salesforce contacts (sync it via /crm/salesforce/sync)"""
+    try:
+        return CrmMirrorService(db).search("salesforce", query, limit=limit, after=after)
+    except Exception as e:
+        logger.error(str(e))
+        raise HTTPException(status_code=500, detail=str(e))
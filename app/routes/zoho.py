@@ -1,7 +1,10 @@
 """Zoho routes mirroring HubSpot endpoints (minimal)"""
 import logging
-from fastapi import APIRouter, HTTPException, Depends
-from typing import Optional
+from fastapi import APIRouter, HTTPException, Depends, Query
+from typing import Optional, Union
+from sqlalchemy.orm import Session
+from app.db.session import get_db
+from app.services.crm_mirror_service import CrmMirrorService
 from app.services.zoho_service import ZohoService
 from app.schemas.hubspot import (
     HubSpotLeadCreate,
@@ -43,18 +46,33 @@ async def create_lead(lead: HubSpotLeadCreate, service: ZohoService = Depends(ge
 
 
 @router.post("/leads/batch")
-async def create_batch(batch: HubSpotBatchLeadsCreate, service: ZohoService = Depends(get_zoho_service)):
+def create_batch(
+    batch: HubSpotBatchLeadsCreate,
+    skip_existing: bool = Query(False, description="Skip leads already in the local CRM mirror"),
+    service: ZohoService = Depends(get_zoho_service),
+    db: Session = Depends(get_db),
+):
     try:
         leads = [l.model_dump() for l in batch.leads]
-        return service.batch_create_leads(leads)
+        if not skip_existing:
+            return service.batch_create_leads(leads)
+        leads, existing = CrmMirrorService(db).partition_new("zoho", leads)
+        if not leads:
+            return {"success": True, "data": [], "skipped": existing}
+        return {**service.batch_create_leads(leads), "skipped": existing}
     except Exception as e:
         logger.error(str(e))
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.post("/leads/upsert")
-async def upsert_lead(lead: HubSpotLeadCreate, service: ZohoService = Depends(get_zoho_service)):
+def upsert_lead(
+    lead: Union[HubSpotBatchLeadsCreate, HubSpotLeadCreate],
+    service: ZohoService = Depends(get_zoho_service),
+):
     try:
+        if isinstance(lead, HubSpotBatchLeadsCreate):
+            return service.batch_upsert_leads([l.model_dump() for l in lead.leads])
         return service.create_or_update_lead(lead.model_dump())
     except Exception as e:
         logger.error(str(e))
@@ -68,3 +86,18 @@ async def create_deal(deal: HubSpotDealCreate, service: ZohoService = Depends(ge
     except Exception as e:
         logger.error(str(e))
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/contacts/search")
+async def search_contacts(
+    query: str = Query(..., min_length=1),
+    limit: int = Query(10, ge=1, le=100),
+    after: Optional[str] = Query(None),
+    db: Session = Depends(get_db),
+):
+    """Search the local mirror of Zoho contacts (sync it via /crm/zoho/sync)"""
+    try:
+        return CrmMirrorService(db).search("zoho", query, limit=limit, after=after)
+    except Exception as e:
+        logger.error(str(e))
+        raise HTTPException(status_code=500, detail=str(e))
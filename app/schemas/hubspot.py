@@ -120,9 +120,13 @@ class HubSpotBatchLeadsResponse(BaseModel):
     success: bool
     total: int
     created: int = 0
+    updated: int = 0
     failed: int = 0
+    skipped: int = 0
     message: Optional[str] = None
     data: Optional[Dict[str, Any]] = None
+    outcomes: Optional[List[Dict[str, Any]]] = None
+    leads_per_second: Optional[float] = None
     error: Optional[str] = None
 
 
@@ -0,0 +1,257 @@
+"""
+Contact Discovery Service - Finds likely contact/team pages for a website
+Ranks homepage links, sitemap entries and robots.txt hints instead of guessing paths
+"""
+
+import html as html_lib
+import logging
+import re
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import unquote, urljoin, urlparse, urlunparse
+from urllib.robotparser import RobotFileParser
+
+logger = logging.getLogger(__name__)
+
+# Keyword -> weight. Matched against the URL path and the anchor text.
+_KEYWORD_WEIGHTS: Dict[str, int] = {
+    # Contact pages
+    "contact": 10,
+    "kontakt": 10,
+    "contacto": 10,
+    "contato": 10,
+    "contatti": 10,
+    "contattaci": 10,
+    "contactez": 10,
+    "nous-contacter": 10,
+    "yhteystiedot": 10,
+    "iletisim": 10,
+    "kapcsolat": 10,
+    "impressum": 9,
+    "imprint": 8,
+    "get-in-touch": 9,
+    "reach-us": 8,
+    "ansprechpartner": 8,
+    "enquir": 6,
+    "inquir": 6,
+    # Team pages
+    "team": 7,
+    "equipe": 7,
+    "equipo": 7,
+    "mitarbeiter": 7,
+    "staff": 6,
+    "leadership": 6,
+    "people": 5,
+    "management": 5,
+    # About pages
+    "about-us": 6,
+    "about": 5,
+    "ueber-uns": 5,
+    "uber-uns": 5,
+    "chi-siamo": 5,
+    "quienes-somos": 5,
+    "qui-sommes-nous": 5,
+    "sobre-nos": 5,
+    "nosotros": 5,
+    "over-ons": 5,
+    "om-oss": 5,
+    # Location pages often carry phone numbers
+    "find-us": 4,
+    "locations": 3,
+    "standorte": 3,
+}
+
+_NEGATIVE_KEYWORDS = (
+    "blog", "news", "post", "product", "shop", "cart", "checkout", "tag", "category",
+    "login", "account", "privacy", "cookie", "terms", "wp-content", "wp-json", "feed",
+)
+
+_SKIPPED_EXTENSIONS = (
+    ".pdf", ".jpg", ".jpeg", ".png", ".gif", ".svg", ".webp", ".zip", ".doc", ".docx",
+    ".xls", ".xlsx", ".mp4", ".mp3", ".css", ".js", ".xml", ".gz",
+)
+
+# Score at which a candidate is considered a confident contact page
+STRONG_CANDIDATE_SCORE = 8
+
+_LOC_PATTERN = re.compile(r"<loc>\s*([^<]+?)\s*</loc>", re.IGNORECASE)
+
+
+class ContactDiscoveryService:
+    """Service for ranking a site's pages by how likely they are to list contacts"""
+
+    def __init__(
+        self,
+        fetch: Callable[[str], Optional[str]],
+        max_sitemap_urls: int = 2000,
+        max_child_sitemaps: int = 3,
+    ):
+        """
+        Initialize discovery
+
+        Args:
+            fetch: Callable returning the body of a URL or None (e.g. WebScraperService.fetch_html)
+            max_sitemap_urls: Maximum number of sitemap entries to rank
+            max_child_sitemaps: Maximum child sitemaps to follow from a sitemap index
+        """
+        self.fetch = fetch
+        self.max_sitemap_urls = max_sitemap_urls
+        self.max_child_sitemaps = max_child_sitemaps
+        self.requests_made = 0
+
+    def discover(self, website_url: str, homepage_html: Optional[str] = None, limit: int = 5) -> List[str]:
+        """
+        Return the top candidate contact pages for a website
+
+        Homepage anchors are ranked first; robots.txt and sitemap.xml are only
+        read when the homepage does not already link to enough strong candidates.
+
+        Args:
+            website_url: Base website URL
+            homepage_html: Already fetched homepage HTML, fetched here if omitted
+            limit: Maximum number of URLs to return
+
+        Returns:
+            Candidate URLs ordered by contact likelihood
+        """
+        if not website_url:
+            return []
+        if not website_url.startswith(("http://", "https://")):
+            website_url = "https://" + website_url
+        host = self._normalize_host(urlparse(website_url).netloc)
+        home = self._normalize_url(website_url)
+
+        if homepage_html is None:
+            homepage_html = self._fetch(website_url)
+
+        scores: Dict[str, int] = {}
+        order: Dict[str, int] = {}
+
+        def add(url: str, anchor_text: str = "") -> None:
+            url = self._normalize_url(url)
+            if not url or url == home or self._normalize_host(urlparse(url).netloc) != host:
+                return
+            score = self.score_url(url, anchor_text)
+            if score <= 0:
+                return
+            order.setdefault(url, len(order))
+            scores[url] = max(scores.get(url, 0), score)
+
+        for href, anchor_text in self._extract_anchors(homepage_html or "", website_url):
+            add(href, anchor_text)
+
+        strong = sum(1 for score in scores.values() if score >= STRONG_CANDIDATE_SCORE)
+        if strong < limit:
+            robots = self._read_robots(website_url)
+            for url in self._read_sitemaps(website_url, robots):
+                add(url)
+            if robots is not None:
+                scores = {url: score for url, score in scores.items() if robots.can_fetch("*", url)}
+
+        ranked = sorted(scores, key=lambda url: (-scores[url], len(urlparse(url).path), order[url]))
+        return ranked[:limit]
+
+    @staticmethod
+    def score_url(url: str, anchor_text: str = "") -> int:
+        """
+        Score a URL by contact likelihood using multilingual path and anchor keywords
+
+        Args:
+            url: Absolute URL
+            anchor_text: Visible link text, if known
+
+        Returns:
+            Integer score; zero or less means "not a contact page"
+        """
+        parsed = urlparse(url)
+        path = unquote(parsed.path).lower()
+        if path.endswith(_SKIPPED_EXTENSIONS):
+            return 0
+        path = path.replace("_", "-")
+        anchor = re.sub(r"\s+", "-", (anchor_text or "").strip().lower())
+
+        path_score = max((w for k, w in _KEYWORD_WEIGHTS.items() if k in path), default=0)
+        anchor_score = max((w for k, w in _KEYWORD_WEIGHTS.items() if k in anchor), default=0)
+        score = max(path_score, anchor_score)
+        if not score:
+            return 0
+        if path_score and anchor_score:
+            score += 2
+
+        depth = len([segment for segment in path.split("/") if segment])
+        score -= max(0, depth - 1)
+        if parsed.query:
+            score -= 4
+        if any(negative in path for negative in _NEGATIVE_KEYWORDS):
+            score -= 8
+        return score
+
+    def _fetch(self, url: str) -> Optional[str]:
+        self.requests_made += 1
+        try:
+            return self.fetch(url)
+        except Exception as exc:
+            logger.debug(f"Discovery fetch failed for {url}: {exc}")
+            return None
+
+    def _read_robots(self, website_url: str) -> Optional[RobotFileParser]:
+        body = self._fetch(urljoin(website_url, "/robots.txt"))
+        if not body or "<html" in body[:500].lower():
+            return None
+        parser = RobotFileParser()
+        parser.parse(body.splitlines())
+        return parser
+
+    def _read_sitemaps(self, website_url: str, robots: Optional[RobotFileParser]) -> List[str]:
+        sitemap_urls = list((robots.site_maps() if robots else None) or [])
+        if not sitemap_urls:
+            sitemap_urls = [urljoin(website_url, "/sitemap.xml")]
+
+        urls: List[str] = []
+        children_followed = 0
+        queue = sitemap_urls[:2]
+        while queue and len(urls) < self.max_sitemap_urls:
+            body = self._fetch(queue.pop(0))
+            if not body:
+                continue
+            locs = [html_lib.unescape(loc) for loc in _LOC_PATTERN.findall(body)]
+            if "<sitemapindex" in body[:1000].lower():
+                # Page sitemaps are more useful than post/product ones
+                locs.sort(key=lambda loc: (0 if "page" in loc.lower() else 1))
+                for loc in locs:
+                    if children_followed >= self.max_child_sitemaps:
+                        break
+                    queue.append(loc)
+                    children_followed += 1
+                continue
+            urls.extend(locs[: self.max_sitemap_urls - len(urls)])
+        return urls
+
+    def _extract_anchors(self, html: str, base_url: str) -> List[Tuple[str, str]]:
+        if not html:
+            return []
+        try:
+            from bs4 import BeautifulSoup
+        except ImportError:
+            logger.error("bs4 (beautifulsoup4) is not installed; cannot parse HTML")
+            return []
+        soup = BeautifulSoup(html, "lxml")
+        anchors = []
+        for anchor in soup.find_all("a", href=True):
+            href = anchor["href"].strip()
+            if not href or href.startswith(("#", "mailto:", "tel:", "javascript:")):
+                continue
+            anchors.append((urljoin(base_url, href), anchor.get_text(" ", strip=True)))
+        return anchors
+
+    @staticmethod
+    def _normalize_url(url: str) -> str:
+        parsed = urlparse(url)
+        if parsed.scheme not in ("http", "https"):
+            return ""
+        path = parsed.path.rstrip("/") or "/"
+        return urlunparse((parsed.scheme, parsed.netloc.lower(), path, "", parsed.query, ""))
+
+    @staticmethod
+    def _normalize_host(netloc: str) -> str:
+        netloc = netloc.lower()
+        return netloc[4:] if netloc.startswith("www.") else netloc
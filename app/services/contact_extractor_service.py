@@ -6,11 +6,30 @@ import asyncio
 import json
 import logging
 import re
+import threading
+import time
 from typing import Optional, List, Dict, Any, Tuple
+from urllib.parse import urljoin, urlparse
 from pydantic import BaseModel
 
+from app.services.web_scraper_service import WebScraperService
+
 logger = logging.getLogger(__name__)
 
+# Pages with less visible text than this are candidates for browser rendering
+MIN_STATIC_TEXT_LENGTH = 200
+
+# Markers of client-side rendered app shells (React, Next.js, Vue, Nuxt, Angular, Wix, ...)
+_SPA_SHELL_PATTERN = re.compile(
+    r'<div[^>]+id=["\'](root|app|__next|__nuxt|svelte)["\'][^>]*>\s*</div>'
+    r'|ng-app|data-reactroot|window\.__NUXT__|__NEXT_DATA__|wix-warmup-data',
+    re.IGNORECASE,
+)
+_NOSCRIPT_JS_REQUIRED_PATTERN = re.compile(
+    r"<noscript[^>]*>[^<]*(enable|requires?)\s+javascript",
+    re.IGNORECASE,
+)
+
 
 class Contact(BaseModel):
     """Contact information extracted from website"""
@@ -48,10 +67,59 @@ class ContactExtractionResult(BaseModel):
     confidence: float  # 0-1 confidence score
 
 
+class CrawlStats:
+    """Thread-safe counters describing how pages were fetched"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.crawls = 0
+        self.http_pages = 0
+        self.browser_pages = 0
+        self.browser_launches = 0
+        self.browser_launches_avoided = 0
+        self.contacts_found = 0
+        self.elapsed_seconds = 0.0
+
+    def record(self, http_pages: int, browser_pages: int, browser_launched: bool, elapsed: float) -> None:
+        with self._lock:
+            self.crawls += 1
+            self.http_pages += http_pages
+            self.browser_pages += browser_pages
+            if browser_launched:
+                self.browser_launches += 1
+            else:
+                self.browser_launches_avoided += 1
+            self.elapsed_seconds += elapsed
+
+    def record_contacts(self, count: int) -> None:
+        with self._lock:
+            self.contacts_found += count
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            pages = self.http_pages + self.browser_pages
+            return {
+                "crawls": self.crawls,
+                "http_pages": self.http_pages,
+                "browser_pages": self.browser_pages,
+                "browser_launches": self.browser_launches,
+                "browser_launches_avoided": self.browser_launches_avoided,
+                "pages_per_second": round(pages / self.elapsed_seconds, 2) if self.elapsed_seconds else 0.0,
+                "contacts_found": self.contacts_found,
+                "pages_per_contact": round(pages / self.contacts_found, 2) if self.contacts_found else None,
+            }
+
+
 class ContactExtractorService:
     """Service for extracting contacts using Crawl4AI and optional LLM enrichment"""
 
-    def __init__(self, max_pages: int = 6, gemini_api_key: Optional[str] = None, gemini_model: Optional[str] = None):
+    def __init__(
+        self,
+        max_pages: int = 6,
+        gemini_api_key: Optional[str] = None,
+        gemini_model: Optional[str] = None,
+        http_first: bool = True,
+    ):
         """
         Initialize Crawl4AI settings
 
@@ -59,11 +127,15 @@ class ContactExtractorService:
             max_pages: Maximum number of pages to crawl per business
             gemini_api_key: Optional Gemini API key for LLM enrichment
             gemini_model: Optional Gemini model name
+            http_first: Try a plain HTTP fetch before launching the headless browser
         """
         self.max_pages = max_pages
         self.gemini_api_key = gemini_api_key
         self.gemini_model = gemini_model
         self._llm_enabled = bool(gemini_api_key)
+        self.http_first = http_first
+        self.scraper = WebScraperService()
+        self.stats = CrawlStats()
         self.contact_paths = [
             "/contact",
             "/contact-us",
@@ -84,10 +156,8 @@ class ContactExtractorService:
         """
         Extract contacts from the website using Crawl4AI output
         """
-        urls = self._build_url_list(website_url)
-
         try:
-            text, links = asyncio.run(self._crawl_urls(urls))
+            text, links = asyncio.run(self._crawl_site(website_url))
             contacts, confidence = self._derive_contacts(
                 text=text,
                 links=links,
@@ -106,7 +176,7 @@ class ContactExtractorService:
             try:
                 loop = asyncio.new_event_loop()
                 asyncio.set_event_loop(loop)
-                text, links = loop.run_until_complete(self._crawl_urls(urls))
+                text, links = loop.run_until_complete(self._crawl_site(website_url))
                 contacts, confidence = self._derive_contacts(
                     text=text,
                     links=links,
@@ -138,14 +208,44 @@ class ContactExtractorService:
                 confidence=0.0,
             )
 
-    def _build_url_list(self, website_url: str) -> List[str]:
+    async def _crawl_site(self, website_url: str) -> Tuple[str, List[str]]:
+        """Fetch the homepage, discover likely contact pages and crawl them"""
+        if not website_url:
+            return "", []
+        if not website_url.startswith(("http://", "https://")):
+            website_url = "https://" + website_url
+
+        # One budget for the homepage, robots.txt and sitemap fetches, so a dead host
+        # costs a single deadline rather than one timeout per request
+        deadline = time.monotonic() + self.scraper.contact_deadline
+        homepage_html = None
+        if self.http_first:
+            # "" rather than None: a failed homepage is not fetched again during discovery
+            homepage_html = await asyncio.to_thread(self.scraper.fetch_html, website_url, 1, deadline) or ""
+        urls = await asyncio.to_thread(self._build_url_list, website_url, homepage_html, deadline)
+        prefetched = {urls[0]: homepage_html} if homepage_html is not None else None
+        return await self._crawl_urls(urls, prefetched=prefetched, deadline=deadline)
+
+    def _build_url_list(
+        self,
+        website_url: str,
+        homepage_html: Optional[str] = None,
+        deadline: Optional[float] = None,
+    ) -> List[str]:
         if not website_url:
             return []
         if not website_url.startswith(("http://", "https://")):
             website_url = "https://" + website_url
         urls = [website_url]
-        for path in self.contact_paths:
-            urls.append(website_url.rstrip("/") + path)
+        urls.extend(
+            self.scraper.discover_contact_urls(
+                website_url,
+                homepage_html=homepage_html,
+                deadline=deadline,
+                limit=max(self.max_pages - 1, 1),
+                fallback_paths=self.contact_paths,
+            )
+        )
         # dedupe
         seen = set()
         out = []
@@ -155,7 +255,75 @@ class ContactExtractorService:
                 out.append(u)
         return out
 
-    async def _crawl_urls(self, urls: List[str]) -> Tuple[str, List[str]]:
+    async def _crawl_urls(
+        self,
+        urls: List[str],
+        prefetched: Optional[Dict[str, str]] = None,
+        deadline: Optional[float] = None,
+    ) -> Tuple[str, List[str]]:
+        """
+        Fetch pages with a cheap HTTP tier first and escalate to the headless
+        browser only for pages that look JavaScript-rendered
+
+        prefetched maps URLs to HTML already fetched ("" for a fetch that
+        failed); deadline bounds the HTTP tier's fetches.
+        """
+        started = time.perf_counter()
+        urls = urls[: self.max_pages]
+        text_chunks: List[str] = []
+        link_set = set()
+        escalate = list(urls)
+        http_pages = 0
+
+        if self.http_first and urls:
+            prefetched = prefetched or {}
+            pages = await asyncio.gather(
+                *(self._fetch_static(url, prefetched.get(url), deadline) for url in urls)
+            )
+            escalate = []
+            for index, (url, html) in enumerate(zip(urls, pages)):
+                if html is None:
+                    # Bot walls on the homepage are often passed by a real browser;
+                    # missing contact paths are just 404s and not worth a browser
+                    if index == 0:
+                        escalate.append(url)
+                    continue
+                text, links = self._parse_static_page(html, url)
+                if self._looks_js_rendered(html, text):
+                    escalate.append(url)
+                    continue
+                http_pages += 1
+                text_chunks.append(text)
+                link_set.update(links)
+
+        browser_pages = 0
+        if escalate:
+            try:
+                browser_text, browser_links, browser_pages = await self._crawl_with_browser(escalate)
+            except ImportError:
+                if not text_chunks:
+                    raise
+                logger.warning("crawl4ai is not installed; using static HTML results only")
+                browser_text, browser_links, escalate = "", [], []
+            if browser_text:
+                text_chunks.append(browser_text)
+            link_set.update(browser_links)
+
+        self.stats.record(
+            http_pages=http_pages,
+            browser_pages=browser_pages,
+            browser_launched=bool(escalate),
+            elapsed=time.perf_counter() - started,
+        )
+        return "\n".join(text_chunks), list(link_set)
+
+    async def _fetch_static(self, url: str, html: Optional[str], deadline: Optional[float] = None) -> Optional[str]:
+        if html is not None:
+            # A cached failure still counts as a failed fetch, so the homepage can escalate
+            return html or None
+        return await asyncio.to_thread(self.scraper.fetch_html, url, 1, deadline)
+
+    async def _crawl_with_browser(self, urls: List[str]) -> Tuple[str, List[str], int]:
         try:
             from crawl4ai import AsyncWebCrawler, CrawlerRunConfig, CacheMode
         except ImportError as exc:
@@ -163,6 +331,7 @@ class ContactExtractorService:
 
         text_chunks: List[str] = []
         link_set = set()
+        pages = 0
 
         config = CrawlerRunConfig(
             cache_mode=CacheMode.BYPASS,
@@ -171,9 +340,10 @@ class ContactExtractorService:
         )
 
         async with AsyncWebCrawler() as crawler:
-            for url in urls[: self.max_pages]:
+            for url in urls:
                 try:
                     result = await crawler.arun(url, config=config)
+                    pages += 1
                     if getattr(result, "markdown", None):
                         text_chunks.append(result.markdown)
                     if getattr(result, "links", None):
@@ -182,7 +352,45 @@ class ContactExtractorService:
                 except Exception as exc:
                     logger.debug(f"Crawl4AI failed for {url}: {exc}")
 
-        return "\n".join(text_chunks), list(link_set)
+        return "\n".join(text_chunks), list(link_set), pages
+
+    def _parse_static_page(self, html: str, page_url: str) -> Tuple[str, List[str]]:
+        """Extract visible text plus external and mailto/tel links from static HTML"""
+        text = self.scraper.html_to_text(html) or ""
+        links: List[str] = []
+        extras: List[str] = []
+        try:
+            from bs4 import BeautifulSoup
+        except ImportError:
+            return text, links
+
+        host = urlparse(page_url).netloc.lower()
+        soup = BeautifulSoup(html, "lxml")
+        for anchor in soup.find_all("a", href=True):
+            href = anchor["href"].strip()
+            lower = href.lower()
+            if lower.startswith(("mailto:", "tel:")):
+                # Obfuscated addresses often only appear in the href
+                extras.append(href.split(":", 1)[1].split("?")[0])
+                continue
+            absolute = urljoin(page_url, href)
+            parsed = urlparse(absolute)
+            if parsed.scheme in ("http", "https") and parsed.netloc.lower() != host:
+                links.append(absolute)
+        if extras:
+            text = text + "\n" + "\n".join(extras)
+        return text, links
+
+    def _looks_js_rendered(self, html: str, text: str) -> bool:
+        """Heuristic: near-empty body, a known SPA shell or a 'please enable JavaScript' notice"""
+        visible = len((text or "").strip())
+        if visible >= 1000:
+            return False
+        if _NOSCRIPT_JS_REQUIRED_PATTERN.search(html):
+            return True
+        if visible < MIN_STATIC_TEXT_LENGTH:
+            return bool(_SPA_SHELL_PATTERN.search(html)) or "<script" in html.lower()
+        return False
 
     def _derive_contacts(
         self,
@@ -201,6 +409,7 @@ class ContactExtractorService:
                 address=address,
             )
             if llm_contacts:
+                self.stats.record_contacts(len(llm_contacts))
                 return llm_contacts, llm_confidence
         emails = re.findall(r"[\w\.-]+@[\w\.-]+\.[a-zA-Z]{2,}", text or "")
         phones = re.findall(r"\+?\d[\d\-\s\(\)]{6,}\d", text or "")
@@ -249,6 +458,7 @@ class ContactExtractorService:
                 )
             )
 
+        self.stats.record_contacts(len(contacts))
         evidence = (1 if email_list else 0) + (1 if phone_list else 0) + (1 if social else 0)
         confidence = min(0.2 * evidence + 0.1, 0.7) if contacts else 0.0
         return contacts, confidence
@@ -0,0 +1,213 @@
+"""
+Credit Ledger - Atomic credit debits with reserve / settle / refund
+A search reserves its credit with one conditional UPDATE before calling the
+provider, so concurrent searches can never overdraw a balance. Successful
+searches are settled in batches, written when a batch fills or by a timer
+settle_interval seconds after the first buffered id; failed ones are refunded.
+Every balance change is appended to the credit_ledger table.
+"""
+
+import atexit
+import logging
+import threading
+import uuid
+from datetime import datetime
+from typing import Callable, List, Optional
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.db.models import CreditLedgerEntry, CreditReservation, User
+from app.db.session import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+class CreditLedger:
+    """Reserve, settle, refund and grant credits without read-modify-write races"""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        settle_batch_size: Optional[int] = None,
+        settle_interval: Optional[float] = None,
+    ):
+        self.session_factory = session_factory
+        self.settle_batch_size = settle_batch_size or settings.CREDIT_SETTLE_BATCH_SIZE
+        self.settle_interval = settle_interval if settle_interval is not None else settings.CREDIT_SETTLE_INTERVAL
+        self._pending: List[str] = []
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+
+    def reserve(self, db: Session, user_id: int, amount: int = 1, reason: str = "search") -> Optional[str]:
+        """Debit `amount` credits if the balance allows it
+
+        Returns:
+            Reservation id, or None when the user does not have enough credits
+        """
+        debit = db.execute(
+            update(User)
+            .where(User.id == user_id, User.credits >= amount)
+            .values(credits=User.credits - amount)
+            .execution_options(synchronize_session=False)
+        )
+        if debit.rowcount != 1:
+            db.rollback()
+            return None
+        reservation_id = str(uuid.uuid4())
+        db.add(CreditReservation(id=reservation_id, user_id=user_id, amount=amount, reason=reason))
+        db.add(CreditLedgerEntry(user_id=user_id, delta=-amount, reason=reason, reference=reservation_id))
+        db.commit()
+        return reservation_id
+
+    def settle(self, reservation_id: str) -> None:
+        """Mark a reservation as spent
+
+        The debit already happened in reserve(), so settling only closes the
+        reservation. Ids are buffered and written in one UPDATE per batch; a
+        timer flushes a partial batch, so an idle worker does not hold them.
+        """
+        with self._lock:
+            self._pending.append(reservation_id)
+            due = len(self._pending) >= self.settle_batch_size or self.settle_interval <= 0
+            if not due:
+                self._schedule_flush()
+        if due:
+            self.flush()
+
+    def settle_many(self, db: Session, reservation_ids: List[str]) -> int:
+        """Close reservations in one statement; returns how many were still open"""
+        if not reservation_ids:
+            return 0
+        result = db.execute(
+            update(CreditReservation)
+            .where(CreditReservation.id.in_(reservation_ids), CreditReservation.status == "reserved")
+            .values(status="settled", resolved_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        return result.rowcount
+
+    def flush(self) -> int:
+        """Write buffered settlements"""
+        with self._lock:
+            pending, self._pending = self._pending, []
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        if not pending:
+            return 0
+        db = self.session_factory()
+        try:
+            return self.settle_many(db, pending)
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error settling {len(pending)} credit reservations: {str(e)}")
+            with self._lock:
+                self._pending.extend(pending)
+                self._schedule_flush()
+            return 0
+        finally:
+            db.close()
+
+    def _schedule_flush(self) -> None:
+        """Start the interval timer for the buffer if none is running; call with the lock held"""
+        if self._timer is None:
+            self._timer = threading.Timer(max(self.settle_interval, 0.1), self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def refund(self, db: Session, reservation_id: str) -> bool:
+        """Return the credits of an open reservation; False if it was already closed"""
+        reservation = db.get(CreditReservation, reservation_id)
+        if reservation is None:
+            return False
+        # Conditional close so a refund can only happen once, even if called twice concurrently
+        closed = db.execute(
+            update(CreditReservation)
+            .where(CreditReservation.id == reservation_id, CreditReservation.status == "reserved")
+            .values(status="refunded", resolved_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        if closed.rowcount != 1:
+            db.rollback()
+            return False
+        self._apply(db, reservation.user_id, reservation.amount, "refund", reservation_id)
+        db.commit()
+        return True
+
+    def grant(self, db: Session, user_id: int, amount: int, reason: str, reference: Optional[str] = None, commit: bool = True) -> None:
+        """Add credits (e.g. a purchase); pass commit=False to join the caller's transaction"""
+        self._apply(db, user_id, amount, reason, reference)
+        if commit:
+            db.commit()
+
+    @staticmethod
+    def _apply(db: Session, user_id: int, delta: int, reason: str, reference: Optional[str]) -> None:
+        db.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(credits=User.credits + delta)
+            .execution_options(synchronize_session=False)
+        )
+        db.add(CreditLedgerEntry(user_id=user_id, delta=delta, reason=reason, reference=reference))
+
+
+class CreditHold:
+    """One search's credit: reserve() up front, settle() on success, release() always
+
+    release() refunds the credit unless settle() was called, so routes can
+    call it from a finally block.
+    """
+
+    def __init__(self, ledger: CreditLedger, db: Session, user: Optional[User], amount: int = 1, reason: str = "search"):
+        self.ledger = ledger
+        self.db = db
+        # Read up front: the user's attributes expire when the session commits. The
+        # balance was loaded for this request; reserve()'s conditional UPDATE has the final say
+        self.user_id = user.id if user is not None else None
+        self.available = user.credits if user is not None else 0
+        self.amount = amount
+        self.reason = reason
+        self.reservation_id: Optional[str] = None
+        self.settled = False
+
+    @property
+    def paid(self) -> bool:
+        return self.reservation_id is not None
+
+    def reserve(self) -> bool:
+        """Take the credit if the user has one; returns whether the search is paid"""
+        if self.reservation_id is None and self.user_id is not None and self.available >= self.amount:
+            self.reservation_id = self.ledger.reserve(self.db, self.user_id, self.amount, self.reason)
+        return self.paid
+
+    def settle(self) -> None:
+        if self.reservation_id is not None and not self.settled:
+            self.ledger.settle(self.reservation_id)
+            self.settled = True
+
+    def release(self) -> None:
+        if self.reservation_id is None or self.settled:
+            return
+        try:
+            self.ledger.refund(self.db, self.reservation_id)
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Error refunding credit reservation {self.reservation_id}: {str(e)}")
+        self.reservation_id = None
+
+
+_ledger_lock = threading.Lock()
+_ledger: Optional[CreditLedger] = None
+
+
+def get_credit_ledger() -> CreditLedger:
+    """Return the process-wide credit ledger"""
+    global _ledger
+    with _ledger_lock:
+        if _ledger is None:
+            _ledger = CreditLedger()
+            atexit.register(_ledger.flush)
+        return _ledger
@@ -0,0 +1,445 @@
+"""
+CRM Mirror Service - Keeps a local, indexed copy of CRM contacts
+Used to skip leads that already exist before pushing and to answer contact searches without a remote call
+"""
+
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import func, or_
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.db.models import CrmContact, CrmSyncState
+from app.utils.helpers import chunked, extract_domain, normalize_phone
+
+logger = logging.getLogger(__name__)
+
+PROVIDERS = ("hubspot", "zoho", "salesforce")
+
+# Shared mailbox domains say nothing about which company a contact belongs to
+FREE_EMAIL_DOMAINS = frozenset({
+    "gmail.com", "googlemail.com", "yahoo.com", "hotmail.com", "outlook.com", "live.com",
+    "icloud.com", "me.com", "aol.com", "gmx.com", "gmx.de", "web.de", "proton.me", "protonmail.com",
+})
+
+
+def _company_domain(domain: Optional[str]) -> Optional[str]:
+    """Domain usable as a company key, or None for free-mail and placeholder-email domains"""
+    if domain in FREE_EMAIL_DOMAINS or domain == settings.LEAD_PLACEHOLDER_EMAIL_DOMAIN:
+        return None
+    return domain
+
+
+# Zoho person modules mirrored; record ids are unique across modules
+_ZOHO_MODULES = ("Leads", "Contacts")
+
+# HubSpot's search API stops paging after 10,000 results; restart from the newest timestamp before that
+_HUBSPOT_SEARCH_WINDOW = 9900
+
+_UPDATE_COLUMNS = (
+    "email", "email_domain", "website_domain", "phone", "phone_key",
+    "firstname", "lastname", "company", "website", "modified_at", "synced_at",
+)
+
+
+class CrmMirrorService:
+    """Service for syncing CRM contacts into the local mirror and querying it"""
+
+    def __init__(self, db: Session):
+        """
+        Initialize the mirror
+
+        Args:
+            db: Database session
+        """
+        self.db = db
+
+    def sync(self, provider: str, service: Any, full: bool = False, max_pages: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Pull contacts changed since the last sync into the mirror
+
+        Args:
+            provider: "hubspot", "zoho" or "salesforce"
+            service: Connected provider service
+            full: Ignore the stored cursor and re-read every contact
+            max_pages: Stop after this many pages (the cursor is only advanced on completion)
+
+        Returns:
+            Dictionary with the number of contacts synced and the new cursor
+        """
+        state = self.db.get(CrmSyncState, provider)
+        if state is None:
+            state = CrmSyncState(provider=provider, contacts=0)
+            self.db.add(state)
+        since = None if full else state.modified_cursor
+        started = datetime.utcnow()
+
+        synced = 0
+        pages = 0
+        newest = since
+        complete = True
+        try:
+            for records in self._iter_pages(provider, service, since):
+                rows = [row for row in (self._to_row(provider, record, started) for record in records) if row]
+                self._upsert(rows)
+                synced += len(rows)
+                pages += 1
+                for row in rows:
+                    if row["modified_at"] and (newest is None or row["modified_at"] > newest):
+                        newest = row["modified_at"]
+                if max_pages and pages >= max_pages:
+                    complete = False
+                    break
+        except RuntimeError as e:
+            self.db.commit()
+            logger.error(f"{provider} mirror sync failed after {pages} pages: {str(e)}")
+            return {"success": False, "provider": provider, "synced": synced, "pages": pages, "error": str(e)}
+
+        if complete:
+            # Records read in one pass can change while a later page or module is read; never move the
+            # cursor past the sync start so those changes are picked up next time
+            state.modified_cursor = min(newest, started) if newest is not None else None
+            state.last_synced_at = started
+        state.contacts = self.db.query(func.count(CrmContact.id)).filter(CrmContact.provider == provider).scalar()
+        self.db.commit()
+        logger.info(f"{provider} mirror sync: {synced} contacts in {pages} pages (since={since})")
+        return {
+            "success": True,
+            "provider": provider,
+            "mode": "full" if since is None else "incremental",
+            "synced": synced,
+            "pages": pages,
+            "complete": complete,
+            "modified_cursor": state.modified_cursor.isoformat() if state.modified_cursor else None,
+            "contacts": state.contacts,
+        }
+
+    def status(self, provider: str) -> Dict[str, Any]:
+        """Return the mirror size and sync cursor for a provider"""
+        state = self.db.get(CrmSyncState, provider)
+        return {
+            "provider": provider,
+            "contacts": state.contacts if state else 0,
+            "modified_cursor": state.modified_cursor.isoformat() if state and state.modified_cursor else None,
+            "last_synced_at": state.last_synced_at.isoformat() if state and state.last_synced_at else None,
+        }
+
+    def find_existing(self, provider: str, leads: List[Dict[str, Any]]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Match leads against mirrored contacts by email, phone or company domain
+
+        All keys are looked up in a few indexed IN queries, after which each
+        lead is resolved with dictionary lookups.
+
+        Args:
+            provider: CRM provider
+            leads: Lead dictionaries (email, phone, website)
+
+        Returns:
+            One entry per lead: None, or {"external_id", "matched_on"}
+        """
+        keys = [self._lead_keys(lead) for lead in leads]
+        emails = {email for email, _, _ in keys if email}
+        phones = {phone for _, phone, _ in keys if phone}
+        domains = {domain for _, _, domain in keys if domain}
+
+        by_email: Dict[str, str] = {}
+        by_phone: Dict[str, str] = {}
+        by_domain: Dict[str, str] = {}
+        for column, values, index in (
+            (CrmContact.email, emails, by_email),
+            (CrmContact.phone_key, phones, by_phone),
+            (CrmContact.email_domain, domains, by_domain),
+            (CrmContact.website_domain, domains, by_domain),
+        ):
+            for batch in chunked(values, 500):
+                rows = self.db.query(column, CrmContact.external_id).filter(
+                    CrmContact.provider == provider, column.in_(batch)
+                )
+                for value, external_id in rows:
+                    index.setdefault(value, external_id)
+
+        matches: List[Optional[Dict[str, Any]]] = []
+        for email, phone, domain in keys:
+            if email and email in by_email:
+                matches.append({"external_id": by_email[email], "matched_on": "email"})
+            elif phone and phone in by_phone:
+                matches.append({"external_id": by_phone[phone], "matched_on": "phone"})
+            elif domain and domain in by_domain:
+                matches.append({"external_id": by_domain[domain], "matched_on": "domain"})
+            else:
+                matches.append(None)
+        return matches
+
+    def partition_new(self, provider: str, leads: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Split leads into those missing from the mirror and those already in the CRM
+
+        Returns:
+            Tuple of (new leads, existing matches with their input index and email)
+        """
+        new_leads: List[Dict[str, Any]] = []
+        existing: List[Dict[str, Any]] = []
+        for index, (lead, match) in enumerate(zip(leads, self.find_existing(provider, leads))):
+            if match is None:
+                new_leads.append(lead)
+            else:
+                existing.append({"index": index, "email": lead.get("email"), **match})
+        return new_leads, existing
+
+    def search(
+        self,
+        provider: str,
+        query: Optional[str] = None,
+        limit: int = 10,
+        after: Optional[str] = None,
+        email: Optional[str] = None,
+        domain: Optional[str] = None,
+        company: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Search mirrored contacts
+
+        Emails, domains and phone numbers use the indexed key columns; other
+        queries are prefix matches on name, company and email. The exact
+        filters are ANDed with the query, as in the live HubSpot search.
+
+        Args:
+            provider: CRM provider
+            query: Search string
+            limit: Page size
+            after: Offset cursor from a previous page
+            email: Exact email filter
+            domain: Exact email domain filter
+            company: Exact company name filter (case-insensitive)
+
+        Returns:
+            Dictionary shaped like the live search response
+        """
+        query = (query or "").strip().lower()
+        offset = int(after) if after and after.isdigit() else 0
+        rows = self.db.query(CrmContact).filter(CrmContact.provider == provider)
+
+        if "@" in query and " " not in query:
+            rows = rows.filter(CrmContact.email == query)
+        elif normalize_phone(query) and not any(c.isalpha() for c in query):
+            rows = rows.filter(CrmContact.phone_key == normalize_phone(query))
+        elif "." in query and " " not in query and extract_domain(query):
+            domain = extract_domain(query)
+            rows = rows.filter(or_(CrmContact.email_domain == domain, CrmContact.website_domain == domain))
+        elif query:
+            pattern = f"{query}%"
+            rows = rows.filter(or_(
+                func.lower(CrmContact.firstname).like(pattern),
+                func.lower(CrmContact.lastname).like(pattern),
+                func.lower(CrmContact.company).like(pattern),
+                CrmContact.email.like(pattern),
+            ))
+        if email:
+            rows = rows.filter(CrmContact.email == email.strip().lower())
+        if domain:
+            domain = domain.strip().lower()
+            # Free-mail and placeholder domains are not stored in email_domain
+            rows = rows.filter(or_(CrmContact.email_domain == domain, CrmContact.email.like(f"%@{domain}")))
+        if company:
+            rows = rows.filter(func.lower(CrmContact.company) == company.strip().lower())
+
+        total = rows.count()
+        page = rows.order_by(CrmContact.id).offset(offset).limit(limit).all()
+        next_offset = offset + len(page)
+        return {
+            "success": True,
+            "total": total,
+            "contacts": [self._to_contact(contact) for contact in page],
+            "next_after": str(next_offset) if next_offset < total else None,
+            "source": "mirror",
+        }
+
+    def _iter_pages(self, provider: str, service: Any, since: Optional[datetime]) -> Iterator[List[Dict[str, Any]]]:
+        """Yield pages of raw provider records, raising RuntimeError on API errors"""
+        if provider == "hubspot":
+            after = None
+            window_start = since
+            newest = since
+            while True:
+                if window_start is None:
+                    result = service.get_contacts(limit=100, after=after)
+                else:
+                    result = service.get_contacts_modified_since(window_start, after=after)
+                data = self._unwrap(result)
+                records = data.get("results", [])
+                yield records
+                for record in records:
+                    modified = self._parse_timestamp(record.get("updatedAt"))
+                    if modified and (newest is None or modified > newest):
+                        newest = modified
+                after = ((data.get("paging") or {}).get("next") or {}).get("after")
+                if not after:
+                    return
+                if window_start is not None and after.isdigit() and int(after) >= _HUBSPOT_SEARCH_WINDOW:
+                    # Search only sorts on one property, so a window filled by contacts sharing one
+                    # timestamp cannot be split further; restarting there would loop forever
+                    if newest is None or newest <= window_start:
+                        raise RuntimeError(
+                            f"More than {_HUBSPOT_SEARCH_WINDOW} HubSpot contacts share the modification "
+                            f"time {window_start.isoformat()}; run a full sync instead"
+                        )
+                    window_start, after = newest, None
+        elif provider == "zoho":
+            # Pushes write Leads; Contacts holds converted leads and people added by hand
+            for module in _ZOHO_MODULES:
+                page, page_token = 1, None
+                while True:
+                    data = self._unwrap(service.get_contacts(
+                        limit=200, page=page, modified_since=since, page_token=page_token, module=module
+                    ))
+                    yield data.get("data") or []
+                    info = data.get("info") or {}
+                    if not info.get("more_records"):
+                        break
+                    page += 1
+                    page_token = info.get("next_page_token")
+        elif provider == "salesforce":
+            data = self._unwrap(service.get_contacts(limit=None, modified_since=since))
+            while True:
+                yield data.get("records") or []
+                if data.get("done", True) or not data.get("nextRecordsUrl"):
+                    return
+                data = self._unwrap(service.get_contacts(next_url=data["nextRecordsUrl"]))
+        else:
+            raise ValueError(f"Unknown CRM provider: {provider}")
+
+    @staticmethod
+    def _unwrap(result: Dict[str, Any]) -> Dict[str, Any]:
+        if not result.get("success"):
+            raise RuntimeError(result.get("error") or "CRM request failed")
+        return result.get("data") or {}
+
+    def _to_row(self, provider: str, record: Dict[str, Any], synced_at: datetime) -> Optional[Dict[str, Any]]:
+        """Flatten a provider record into a CrmContact row"""
+        if provider == "hubspot":
+            props = record.get("properties") or {}
+            fields = {
+                "external_id": record.get("id"),
+                "email": props.get("email"),
+                "phone": props.get("phone"),
+                "firstname": props.get("firstname"),
+                "lastname": props.get("lastname"),
+                "company": props.get("company"),
+                "website": props.get("website"),
+                "modified_at": record.get("updatedAt") or props.get("lastmodifieddate"),
+            }
+        elif provider == "zoho":
+            account = record.get("Account_Name")
+            fields = {
+                "external_id": record.get("id"),
+                "email": record.get("Email"),
+                "phone": record.get("Phone") or record.get("Mobile"),
+                "firstname": record.get("First_Name"),
+                "lastname": record.get("Last_Name"),
+                # Leads carry a plain Company; Contacts link an Account
+                "company": (account.get("name") if isinstance(account, dict) else account) or record.get("Company"),
+                "website": record.get("Website"),
+                "modified_at": record.get("Modified_Time"),
+            }
+        else:
+            account = record.get("Account") or {}
+            fields = {
+                "external_id": record.get("Id"),
+                "email": record.get("Email"),
+                "phone": record.get("Phone"),
+                "firstname": record.get("FirstName"),
+                "lastname": record.get("LastName"),
+                "company": account.get("Name"),
+                "website": account.get("Website"),
+                "modified_at": record.get("LastModifiedDate"),
+            }
+
+        if not fields["external_id"]:
+            return None
+        email = str(fields["email"] or "").strip().lower() or None
+        email_domain = extract_domain(email) if email else None
+        return {
+            **fields,
+            "provider": provider,
+            "external_id": str(fields["external_id"]),
+            "email": email,
+            "email_domain": _company_domain(email_domain),
+            "website_domain": extract_domain(fields["website"]),
+            "phone_key": normalize_phone(fields["phone"]),
+            "modified_at": self._parse_timestamp(fields["modified_at"]),
+            "synced_at": synced_at,
+        }
+
+    def _upsert(self, rows: List[Dict[str, Any]]) -> None:
+        """Insert or update rows keyed on (provider, external_id)"""
+        if not rows:
+            return
+        dialect = self.db.get_bind().dialect.name
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        elif dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            for row in rows:
+                existing = self.db.query(CrmContact).filter_by(
+                    provider=row["provider"], external_id=row["external_id"]
+                ).one_or_none()
+                if existing is None:
+                    self.db.add(CrmContact(**row))
+                else:
+                    for column in _UPDATE_COLUMNS:
+                        setattr(existing, column, row[column])
+            self.db.flush()
+            return
+
+        stmt = insert(CrmContact)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["provider", "external_id"],
+            set_={column: stmt.excluded[column] for column in _UPDATE_COLUMNS},
+        )
+        self.db.execute(stmt, rows)
+
+    @staticmethod
+    def _lead_keys(lead: Dict[str, Any]) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+        email = str(lead.get("email") or "").strip().lower() or None
+        domain = extract_domain(lead.get("website"))
+        if not domain and email:
+            domain = extract_domain(email)
+        return email, normalize_phone(lead.get("phone")), _company_domain(domain)
+
+    @staticmethod
+    def _to_contact(contact: CrmContact) -> Dict[str, Any]:
+        return {
+            "id": contact.external_id,
+            "properties": {
+                "email": contact.email,
+                "firstname": contact.firstname,
+                "lastname": contact.lastname,
+                "phone": contact.phone,
+                "company": contact.company,
+                "website": contact.website,
+            },
+            "updatedAt": contact.modified_at.isoformat() if contact.modified_at else None,
+        }
+
+    @staticmethod
+    def _parse_timestamp(value: Any) -> Optional[datetime]:
+        """Parse ISO-8601 or epoch-millisecond timestamps into naive UTC"""
+        if not value:
+            return None
+        if isinstance(value, datetime):
+            parsed = value
+        else:
+            text = str(value).strip()
+            try:
+                if text.isdigit():
+                    return datetime.utcfromtimestamp(int(text) / 1000)
+                parsed = datetime.fromisoformat(text.replace("Z", "+00:00"))
+            except ValueError:
+                return None
+        if parsed.tzinfo is not None:
+            parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+        return parsed
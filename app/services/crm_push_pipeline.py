@@ -0,0 +1,497 @@
+"""
+CRM Push Pipeline - Provider-agnostic, checkpointed bulk pushes of leads to a CRM
+Leads are stored as job items, streamed through a bounded queue to a worker pool
+whose concurrency adapts to provider throttling, and marked done batch by batch.
+Each job is claimed by one worker process with a conditional UPDATE and held by a
+heartbeat; items whose call was in flight when a process stopped are resent
+through the provider's upsert so they are not created twice
+"""
+
+import json
+import logging
+import os
+import queue
+import re
+import socket
+import threading
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import func, or_
+
+from app.config import settings
+from app.db.models import CrmPushItem, CrmPushJob
+from app.db.session import SessionLocal
+from app.utils.helpers import chunked
+
+logger = logging.getLogger(__name__)
+
+PushFunction = Callable[[Any, List[Dict[str, Any]]], Dict[str, Any]]
+
+# Provider -> (records per call, push function taking (service, leads), idempotent push for items
+# whose earlier call may already have been applied)
+PROVIDER_ADAPTERS: Dict[str, Tuple[int, PushFunction, PushFunction]] = {
+    "hubspot": (100, lambda service, leads: service.batch_upsert_leads(leads),
+                lambda service, leads: service.batch_upsert_leads(leads)),
+    "zoho": (100, lambda service, leads: service.batch_upsert_leads(leads),
+             lambda service, leads: service.batch_upsert_leads(leads)),
+    "salesforce": (200, lambda service, leads: service.batch_create_leads(leads),
+                   lambda service, leads: service.batch_upsert_leads(leads)),
+}
+
+_THROTTLE_ERROR = re.compile(r"API error: (429|5\d\d)\b")
+_UNFINISHED_STATUSES = ("queued", "running")
+_OPEN_ITEM_STATUSES = ("pending", "sending", "resend")
+
+
+def register_provider(
+    provider: str,
+    batch_size: int,
+    push: PushFunction,
+    upsert: Optional[PushFunction] = None,
+) -> None:
+    """Register a CRM so the pipeline can push to it
+
+    upsert resends items that may already exist in the CRM; it defaults to
+    push, which is only right when push is itself idempotent.
+    """
+    PROVIDER_ADAPTERS[provider] = (batch_size, push, upsert or push)
+
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD concurrency limit: one more slot after a clean window, halved on 429/5xx."""
+
+    def __init__(self, initial: int = 2, minimum: int = 1, maximum: int = 8):
+        self.limit = max(minimum, min(initial, maximum))
+        self.minimum = minimum
+        self.maximum = maximum
+        self.in_flight = 0
+        self.backoffs = 0
+        self._clean_calls = 0
+        self._cond = threading.Condition()
+
+    def acquire(self) -> None:
+        with self._cond:
+            while self.in_flight >= self.limit:
+                self._cond.wait()
+            self.in_flight += 1
+
+    def release(self, congested: bool) -> None:
+        with self._cond:
+            self.in_flight -= 1
+            if congested:
+                self.limit = max(self.minimum, self.limit // 2)
+                self._clean_calls = 0
+                self.backoffs += 1
+            else:
+                self._clean_calls += 1
+                if self._clean_calls >= self.limit:
+                    self.limit = min(self.maximum, self.limit + 1)
+                    self._clean_calls = 0
+            self._cond.notify_all()
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._cond:
+            return {"limit": self.limit, "in_flight": self.in_flight, "backoffs": self.backoffs}
+
+
+class CrmPushPipeline:
+    """Runs push jobs: bounded queue, per-provider workers, adaptive concurrency, DB checkpoints"""
+
+    def __init__(
+        self,
+        service_factory: Callable[[str], Any],
+        session_factory: Callable[[], Any] = SessionLocal,
+        max_concurrency: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        lease_seconds: Optional[float] = None,
+    ):
+        """
+        Initialize the pipeline
+
+        Args:
+            service_factory: Returns the connected service for a provider name
+            session_factory: Creates database sessions
+            max_concurrency: Upper bound of concurrent calls per provider
+            queue_size: Batches buffered between the DB reader and the workers
+            lease_seconds: Heartbeat age after which another process may take over a running job
+        """
+        self.service_factory = service_factory
+        self.session_factory = session_factory
+        self.max_concurrency = max_concurrency or settings.CRM_PUSH_MAX_CONCURRENCY
+        self.queue_size = queue_size or settings.CRM_PUSH_QUEUE_SIZE
+        self.lease_seconds = lease_seconds or settings.CRM_PUSH_LEASE_SECONDS
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._limiters: Dict[str, AdaptiveConcurrencyLimiter] = {}
+        self._running: Dict[str, threading.Thread] = {}
+        self._lock = threading.Lock()
+        # SQLite allows one writer at a time; serialize checkpoints instead of retrying lock errors
+        self._db_lock = threading.Lock()
+
+    def submit(
+        self,
+        provider: str,
+        leads: Iterable[Dict[str, Any]],
+        start: bool = True,
+        user_id: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Store leads as a new push job and start it in the background
+
+        Args:
+            provider: CRM provider
+            leads: Lead dictionaries; any iterable, consumed 1000 at a time
+            start: Start processing immediately
+            user_id: Owner of the job, if signed in
+
+        Returns:
+            Dictionary with the job id and total
+        """
+        if provider not in PROVIDER_ADAPTERS:
+            raise ValueError(f"Unknown CRM provider: {provider}")
+        job_id = str(uuid.uuid4())
+        total = 0
+        with self._db_lock:
+            db = self.session_factory()
+            try:
+                job = CrmPushJob(id=job_id, provider=provider, user_id=user_id, status="queued", total=0)
+                db.add(job)
+                db.flush()
+                for batch in chunked(enumerate(leads), 1000):
+                    db.bulk_insert_mappings(CrmPushItem, [
+                        {"job_id": job_id, "seq": seq, "payload": json.dumps(lead, default=str), "status": "pending"}
+                        for seq, lead in batch
+                    ])
+                    total += len(batch)
+                job.total = total
+                db.commit()
+            finally:
+                db.close()
+        if start:
+            self.start(job_id)
+        return {"job_id": job_id, "provider": provider, "total": total, "status": "queued"}
+
+    def start(self, job_id: str) -> bool:
+        """Claim a job and process its pending items on a background thread; False if it is already running"""
+        if self._is_running(job_id) or not self._claim(job_id):
+            return False
+        self._spawn(job_id)
+        return True
+
+    def resume(self, job_id: str, retry_failed: bool = False) -> Dict[str, Any]:
+        """
+        Continue a job from its last checkpoint
+
+        Args:
+            job_id: Push job id
+            retry_failed: Also re-send items that failed, through the provider's upsert
+
+        Returns:
+            Job status
+        """
+        if not self._is_running(job_id) and self._claim(job_id, retry_failed=retry_failed):
+            self._spawn(job_id)
+        return self.status(job_id)
+
+    def resume_unfinished(self) -> List[str]:
+        """
+        Restart jobs interrupted by a shutdown; call at startup
+
+        Every worker process calls this and each job is claimed by exactly one
+        of them. Jobs still held by another process are checked again once its
+        lease could have run out.
+        """
+        db = self.session_factory()
+        try:
+            job_ids = [row.id for row in db.query(CrmPushJob.id).filter(CrmPushJob.status.in_(_UNFINISHED_STATUSES))]
+        finally:
+            db.close()
+        resumed = [job_id for job_id in job_ids if self.start(job_id)]
+        for job_id in resumed:
+            logger.info(f"Resumed CRM push job {job_id}")
+        if any(job_id not in resumed and not self._is_running(job_id) for job_id in job_ids):
+            timer = threading.Timer(self.lease_seconds, self.resume_unfinished)
+            timer.daemon = True
+            timer.start()
+        return resumed
+
+    def status(self, job_id: str) -> Dict[str, Any]:
+        """Return progress counters, throughput and the provider's current concurrency"""
+        db = self.session_factory()
+        try:
+            job = db.get(CrmPushJob, job_id)
+            if job is None:
+                raise KeyError(job_id)
+            pending = db.query(func.count(CrmPushItem.id)).filter(
+                CrmPushItem.job_id == job_id, CrmPushItem.status.in_(_OPEN_ITEM_STATUSES)
+            ).scalar()
+            end = job.finished_at or datetime.utcnow()
+            elapsed = (end - job.created_at).total_seconds()
+            processed = job.succeeded + job.failed
+            return {
+                "job_id": job.id,
+                "provider": job.provider,
+                "status": job.status,
+                "total": job.total,
+                "succeeded": job.succeeded,
+                "failed": job.failed,
+                "pending": pending,
+                "running": self._is_running(job_id),
+                "leads_per_second": round(processed / elapsed, 2) if elapsed > 0 else None,
+                "concurrency": self._limiter(job.provider).snapshot(),
+                "error": job.error,
+            }
+        finally:
+            db.close()
+
+    def iter_leads(self, job_id: str, page_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """Yield the leads of an existing job in their original order"""
+        last_seq = -1
+        while True:
+            db = self.session_factory()
+            try:
+                rows = db.query(CrmPushItem.seq, CrmPushItem.payload).filter(
+                    CrmPushItem.job_id == job_id, CrmPushItem.seq > last_seq
+                ).order_by(CrmPushItem.seq).limit(page_size).all()
+            finally:
+                db.close()
+            if not rows:
+                return
+            for row in rows:
+                yield json.loads(row.payload)
+            last_seq = rows[-1].seq
+
+    def failures(self, job_id: str, limit: int = 100) -> List[Dict[str, Any]]:
+        """Return failed items with their errors"""
+        db = self.session_factory()
+        try:
+            rows = db.query(CrmPushItem).filter(
+                CrmPushItem.job_id == job_id, CrmPushItem.status == "failed"
+            ).order_by(CrmPushItem.seq).limit(limit)
+            return [{"seq": row.seq, "lead": json.loads(row.payload), "error": row.error} for row in rows]
+        finally:
+            db.close()
+
+    def _claim(self, job_id: str, retry_failed: bool = False) -> bool:
+        """
+        Take a job for this process with a conditional UPDATE
+
+        Only one process can win: the job must not be running, or its owner's
+        heartbeat must be older than the lease. Items that were in flight under
+        the previous owner (and, with retry_failed, failed items) are marked
+        for resending through the provider's upsert.
+        """
+        now = datetime.utcnow()
+        values: Dict[Any, Any] = {"status": "running", "owner": self.worker_id, "updated_at": now, "finished_at": None}
+        if retry_failed:
+            values["failed"] = 0
+        with self._db_lock:
+            db = self.session_factory()
+            try:
+                claimed = db.query(CrmPushJob).filter(
+                    CrmPushJob.id == job_id,
+                    or_(
+                        CrmPushJob.status != "running",
+                        CrmPushJob.owner.is_(None),
+                        CrmPushJob.updated_at < now - timedelta(seconds=self.lease_seconds),
+                    ),
+                ).update(values, synchronize_session=False)
+                if claimed:
+                    resend = ("sending", "failed") if retry_failed else ("sending",)
+                    db.query(CrmPushItem).filter(
+                        CrmPushItem.job_id == job_id, CrmPushItem.status.in_(resend)
+                    ).update({"status": "resend", "error": None}, synchronize_session=False)
+                db.commit()
+                return bool(claimed)
+            finally:
+                db.close()
+
+    def _spawn(self, job_id: str) -> None:
+        with self._lock:
+            thread = threading.Thread(target=self._run, args=(job_id,), name=f"crm-push-{job_id[:8]}", daemon=True)
+            self._running[job_id] = thread
+        thread.start()
+
+    def _run(self, job_id: str) -> None:
+        db = self.session_factory()
+        try:
+            provider = db.get(CrmPushJob, job_id).provider
+        finally:
+            db.close()
+
+        batch_size, push, upsert = PROVIDER_ADAPTERS[provider]
+        limiter = self._limiter(provider)
+        batches: "queue.Queue[Optional[Tuple[PushFunction, List[Tuple[int, str]]]]]" = queue.Queue(maxsize=self.queue_size)
+        workers = [
+            threading.Thread(target=self._work, args=(job_id, provider, limiter, batches), daemon=True)
+            for _ in range(self.max_concurrency)
+        ]
+        for worker in workers:
+            worker.start()
+        stop = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(job_id, stop), daemon=True)
+        heartbeat.start()
+
+        error = None
+        try:
+            self._produce(job_id, batch_size, push, upsert, batches)
+        except Exception as e:
+            error = str(e)
+            logger.error(f"CRM push job {job_id} stopped reading items: {error}")
+        finally:
+            for _ in workers:
+                batches.put(None)
+            for worker in workers:
+                worker.join()
+            stop.set()
+
+        with self._db_lock:
+            db = self.session_factory()
+            try:
+                job = db.get(CrmPushJob, job_id)
+                if job.owner != self.worker_id:
+                    logger.warning(f"CRM push job {job_id} was taken over by {job.owner}")
+                    return
+                if error:
+                    job.status, job.error = "failed", error
+                else:
+                    job.status = "completed" if job.failed == 0 else "completed_with_errors"
+                job.finished_at = datetime.utcnow()
+                db.commit()
+                logger.info(f"CRM push job {job_id} {job.status}: {job.succeeded} ok, {job.failed} failed")
+            finally:
+                db.close()
+
+    def _heartbeat(self, job_id: str, stop: threading.Event) -> None:
+        """Keep this process's claim on a job fresh while it runs"""
+        while not stop.wait(self.lease_seconds / 3):
+            with self._db_lock:
+                db = self.session_factory()
+                try:
+                    db.query(CrmPushJob).filter(
+                        CrmPushJob.id == job_id, CrmPushJob.owner == self.worker_id
+                    ).update({"updated_at": datetime.utcnow()}, synchronize_session=False)
+                    db.commit()
+                finally:
+                    db.close()
+
+    def _produce(
+        self,
+        job_id: str,
+        batch_size: int,
+        push: PushFunction,
+        upsert: PushFunction,
+        batches: "queue.Queue",
+    ) -> None:
+        """Read open items page by page, resends first; put() blocks while the workers are behind"""
+        for status, send in (("resend", upsert), ("pending", push)):
+            last_seq = -1
+            while True:
+                db = self.session_factory()
+                try:
+                    rows = db.query(CrmPushItem.id, CrmPushItem.seq, CrmPushItem.payload).filter(
+                        CrmPushItem.job_id == job_id,
+                        CrmPushItem.status == status,
+                        CrmPushItem.seq > last_seq,
+                    ).order_by(CrmPushItem.seq).limit(batch_size * self.queue_size).all()
+                finally:
+                    db.close()
+                if not rows:
+                    break
+                for batch in chunked(rows, batch_size):
+                    batches.put((send, [(row.id, row.payload) for row in batch]))
+                last_seq = rows[-1].seq
+
+    def _work(
+        self,
+        job_id: str,
+        provider: str,
+        limiter: AdaptiveConcurrencyLimiter,
+        batches: "queue.Queue",
+    ) -> None:
+        service = self.service_factory(provider)
+        while True:
+            entry = batches.get()
+            if entry is None:
+                return
+            push, batch = entry
+            self._mark_sending(batch)
+            limiter.acquire()
+            congested = False
+            try:
+                result = push(service, [json.loads(payload) for _, payload in batch])
+                congested = self._is_congested(result)
+            except Exception as e:
+                logger.error(f"CRM push batch failed for job {job_id}: {str(e)}")
+                result = {"success": False, "error": str(e), "outcomes": []}
+                congested = True
+            finally:
+                limiter.release(congested)
+            self._checkpoint(job_id, batch, result)
+
+    def _mark_sending(self, batch: List[Tuple[int, str]]) -> None:
+        """Record that a batch's call is in flight, so a restart knows it may have been applied"""
+        with self._db_lock:
+            db = self.session_factory()
+            try:
+                db.bulk_update_mappings(CrmPushItem, [{"id": item_id, "status": "sending"} for item_id, _ in batch])
+                db.commit()
+            finally:
+                db.close()
+
+    def _checkpoint(self, job_id: str, batch: List[Tuple[int, str]], result: Dict[str, Any]) -> None:
+        """Record per-item outcomes and bump the job counters in one transaction"""
+        outcomes = result.get("outcomes") or []
+        updates = []
+        succeeded = 0
+        for position, (item_id, _) in enumerate(batch):
+            outcome = outcomes[position] if position < len(outcomes) and outcomes[position] else None
+            if outcome and outcome.get("success"):
+                succeeded += 1
+                external_id = outcome.get("contact_id") or outcome.get("id")
+                updates.append({"id": item_id, "status": "done", "external_id": str(external_id) if external_id else None})
+            else:
+                error = (outcome or {}).get("error") or result.get("error") or "No result returned"
+                updates.append({"id": item_id, "status": "failed", "error": str(error)})
+
+        with self._db_lock:
+            db = self.session_factory()
+            try:
+                db.bulk_update_mappings(CrmPushItem, updates)
+                db.query(CrmPushJob).filter(CrmPushJob.id == job_id).update({
+                    "succeeded": CrmPushJob.succeeded + succeeded,
+                    "failed": CrmPushJob.failed + (len(batch) - succeeded),
+                    "updated_at": datetime.utcnow(),
+                }, synchronize_session=False)
+                db.commit()
+            finally:
+                db.close()
+
+    @staticmethod
+    def _is_congested(result: Dict[str, Any]) -> bool:
+        """Whether a call was throttled or hit server errors (even if retries later succeeded)"""
+        if result.get("retried_chunks"):
+            return True
+        for outcome in result.get("outcomes") or []:
+            if not outcome or outcome.get("success"):
+                continue
+            status_code = outcome.get("status_code")
+            if status_code and (status_code == 429 or status_code >= 500):
+                return True
+            if _THROTTLE_ERROR.search(str(outcome.get("error") or "")):
+                return True
+        return False
+
+    def _limiter(self, provider: str) -> AdaptiveConcurrencyLimiter:
+        with self._lock:
+            limiter = self._limiters.get(provider)
+            if limiter is None:
+                limiter = AdaptiveConcurrencyLimiter(initial=2, maximum=self.max_concurrency)
+                self._limiters[provider] = limiter
+            return limiter
+
+    def _is_running(self, job_id: str) -> bool:
+        with self._lock:
+            thread = self._running.get(job_id)
+            return thread is not None and thread.is_alive()
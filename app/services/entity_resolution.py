@@ -0,0 +1,372 @@
+"""
+Entity Resolution - Finds the same business across Google Places, the search provider and imports
+Records are only compared inside blocks that share a phone number, website domain,
+place/cid or geohash cell, so the work grows with block sizes instead of n^2.
+Matches are clustered with union-find and merged field by field by source precedence.
+"""
+
+import logging
+import re
+from collections import defaultdict
+from difflib import SequenceMatcher
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set
+
+from sqlalchemy import or_, update
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.db.models import Business
+from app.utils.helpers import calculate_distance, chunked, extract_domain, geohash_encode, normalize_phone
+
+logger = logging.getLogger(__name__)
+
+# Higher wins when two sources disagree on a field
+SOURCE_PRECEDENCE = {
+    "google_places": 30,
+    "provider": 20,
+    "import": 10,
+}
+
+# Hosts shared by unrelated businesses; a match on these says nothing
+SHARED_DOMAINS = frozenset({
+    "facebook.com", "instagram.com", "twitter.com", "x.com", "tiktok.com", "youtube.com", "linkedin.com",
+    "google.com", "sites.google.com", "business.site", "g.page", "goo.gl", "yelp.com", "linktr.ee", "wa.me",
+})
+
+# Fields merged as ordered unions instead of picking one source
+LIST_FIELDS = ("types", "categories", "photos")
+
+_LEGAL_SUFFIXES = re.compile(r"\b(inc|llc|ltd|limited|co|corp|corporation|company|gmbh|plc|sa|srl|pty)\b")
+_NON_WORD = re.compile(r"[^\w\s]")
+_SPACES = re.compile(r"\s+")
+
+# Business names must be at least this similar when records share a phone/domain ...
+KEYED_NAME_THRESHOLD = 0.6
+# ... and this similar (and close together) when they only share a geohash cell
+GEO_NAME_THRESHOLD = 0.85
+GEO_MAX_DISTANCE_KM = 0.25
+
+
+def normalize_name(name: Any) -> str:
+    """Lowercase, drop punctuation and legal suffixes ("Joe's Pizza, LLC" -> "joes pizza")"""
+    text = str(name or "").lower().replace("&", " and ").replace("'", "")
+    text = _NON_WORD.sub(" ", text)
+    text = _LEGAL_SUFFIXES.sub(" ", text)
+    return _SPACES.sub(" ", text).strip()
+
+
+def name_similarity(a: str, b: str) -> float:
+    """Similarity of two normalized names in [0, 1]"""
+    if not a or not b:
+        return 0.0
+    if a == b:
+        return 1.0
+    tokens_a, tokens_b = set(a.split()), set(b.split())
+    if tokens_a <= tokens_b or tokens_b <= tokens_a:
+        # "joes pizza" vs "joes pizza brooklyn"
+        return 0.9
+    jaccard = len(tokens_a & tokens_b) / len(tokens_a | tokens_b)
+    matcher = SequenceMatcher(None, a, b)
+    # quick_ratio is a cheap upper bound of ratio
+    if matcher.quick_ratio() <= jaccard:
+        return jaccard
+    return max(jaccard, matcher.ratio())
+
+
+class _UnionFind:
+    """Union-find whose sets never hold two different place_ids"""
+
+    def __init__(self, place_ids: Sequence[Optional[str]]):
+        self.parent = list(range(len(place_ids)))
+        # place_id of each root's set, if any member has one
+        self.place_id = list(place_ids)
+
+    def find(self, item: int) -> int:
+        root = item
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[item] != root:
+            self.parent[item], item = root, self.parent[item]
+        return root
+
+    def union(self, a: int, b: int) -> bool:
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return False
+        place_a, place_b = self.place_id[root_a], self.place_id[root_b]
+        # Checked per set, not per pair: a record without a place_id must not bridge two places
+        if place_a and place_b and place_a != place_b:
+            return False
+        root, child = min(root_a, root_b), max(root_a, root_b)
+        self.parent[child] = root
+        self.place_id[root] = place_a or place_b
+        return True
+
+
+class _Features:
+    __slots__ = ("name", "place_id", "cid", "phone", "domain", "geohash", "lat", "lng")
+
+    def __init__(self, record: Dict[str, Any], precision: int):
+        self.name = normalize_name(record.get("name"))
+        self.place_id = record.get("place_id") or None
+        self.cid = record.get("cid") or None
+        self.phone = record.get("phone_key") or normalize_phone(
+            record.get("international_phone_number") or record.get("formatted_phone_number") or record.get("phone")
+        )
+        domain = record.get("domain") or extract_domain(record.get("website"))
+        self.domain = None if domain in SHARED_DOMAINS else domain
+        lat, lng = record.get("latitude"), record.get("longitude")
+        has_position = lat is not None and lng is not None and (lat or lng)
+        self.lat = lat if has_position else None
+        self.lng = lng if has_position else None
+        geohash = record.get("geohash") or (geohash_encode(lat, lng, precision) if has_position else None)
+        self.geohash = geohash[:precision] if geohash else None
+
+
+class EntityResolver:
+    """Clusters records describing the same business and merges them"""
+
+    def __init__(
+        self,
+        max_block_size: Optional[int] = None,
+        geohash_precision: int = 6,
+        precedence: Optional[Dict[str, int]] = None,
+    ):
+        """
+        Initialize the resolver
+
+        Args:
+            max_block_size: Larger blocks are split by a finer geohash, then skipped if still too large
+            geohash_precision: Geohash length of a geo block (6 is roughly 1.2 km x 0.6 km)
+            precedence: Source -> rank used when merging fields
+        """
+        self.max_block_size = max_block_size or settings.ENTITY_MAX_BLOCK_SIZE
+        self.geohash_precision = geohash_precision
+        self.precedence = precedence or SOURCE_PRECEDENCE
+        self.stats: Dict[str, int] = {}
+
+    def cluster(self, records: Sequence[Dict[str, Any]]) -> List[List[int]]:
+        """
+        Group records that describe the same business
+
+        Args:
+            records: Business dictionaries (BusinessResponse fields, or stored rows with phone_key/domain/geohash)
+
+        Returns:
+            Clusters of record indexes; every index appears in exactly one cluster, in input order
+        """
+        features = [_Features(record, self.geohash_precision) for record in records]
+        blocks: Dict[str, List[int]] = defaultdict(list)
+        for index, feature in enumerate(features):
+            for key in self._block_keys(feature):
+                blocks[key].append(index)
+
+        uf = _UnionFind([feature.place_id for feature in features])
+        self.stats = {"records": len(records), "blocks": 0, "comparisons": 0, "matches": 0, "skipped_blocks": 0}
+        for key, members in blocks.items():
+            if len(members) < 2:
+                continue
+            for block in self._cap(key, members, features):
+                self.stats["blocks"] += 1
+                self._compare_block(key, block, features, uf)
+
+        clusters: Dict[int, List[int]] = {}
+        for index in range(len(records)):
+            clusters.setdefault(uf.find(index), []).append(index)
+        return list(clusters.values())
+
+    def merge(self, records: Sequence[Dict[str, Any]], sources: Sequence[Optional[str]]) -> Dict[str, Any]:
+        """
+        Combine one cluster into a single record
+
+        Each field comes from the highest-precedence source that has a value;
+        list fields are unioned and coordinates are taken as a pair.
+        """
+        ranked = sorted(
+            range(len(records)),
+            key=lambda i: (-self.precedence.get(sources[i] or "", 0), i),
+        )
+        merged: Dict[str, Any] = {}
+        for i in ranked:
+            for field, value in records[i].items():
+                if field in LIST_FIELDS:
+                    existing = merged.setdefault(field, [])
+                    for item in value or []:
+                        if item not in existing:
+                            existing.append(item)
+                elif field in ("latitude", "longitude"):
+                    continue
+                elif _is_empty(merged.get(field)) and not _is_empty(value):
+                    merged[field] = value
+        for field, value in records[ranked[0]].items():
+            merged.setdefault(field, value)
+        for i in ranked:
+            lat, lng = records[i].get("latitude"), records[i].get("longitude")
+            if lat is not None and lng is not None and (lat or lng):
+                merged["latitude"], merged["longitude"] = lat, lng
+                break
+        else:
+            merged.setdefault("latitude", records[ranked[0]].get("latitude", 0))
+            merged.setdefault("longitude", records[ranked[0]].get("longitude", 0))
+        return merged
+
+    def resolve(self, records: Sequence[Dict[str, Any]], sources: Any = None) -> List[Dict[str, Any]]:
+        """
+        Deduplicate records, keeping the position of each cluster's first record
+
+        Args:
+            records: Business dictionaries
+            sources: One source name for all records, or one per record
+
+        Returns:
+            Merged records
+        """
+        if isinstance(sources, str) or sources is None:
+            sources = [sources] * len(records)
+        return [
+            self.merge([records[i] for i in cluster], [sources[i] for i in cluster])
+            for cluster in self.cluster(records)
+        ]
+
+    def link_stored(self, db: Session, business_ids: Iterable[int]) -> int:
+        """
+        Assign entity ids to stored businesses by resolving them against indexed candidates
+
+        Only rows sharing a phone, domain or geohash cell with the given
+        businesses are loaded, so this stays cheap on a large table.
+
+        Args:
+            db: Database session (the caller commits)
+            business_ids: Newly stored or updated business ids
+
+        Returns:
+            Number of rows whose entity changed
+        """
+        business_ids = list({business_id for business_id in business_ids if business_id is not None})
+        if not business_ids:
+            return 0
+        rows = self._load(db, [Business.id.in_(chunk) for chunk in chunked(business_ids, 500)])
+        phones = {row["phone_key"] for row in rows if row["phone_key"]}
+        domains = {row["domain"] for row in rows if row["domain"] and row["domain"] not in SHARED_DOMAINS}
+        cells = {row["geohash"][:self.geohash_precision] for row in rows if row["geohash"]}
+        conditions = [Business.phone_key.in_(chunk) for chunk in chunked(phones, 500)]
+        conditions += [Business.domain.in_(chunk) for chunk in chunked(domains, 500)]
+        conditions += [
+            or_(*[Business.geohash.between(cell, cell + "~") for cell in chunk]) for chunk in chunked(cells, 100)
+        ]
+        known = {row["id"] for row in rows}
+        rows += [row for row in self._load(db, conditions) if row["id"] not in known]
+
+        changed = 0
+        for cluster in self.cluster(rows):
+            members = [rows[i] for i in cluster]
+            entity_id = min(row["entity_id"] or row["id"] for row in members)
+            stale = {row["entity_id"] for row in members if row["entity_id"] and row["entity_id"] != entity_id}
+            unassigned = [row["id"] for row in members if row["entity_id"] is None or row["entity_id"] in stale]
+            if stale:
+                # Two existing entities turned out to be one: fold the whole group, not just loaded members
+                for chunk in chunked(stale, 500):
+                    changed += db.execute(
+                        update(Business).where(Business.entity_id.in_(chunk)).values(entity_id=entity_id)
+                        .execution_options(synchronize_session=False)
+                    ).rowcount
+            for chunk in chunked(unassigned, 500):
+                changed += db.execute(
+                    update(Business).where(Business.id.in_(chunk), Business.entity_id.is_(None)).values(entity_id=entity_id)
+                    .execution_options(synchronize_session=False)
+                ).rowcount
+        return changed
+
+    def rebuild_stored(self, db: Session, batch_size: int = 5000) -> int:
+        """Resolve every stored business, one id batch at a time; returns rows changed"""
+        changed = 0
+        last_id = 0
+        while True:
+            ids = [
+                business_id for (business_id,) in
+                db.query(Business.id).filter(Business.id > last_id).order_by(Business.id).limit(batch_size)
+            ]
+            if not ids:
+                return changed
+            changed += self.link_stored(db, ids)
+            db.commit()
+            last_id = ids[-1]
+
+    def _block_keys(self, feature: _Features) -> List[str]:
+        keys = []
+        if feature.place_id:
+            keys.append(f"pid:{feature.place_id}")
+        if feature.cid:
+            keys.append(f"cid:{feature.cid}")
+        if feature.phone:
+            keys.append(f"phone:{feature.phone}")
+        if feature.domain:
+            keys.append(f"domain:{feature.domain}")
+        if feature.geohash:
+            keys.append(f"geo:{feature.geohash}")
+        return keys
+
+    def _cap(self, key: str, members: List[int], features: List[_Features]) -> List[List[int]]:
+        """Split blocks over max_block_size (chains sharing a domain, dense malls) by a finer cell"""
+        if len(members) <= self.max_block_size or key.startswith(("pid:", "cid:")):
+            return [members]
+        finer: Dict[Optional[str], List[int]] = defaultdict(list)
+        precision = self.geohash_precision + (1 if key.startswith("geo:") else 0)
+        for index in members:
+            feature = features[index]
+            cell = geohash_encode(feature.lat, feature.lng, precision) if feature.lat is not None else None
+            finer[cell].append(index)
+        blocks = []
+        for cell, block in finer.items():
+            if cell is None or len(block) > self.max_block_size:
+                self.stats["skipped_blocks"] += 1
+                logger.info(f"Skipping oversized entity block {key} ({len(block)} records)")
+                continue
+            blocks.append(block)
+        return blocks
+
+    def _compare_block(self, key: str, block: List[int], features: List[_Features], uf: _UnionFind) -> None:
+        exact = key.startswith(("pid:", "cid:"))
+        keyed = key.startswith(("phone:", "domain:"))
+        for position, i in enumerate(block):
+            for j in block[position + 1:]:
+                if uf.find(i) == uf.find(j):
+                    continue
+                self.stats["comparisons"] += 1
+                if (exact or self._matches(features[i], features[j], keyed)) and uf.union(i, j):
+                    self.stats["matches"] += 1
+
+    @staticmethod
+    def _matches(a: _Features, b: _Features, keyed: bool) -> bool:
+        if a.place_id and b.place_id and a.place_id != b.place_id:
+            # Google already tells these places apart (e.g. branches sharing a head-office phone)
+            return False
+        if keyed:
+            return name_similarity(a.name, b.name) >= KEYED_NAME_THRESHOLD
+        # Geo-only candidates: conflicting phones/domains or distance rule a pair out before names are compared
+        if (a.phone and b.phone and a.phone != b.phone) or (a.domain and b.domain and a.domain != b.domain):
+            return False
+        if a.lat is None or b.lat is None or calculate_distance(a.lat, a.lng, b.lat, b.lng) > GEO_MAX_DISTANCE_KM:
+            return False
+        return name_similarity(a.name, b.name) >= GEO_NAME_THRESHOLD
+
+    @staticmethod
+    def _load(db: Session, conditions: List[Any]) -> List[Dict[str, Any]]:
+        columns = (
+            Business.id, Business.entity_id, Business.place_id, Business.cid, Business.name,
+            Business.phone_key, Business.domain, Business.geohash, Business.latitude, Business.longitude,
+        )
+        rows: List[Dict[str, Any]] = []
+        for condition in conditions:
+            rows.extend(row._asdict() for row in db.query(*columns).filter(condition))
+        seen: Set[int] = set()
+        unique = []
+        for row in rows:
+            if row["id"] not in seen:
+                seen.add(row["id"])
+                unique.append(row)
+        return unique
+
+
+def _is_empty(value: Any) -> bool:
+    return value is None or value == "" or value == [] or value == {}
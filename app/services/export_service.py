@@ -0,0 +1,267 @@
+"""
+Export Service - Stream search and enrichment results as CSV, Parquet or XLSX
+Records are flattened with the same rules as normalize_results_consistency
+(every field seen in any record becomes a column, missing values are null, and
+limited_fields keeps only requested fields that have data). The column set is
+taken from result_columns, which normalize_results_consistency also uses;
+rows are then converted to DataFrames and written a chunk at a time, so the
+whole file is never held in memory.
+
+pandas is required; pyarrow (Parquet) and openpyxl (XLSX) are imported only
+when those formats are requested.
+"""
+
+import json
+import logging
+import os
+import tempfile
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from app.config import settings
+from app.utils.helpers import result_columns
+
+logger = logging.getLogger(__name__)
+
+# format -> (media type, file extension, module the writer needs)
+EXPORT_FORMATS = {
+    "csv": ("text/csv; charset=utf-8", "csv", "pandas"),
+    "parquet": ("application/vnd.apache.parquet", "parquet", "pyarrow"),
+    "xlsx": ("application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", "xlsx", "openpyxl"),
+}
+
+# Excel's sheet limit, minus the header row
+XLSX_MAX_ROWS = 1_048_575
+
+_STREAM_BLOCK = 64 * 1024
+
+
+def _column_kind(kinds: set) -> str:
+    """Column type from the Python types seen in it"""
+    if not kinds or kinds == {"str"}:
+        return "text"
+    if kinds == {"bool"}:
+        return "bool"
+    if kinds == {"int"}:
+        return "int"
+    if kinds <= {"int", "float"}:
+        return "float"
+    # Lists, dicts and mixed columns are written as text
+    return "nested"
+
+
+def _kind_of(value: Any) -> str:
+    if isinstance(value, bool):
+        return "bool"
+    if isinstance(value, int):
+        return "int"
+    if isinstance(value, float):
+        return "float"
+    if isinstance(value, str):
+        return "str"
+    return "other"
+
+
+def export_columns(records: Sequence[Dict[str, Any]], limited_fields: Optional[List[str]] = None) -> List[Tuple[str, str]]:
+    """
+    Columns of an export and their kinds
+
+    The column set comes from result_columns, the same function that
+    normalize_results_consistency uses, so exports and normalized results
+    always agree on which columns exist and in what order.
+
+    Args:
+        records: Result dictionaries
+        limited_fields: Optional fields to keep; fields without any non-null value are dropped
+
+    Returns:
+        (column, kind) pairs, kind being one of text, int, float, bool, nested
+    """
+    columns = result_columns(records, limited_fields)
+    kinds: Dict[str, set] = {column: set() for column in columns}
+    for record in records:
+        for column, seen in kinds.items():
+            value = record.get(column)
+            if value is not None:
+                seen.add(_kind_of(value))
+    return [(column, _column_kind(kinds[column])) for column in columns]
+
+
+def _text_cell(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return value
+    if isinstance(value, list) and all(isinstance(item, str) for item in value):
+        return "; ".join(value)
+    return json.dumps(value, ensure_ascii=False, default=str)
+
+
+_PANDAS_DTYPES = {"int": "Int64", "float": "float64", "bool": "boolean"}
+
+
+def _frame(chunk: Sequence[Dict[str, Any]], columns: List[Tuple[str, str]]):
+    """DataFrame of one chunk with the export's fixed columns and dtypes"""
+    import pandas as pd
+
+    names = [name for name, _ in columns]
+    frame = pd.DataFrame.from_records(chunk, columns=names)
+    for name, kind in columns:
+        if kind == "nested":
+            frame[name] = frame[name].map(_text_cell, na_action="ignore")
+        elif kind in _PANDAS_DTYPES:
+            frame[name] = frame[name].astype(_PANDAS_DTYPES[kind])
+    return frame
+
+
+def _chunks(records: Sequence[Dict[str, Any]], size: int) -> Iterator[Sequence[Dict[str, Any]]]:
+    for start in range(0, len(records), size):
+        yield records[start:start + size]
+
+
+class ResultExporter:
+    """Service for writing result dictionaries to a tabular file format"""
+
+    def __init__(self, file_format: str, chunk_size: Optional[int] = None):
+        """
+        Initialize the exporter
+
+        Args:
+            file_format: csv, parquet or xlsx
+            chunk_size: Rows converted and written per step
+
+        Raises:
+            ValueError: Unknown format
+            ImportError: The format's writer library is not installed
+        """
+        if file_format not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format: {file_format}. Use one of {', '.join(EXPORT_FORMATS)}")
+        self.file_format = file_format
+        self.media_type, self.extension, module = EXPORT_FORMATS[file_format]
+        self.chunk_size = chunk_size or settings.EXPORT_CHUNK_SIZE
+        for name in ("pandas", module):
+            try:
+                __import__(name)
+            except ImportError as exc:
+                raise ImportError(f"{file_format} export needs the {name} package") from exc
+
+    def filename(self, stem: str) -> str:
+        return f"{stem}.{self.extension}"
+
+    def stream(self, records: Sequence[Dict[str, Any]], limited_fields: Optional[List[str]] = None) -> Iterator[bytes]:
+        """
+        Encoded file contents, yielded as they are produced
+
+        Args:
+            records: Result dictionaries (read twice: once for the columns, once for the rows)
+            limited_fields: Optional fields to keep (see normalize_results_consistency)
+        """
+        if self.file_format == "xlsx" and len(records) > XLSX_MAX_ROWS:
+            raise ValueError(f"XLSX exports are limited to {XLSX_MAX_ROWS} rows; use csv or parquet")
+        columns = export_columns(records, limited_fields)
+        writer = getattr(self, f"_{self.file_format}")
+        return writer(records, columns)
+
+    def _csv(self, records: Sequence[Dict[str, Any]], columns: List[Tuple[str, str]]) -> Iterator[bytes]:
+        if not columns:
+            return
+        yield _frame([], columns).to_csv(index=False).encode("utf-8")
+        for chunk in _chunks(records, self.chunk_size):
+            yield _frame(chunk, columns).to_csv(index=False, header=False).encode("utf-8")
+
+    def _parquet(self, records: Sequence[Dict[str, Any]], columns: List[Tuple[str, str]]) -> Iterator[bytes]:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        types = {"int": pa.int64(), "float": pa.float64(), "bool": pa.bool_()}
+        schema = pa.schema([(name, types.get(kind, pa.string())) for name, kind in columns])
+        sink = _DrainBuffer()
+        # One row group per chunk; the bytes written so far are handed out after each one
+        with pq.ParquetWriter(sink, schema) as writer:
+            for chunk in _chunks(records, self.chunk_size):
+                writer.write_table(pa.Table.from_pandas(_frame(chunk, columns), schema=schema, preserve_index=False))
+                yield sink.drain()
+        yield sink.drain()
+
+    def _xlsx(self, records: Sequence[Dict[str, Any]], columns: List[Tuple[str, str]]) -> Iterator[bytes]:
+        from openpyxl import Workbook
+
+        # Write-only workbooks stream rows to temporary XML; the zip is assembled in a temp file
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet("results")
+        sheet.append([name for name, _ in columns])
+        for chunk in _chunks(records, self.chunk_size):
+            frame = _frame(chunk, columns)
+            frame = frame.astype(object).where(frame.notna(), None)
+            for row in frame.itertuples(index=False, name=None):
+                sheet.append(row)
+        handle, path = tempfile.mkstemp(suffix=".xlsx")
+        os.close(handle)
+        try:
+            workbook.save(path)
+            with open(path, "rb") as f:
+                while True:
+                    block = f.read(_STREAM_BLOCK)
+                    if not block:
+                        break
+                    yield block
+        finally:
+            os.unlink(path)
+
+
+class _DrainBuffer:
+    """Write-only file object whose contents can be taken out as they are written"""
+
+    closed = False
+
+    def __init__(self):
+        self._parts: List[bytes] = []
+        self._position = 0
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._parts.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def writable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return False
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts = []
+        return data
+
+
+def enrichment_rows(results: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    One row per extracted contact, prefixed with the business it belongs to
+
+    Businesses without contacts keep a single row so failed or empty
+    enrichments still show up in the export.
+    """
+    rows = []
+    for result in results:
+        business = {
+            "business_name": result.get("name"),
+            "business_website": result.get("website"),
+            "status": result.get("status"),
+            "confidence": result.get("confidence"),
+        }
+        contacts = result.get("contacts") or []
+        if not contacts:
+            rows.append(business)
+        for contact in contacts:
+            rows.append({**business, **{f"contact_{key}": value for key, value in contact.items()}})
+    return rows
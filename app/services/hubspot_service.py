@@ -1,12 +1,28 @@
 """HubSpot API Service for Lead Ingestion"""
+import json
 import logging
+import time
 import requests
-from typing import Optional, Dict, Any, List
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Optional, Dict, Any, List, Callable, Tuple
 from app.config import settings
+from app.utils.http_client import get_http_session, request_not_sent
+from app.utils.helpers import chunked, parse_retry_after
+from app.utils.token_bucket import TokenBucket, get_token_bucket
+from app.utils.ttl_cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
 HUBSPOT_BASE_URL = "https://api.hubapi.com"
+# HubSpot rejects batch requests with more than 100 inputs
+HUBSPOT_BATCH_SIZE = 100
+HUBSPOT_MAX_ATTEMPTS = 5
+# The CRM search endpoints have their own, lower limit of 5 requests per second
+HUBSPOT_SEARCH_RATE_PER_SECOND = 4
+CONTACT_PROPERTIES = ["firstname", "lastname", "email", "phone", "company", "website"]
+
+_search_cache = TTLCache(ttl=settings.HUBSPOT_SEARCH_CACHE_TTL, maxsize=512)
 
 
 class HubSpotService:
@@ -24,6 +40,8 @@ class HubSpotService:
             "Authorization": f"Bearer {self.access_token}",
             "Content-Type": "application/json"
         }
+        # Shared keep-alive pool: every HubSpotService reuses the same connections
+        self.session = get_http_session("hubspot")
     
     def verify_connection(self) -> Dict[str, Any]:
         """Verify HubSpot API connection
@@ -32,7 +50,7 @@ class HubSpotService:
             Dictionary with connection status and portal info
         """
         try:
-            response = requests.get(
+            response = self.session.get(
                 f"{self.base_url}/crm/v3/objects/contacts?limit=1",
                 headers=self.headers,
                 timeout=10
@@ -67,7 +85,7 @@ class HubSpotService:
                 "properties": properties
             }
             
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/crm/v3/objects/contacts",
                 json=payload,
                 headers=self.headers,
@@ -100,84 +118,307 @@ class HubSpotService:
         Returns:
             Dictionary with upserted contact info or error
         """
-        try:
-            properties = self._map_to_hubspot_properties(lead_data)
-            email = lead_data.get("email")
-            
-            if not email:
-                return {"success": False, "error": "Email is required for upsert"}
-            
-            payload = {
-                "inputs": [{
-                    "email": email,
-                    "properties": properties
-                }]
+        if not lead_data.get("email"):
+            return {"success": False, "error": "Email is required for upsert"}
+        
+        result = self.batch_upsert_leads([lead_data])
+        if result.get("success"):
+            outcome = result["outcomes"][0]
+            return {
+                "success": True,
+                "contact_id": outcome.get("contact_id"),
+                "data": result.get("data")
             }
-            
-            response = requests.post(
-                f"{self.base_url}/crm/v3/objects/contacts/batch/upsert",
-                json=payload,
-                headers=self.headers,
-                timeout=10
-            )
-            
-            if response.status_code in [200, 201]:
-                result = response.json()
-                return {
-                    "success": True,
-                    "data": result
-                }
+        return {"success": False, "error": result.get("error", "Failed to upsert contact")}
+    
+    def batch_upsert_leads(self, leads: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Create or update many contacts in HubSpot, keyed by email
+        
+        Leads sharing an email are merged (later non-empty values win) so each
+        contact is sent once, then upserted in concurrent 100-lead chunks.
+        
+        Args:
+            leads: List of lead data dictionaries
+        
+        Returns:
+            Dictionary with created/updated counts and per-lead outcomes
+        """
+        merged: Dict[str, Dict[str, Any]] = {}
+        positions: Dict[str, List[int]] = {}
+        missing_email: List[int] = []
+        for index, lead in enumerate(leads):
+            email = str(lead.get("email") or "").strip().lower()
+            if not email:
+                missing_email.append(index)
+                continue
+            if email in merged:
+                merged[email].update({k: v for k, v in lead.items() if v not in (None, "")})
             else:
-                return {
-                    "success": False,
-                    "error": f"HubSpot API error: {response.status_code}",
-                    "details": response.text
-                }
+                merged[email] = dict(lead)
+            positions.setdefault(email, []).append(index)
+
+        emails = list(merged)
+        try:
+            result = self._ingest_batches(
+                "/crm/v3/objects/contacts/batch/upsert",
+                [merged[email] for email in emails],
+                lambda lead: {
+                    "idProperty": "email",
+                    "id": str(lead["email"]).strip(),
+                    "properties": self._map_to_hubspot_properties(lead),
+                },
+            )
         except Exception as e:
-            logger.error(f"Error upserting HubSpot lead: {str(e)}")
-            return {"success": False, "error": str(e)}
+            logger.error(f"Error batch upserting HubSpot leads: {str(e)}")
+            return {"success": False, "error": str(e), "total": len(leads)}
+
+        # Fan outcomes back out to the caller's indexes, duplicates included
+        outcomes: List[Optional[Dict[str, Any]]] = [None] * len(leads)
+        for outcome in result["outcomes"]:
+            for index in positions[emails[outcome["index"]]]:
+                outcomes[index] = {**outcome, "index": index}
+        for index in missing_email:
+            outcomes[index] = {
+                "index": index,
+                "email": None,
+                "success": False,
+                "error": "Email is required for upsert",
+            }
+
+        succeeded = [o for o in result["outcomes"] if o["success"]]
+        created = sum(1 for o in succeeded if o.get("new"))
+        failed = len(emails) - len(succeeded) + len(missing_email)
+        result.update({
+            "success": failed == 0,
+            "total": len(leads),
+            "unique": len(emails),
+            "duplicates": len(leads) - len(emails) - len(missing_email),
+            "created": created,
+            "updated": len(succeeded) - created,
+            "failed": failed,
+            "outcomes": outcomes,
+        })
+        if missing_email and "error" not in result:
+            result["error"] = "Email is required for upsert"
+        return result
     
     def batch_create_leads(self, leads: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Create multiple contacts in HubSpot
         
+        Leads are split into API-sized batches which are sent concurrently,
+        paced by a per-portal token bucket. Creates are not idempotent, so a
+        chunk is only resent after a 429 (honouring Retry-After) or a failure
+        to connect; timeouts and 5xx responses mark the chunk as failed, since
+        HubSpot may already have created the contacts. Use batch_upsert_leads
+        for safe retries.
+        
         Args:
             leads: List of lead data dictionaries
         
         Returns:
-            Dictionary with batch creation results
+            Dictionary with batch creation results, per-lead outcomes and throughput
         """
         try:
-            inputs = []
-            for lead in leads:
-                inputs.append({
-                    "properties": self._map_to_hubspot_properties(lead)
-                })
-            
-            payload = {"inputs": inputs}
-            
-            response = requests.post(
-                f"{self.base_url}/crm/v3/objects/contacts/batch/create",
-                json=payload,
-                headers=self.headers,
-                timeout=30
+            return self._ingest_batches(
+                "/crm/v3/objects/contacts/batch/create",
+                leads,
+                lambda lead: {"properties": self._map_to_hubspot_properties(lead)},
+                idempotent=False,
             )
-            
-            if response.status_code in [200, 201]:
-                result = response.json()
-                return {
-                    "success": True,
-                    "total": len(leads),
-                    "data": result
-                }
-            else:
-                return {
-                    "success": False,
-                    "error": f"HubSpot API error: {response.status_code}",
-                    "details": response.text
-                }
         except Exception as e:
             logger.error(f"Error batch creating HubSpot leads: {str(e)}")
             return {"success": False, "error": str(e), "total": len(leads)}
+
+    def _ingest_batches(
+        self,
+        path: str,
+        leads: List[Dict[str, Any]],
+        build_input: Callable[[Dict[str, Any]], Dict[str, Any]],
+        idempotent: bool = True,
+    ) -> Dict[str, Any]:
+        """Send leads to a HubSpot batch endpoint in concurrent, throttled chunks
+        
+        Args:
+            path: Batch endpoint path
+            leads: Lead data dictionaries
+            build_input: Maps a lead to one entry of the request "inputs"
+            idempotent: Whether a chunk may be resent after a timeout or 5xx
+        
+        Returns:
+            Dictionary with totals, per-lead outcomes and leads_per_second
+        """
+        started = time.perf_counter()
+        chunks = list(chunked(list(enumerate(leads)), HUBSPOT_BATCH_SIZE))
+        outcomes: List[Optional[Dict[str, Any]]] = [None] * len(leads)
+        results: List[Dict[str, Any]] = []
+        retried_chunks = 0
+
+        if chunks:
+            workers = max(1, min(settings.HUBSPOT_BATCH_CONCURRENCY, len(chunks)))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                for chunk_outcomes, chunk_results, attempts in pool.map(
+                    lambda chunk: self._send_chunk(path, chunk, build_input, idempotent), chunks
+                ):
+                    for outcome in chunk_outcomes:
+                        outcomes[outcome["index"]] = outcome
+                    results.extend(chunk_results)
+                    if attempts > 1:
+                        retried_chunks += 1
+
+        elapsed = time.perf_counter() - started
+        succeeded = sum(1 for outcome in outcomes if outcome and outcome["success"])
+        failed = len(leads) - succeeded
+        result = {
+            "success": failed == 0,
+            "total": len(leads),
+            "created": succeeded,
+            "failed": failed,
+            "data": {"results": results},
+            "outcomes": outcomes,
+            "chunks": len(chunks),
+            "retried_chunks": retried_chunks,
+            "elapsed_seconds": round(elapsed, 3),
+            "leads_per_second": round(len(leads) / elapsed, 2) if elapsed > 0 else None,
+        }
+        if failed:
+            first_error = next(o for o in outcomes if o and not o["success"])
+            result["error"] = first_error.get("error")
+        return result
+
+    def _send_chunk(
+        self,
+        path: str,
+        chunk: List[Tuple[int, Dict[str, Any]]],
+        build_input: Callable[[Dict[str, Any]], Dict[str, Any]],
+        idempotent: bool = True,
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], int]:
+        """POST one chunk, retrying on 429 and connect errors, and on 5xx/other network errors when idempotent
+        
+        Returns:
+            Tuple of (per-lead outcomes, raw HubSpot results, attempts made)
+        """
+        payload = {"inputs": [build_input(lead) for _, lead in chunk]}
+        bucket = self._rate_limiter()
+        error = "HubSpot batch request failed"
+        status_code = None
+        attempt = 0
+        for attempt in range(1, HUBSPOT_MAX_ATTEMPTS + 1):
+            bucket.acquire()
+            try:
+                response = self.session.post(
+                    f"{self.base_url}{path}",
+                    json=payload,
+                    headers=self.headers,
+                    timeout=30
+                )
+            except requests.exceptions.RequestException as e:
+                error, status_code = str(e), None
+                if not idempotent and not request_not_sent(e):
+                    break
+                time.sleep(min(2 ** (attempt - 1), 30))
+                continue
+
+            status_code = response.status_code
+            if status_code == 429:
+                wait = parse_retry_after(response.headers.get("Retry-After"), default=min(2 ** attempt, 30))
+                logger.warning(f"HubSpot rate limited batch; retrying in {wait}s")
+                bucket.pause(wait)
+                error = "HubSpot API error: 429"
+                continue
+            if status_code >= 500:
+                error = f"HubSpot API error: {status_code}"
+                if not idempotent:
+                    break
+                time.sleep(min(2 ** (attempt - 1), 30))
+                continue
+            if status_code in [200, 201, 207]:
+                data = response.json()
+                return self._match_batch_results(chunk, data), data.get("results", []), attempt
+
+            # Other 4xx errors fail the whole chunk and will not succeed on retry
+            error = f"HubSpot API error: {status_code}"
+            return self._failed_outcomes(chunk, error, status_code, response.text), [], attempt
+
+        return self._failed_outcomes(chunk, error, status_code), [], attempt
+
+    def _match_batch_results(
+        self,
+        chunk: List[Tuple[int, Dict[str, Any]]],
+        data: Dict[str, Any],
+    ) -> List[Dict[str, Any]]:
+        """Pair HubSpot batch results (returned in no particular order) with their leads by email
+
+        Results are never paired by position: in a partial (207) response that
+        would report a failed lead as created with another lead's id. Leads
+        without a result for their email are failed; when results were left
+        over that could not be matched, the error says the lead's state is
+        unknown.
+        """
+        by_email: Dict[str, List[Dict[str, Any]]] = {}
+        unmatched = 0
+        for item in data.get("results", []) or []:
+            email = str((item.get("properties") or {}).get("email") or "").lower()
+            if email:
+                by_email.setdefault(email, []).append(item)
+            else:
+                unmatched += 1
+
+        outcomes: List[Optional[Dict[str, Any]]] = [None] * len(chunk)
+        for position, (index, lead) in enumerate(chunk):
+            email = str(lead.get("email") or "").lower()
+            if email and by_email.get(email):
+                outcomes[position] = self._success_outcome(index, lead, by_email[email].pop(0))
+
+        unmatched += sum(len(items) for items in by_email.values())
+        errors = data.get("errors") or []
+        error = "; ".join(str(e.get("message")) for e in errors if e.get("message")) or "No result returned for lead"
+        if unmatched:
+            error = f"Result could not be matched to the lead by email; it may have been created ({error})"
+        for position, (index, lead) in enumerate(chunk):
+            if outcomes[position] is None:
+                outcomes[position] = {
+                    "index": index,
+                    "email": lead.get("email"),
+                    "success": False,
+                    "error": error,
+                }
+        return outcomes
+
+    def _success_outcome(self, index: int, lead: Dict[str, Any], item: Dict[str, Any]) -> Dict[str, Any]:
+        outcome = {
+            "index": index,
+            "email": lead.get("email"),
+            "success": True,
+            "contact_id": item.get("id"),
+        }
+        if "new" in item:
+            # Only upsert results say whether the contact was created or updated
+            outcome["new"] = item["new"]
+        return outcome
+
+    def _failed_outcomes(
+        self,
+        chunk: List[Tuple[int, Dict[str, Any]]],
+        error: str,
+        status_code: Optional[int],
+        details: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        return [
+            {
+                "index": index,
+                "email": lead.get("email"),
+                "success": False,
+                "status_code": status_code,
+                "error": error,
+                "details": details,
+            }
+            for index, lead in chunk
+        ]
+
+    def _rate_limiter(self) -> TokenBucket:
+        """Token bucket shared by every service instance using the same portal token"""
+        per_second = max(settings.HUBSPOT_RATE_LIMIT_PER_10S / 10.0, 0.1)
+        return get_token_bucket("hubspot", self.access_token, rate=per_second, capacity=per_second)
     
     def get_contacts(self, limit: int = 100, after: Optional[str] = None) -> Dict[str, Any]:
         """Get contacts from HubSpot
@@ -192,12 +433,12 @@ class HubSpotService:
         try:
             params = {
                 "limit": limit,
-                "properties": ["firstname", "lastname", "email", "phone", "company", "website"]
+                "properties": CONTACT_PROPERTIES
             }
             if after:
                 params["after"] = after
             
-            response = requests.get(
+            response = self.session.get(
                 f"{self.base_url}/crm/v3/objects/contacts",
                 headers=self.headers,
                 params=params,
@@ -215,6 +456,137 @@ class HubSpotService:
             logger.error(f"Error retrieving HubSpot contacts: {str(e)}")
             return {"success": False, "error": str(e)}
     
+    def get_contacts_modified_since(
+        self,
+        since: datetime,
+        after: Optional[str] = None,
+        limit: int = 100,
+    ) -> Dict[str, Any]:
+        """Get contacts modified at or after `since`, oldest first
+        
+        Args:
+            since: Naive UTC timestamp
+            after: Pagination token
+            limit: Page size (max 100)
+        
+        Returns:
+            Dictionary with the raw search response
+        """
+        try:
+            since_ms = int(since.replace(tzinfo=timezone.utc).timestamp() * 1000)
+            body: Dict[str, Any] = {
+                "limit": limit,
+                "properties": CONTACT_PROPERTIES + ["lastmodifieddate"],
+                "filterGroups": [{"filters": [
+                    {"propertyName": "lastmodifieddate", "operator": "GTE", "value": str(since_ms)}
+                ]}],
+                "sorts": [{"propertyName": "lastmodifieddate", "direction": "ASCENDING"}],
+            }
+            if after:
+                body["after"] = after
+            
+            get_token_bucket("hubspot-search", self.access_token, rate=HUBSPOT_SEARCH_RATE_PER_SECOND).acquire()
+            response = self.session.post(
+                f"{self.base_url}/crm/v3/objects/contacts/search",
+                json=body,
+                headers=self.headers,
+                timeout=30
+            )
+            
+            if response.status_code == 200:
+                return {"success": True, "data": response.json()}
+            else:
+                return {
+                    "success": False,
+                    "error": f"HubSpot API error: {response.status_code}"
+                }
+        except Exception as e:
+            logger.error(f"Error retrieving modified HubSpot contacts: {str(e)}")
+            return {"success": False, "error": str(e)}
+    
+    def search_contacts(
+        self,
+        query: Optional[str] = None,
+        limit: int = 10,
+        after: Optional[str] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        properties: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """Search contacts with HubSpot's CRM search API
+        
+        Matching happens server side, so the cost of a page does not depend on
+        portal size. Email-shaped queries become an exact email filter; other
+        queries use HubSpot's full-text search over the default contact
+        properties. Pages are cached briefly per portal.
+        
+        Args:
+            query: Free-text search string
+            limit: Page size (max 100)
+            after: Cursor from a previous page's next_after
+            filters: Property -> value equality filters, ANDed together
+            properties: Properties to return
+        
+        Returns:
+            Dictionary with contacts, HubSpot's total match count and next_after cursor
+        """
+        query = (query or "").strip()
+        property_filters = [
+            {"propertyName": name, "operator": "EQ", "value": value}
+            for name, value in sorted((filters or {}).items())
+            if value not in (None, "")
+        ]
+        body: Dict[str, Any] = {
+            "limit": max(1, min(limit, 100)),
+            "properties": properties or CONTACT_PROPERTIES,
+        }
+        if query and "@" in query and " " not in query:
+            property_filters.append({"propertyName": "email", "operator": "EQ", "value": query.lower()})
+        elif query:
+            body["query"] = query
+        if property_filters:
+            body["filterGroups"] = [{"filters": property_filters}]
+        if after:
+            body["after"] = after
+
+        cache_key = (self.access_token, json.dumps(body, sort_keys=True))
+        cached = _search_cache.get(cache_key)
+        if cached is not None:
+            return {**cached, "cached": True}
+
+        try:
+            bucket = get_token_bucket("hubspot-search", self.access_token, rate=HUBSPOT_SEARCH_RATE_PER_SECOND)
+            for attempt in range(1, 4):
+                bucket.acquire()
+                response = self.session.post(
+                    f"{self.base_url}/crm/v3/objects/contacts/search",
+                    json=body,
+                    headers=self.headers,
+                    timeout=10
+                )
+                if response.status_code != 429:
+                    break
+                bucket.pause(parse_retry_after(response.headers.get("Retry-After"), default=attempt))
+
+            if response.status_code != 200:
+                return {
+                    "success": False,
+                    "error": f"HubSpot API error: {response.status_code}",
+                    "details": response.text
+                }
+
+            data = response.json()
+            result = {
+                "success": True,
+                "total": data.get("total", 0),
+                "contacts": data.get("results", []),
+                "next_after": ((data.get("paging") or {}).get("next") or {}).get("after"),
+            }
+            _search_cache.set(cache_key, result)
+            return {**result, "cached": False}
+        except Exception as e:
+            logger.error(f"Error searching HubSpot contacts: {str(e)}")
+            return {"success": False, "error": str(e)}
+    
     def create_deal(self, deal_data: Dict[str, Any], contact_id: Optional[str] = None) -> Dict[str, Any]:
         """Create a deal in HubSpot
         
@@ -235,7 +607,7 @@ class HubSpotService:
             
             payload = {"properties": properties}
             
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/crm/v3/objects/deals",
                 json=payload,
                 headers=self.headers,
@@ -283,7 +655,7 @@ class HubSpotService:
                 }]
             }
             
-            response = requests.put(
+            response = self.session.put(
                 f"{self.base_url}/crm/v3/objects/deals/batch/associate",
                 json=payload,
                 headers=self.headers,
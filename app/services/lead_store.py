@@ -0,0 +1,383 @@
+"""
+Lead Store - Local, indexed copy of businesses returned by searches
+Search results are upserted by place_id (or cid) so exports, enrichment and
+dedupe can read them back instead of paying for the external search again
+"""
+
+import json
+import logging
+import math
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import case, func, insert
+from sqlalchemy.orm import Session
+
+from app.db.models import Business, BusinessContact, SearchRun, SearchRunResult
+from app.services.entity_resolution import SOURCE_PRECEDENCE, EntityResolver
+from app.utils.helpers import calculate_distance, chunked, extract_domain, geohash_encode, normalize_phone
+
+logger = logging.getLogger(__name__)
+
+# Columns refreshed on conflict; a missing value in the new result keeps the stored one,
+# and a lower-precedence source only fills gaps
+_UPDATE_COLUMNS = (
+    "place_id", "cid", "source", "name", "primary_type", "phone", "phone_key", "website", "domain",
+    "formatted_address", "city", "state", "country", "postal_code", "latitude", "longitude",
+    "geohash", "rating", "user_ratings_total", "data", "updated_at",
+)
+
+_LOOKUP_CHUNK = 500
+
+
+def source_key(result: Dict[str, Any]) -> Optional[str]:
+    """Stable identity of a search result: its place_id, else its Google Maps cid"""
+    place_id = str(result.get("place_id") or "").strip()
+    if place_id:
+        return place_id
+    cid = str(result.get("cid") or "").strip()
+    return f"cid:{cid}" if cid else None
+
+
+class LeadStore:
+    """Service for storing search results and reading them back"""
+
+    def __init__(self, db: Session):
+        """
+        Initialize the store
+
+        Args:
+            db: Database session (the caller commits)
+        """
+        self.db = db
+
+    def upsert_businesses(self, results: Iterable[Dict[str, Any]], source: Optional[str] = None) -> List[Optional[int]]:
+        """
+        Insert or refresh businesses in bulk
+
+        Args:
+            results: BusinessResponse dictionaries
+            source: Where the results came from ("google_places", "provider", "import")
+
+        Returns:
+            Business ids aligned with `results` (None for results without a place_id or cid)
+        """
+        results = list(results)
+        now = datetime.utcnow()
+        rows: Dict[str, Dict[str, Any]] = {}
+        keys: List[Optional[str]] = []
+        for result in results:
+            row = self._to_row(result, now, source)
+            keys.append(row["source_key"] if row else None)
+            if row:
+                # Later duplicates win, as a single upsert statement may not touch a row twice
+                rows[row["source_key"]] = row
+        self._upsert(list(rows.values()))
+        ids = self.ids_for(rows.keys())
+        return [ids.get(key) if key else None for key in keys]
+
+    def ids_for(self, keys: Iterable[str]) -> Dict[str, int]:
+        """Map source keys to business ids"""
+        ids: Dict[str, int] = {}
+        for chunk in chunked(keys, _LOOKUP_CHUNK):
+            ids.update(self.db.query(Business.source_key, Business.id).filter(Business.source_key.in_(chunk)))
+        return ids
+
+    def save_search_run(self, search_run_id: str, results: List[Dict[str, Any]], source: Optional[str] = None) -> int:
+        """
+        Store a search's results, link them in order to its run and resolve them against stored businesses
+
+        Args:
+            search_run_id: SearchRun id
+            results: BusinessResponse dictionaries in response order
+            source: Where the results came from
+
+        Returns:
+            Number of linked results
+        """
+        business_ids = self.upsert_businesses(results, source)
+        links = [
+            {"search_run_id": search_run_id, "position": position, "business_id": business_id}
+            for position, business_id in enumerate(business_ids)
+            if business_id is not None
+        ]
+        if links:
+            self.db.execute(insert(SearchRunResult), links)
+            EntityResolver().link_stored(self.db, business_ids)
+        return len(links)
+
+    def run_results(self, search_run_id: str) -> List[Dict[str, Any]]:
+        """
+        Stored businesses of a search run, in the order they were returned
+
+        Rows resolved to the same entity are returned once, merged with every
+        stored record of that entity by source precedence.
+        """
+        rows = (
+            self.db.query(Business.id, Business.entity_id)
+            .join(SearchRunResult, SearchRunResult.business_id == Business.id)
+            .filter(SearchRunResult.search_run_id == search_run_id)
+            .order_by(SearchRunResult.position)
+            .all()
+        )
+        entity_ids = list(dict.fromkeys(entity_id or business_id for business_id, entity_id in rows))
+        members: Dict[int, List[Any]] = {}
+        for chunk in chunked(entity_ids, _LOOKUP_CHUNK):
+            query = self.db.query(Business.id, Business.entity_id, Business.source, Business.data).filter(
+                (Business.entity_id.in_(chunk)) | (Business.id.in_(chunk))
+            )
+            for business_id, entity_id, source, data in query:
+                members.setdefault(entity_id or business_id, []).append((source, data))
+        resolver = EntityResolver()
+        merged = []
+        for entity_id in entity_ids:
+            group = members.get(entity_id, [])
+            if len(group) == 1:
+                merged.append(json.loads(group[0][1]))
+            elif group:
+                merged.append(resolver.merge([json.loads(data) for _, data in group], [source for source, _ in group]))
+        return merged
+
+    def search_run_records(self, run: SearchRun) -> List[Dict[str, Any]]:
+        """
+        Every result of a saved search run
+
+        Results with a place_id or cid are read from the stored businesses;
+        the few without one are kept in the run's own results column and
+        follow them. Runs saved before the lead store only have that column.
+        """
+        stored = self.run_results(run.id)
+        fallback = json.loads(run.results or "[]")
+        if not stored:
+            return fallback
+        return stored + [result for result in fallback if source_key(result) is None]
+
+    def run_contacts(self, search_run_id: str) -> List[Dict[str, Any]]:
+        """Stored enrichment results of a search run's enriched businesses, in result order"""
+        businesses = (
+            self.db.query(Business.id, Business.name, Business.website, Business.contacts_confidence)
+            .join(SearchRunResult, SearchRunResult.business_id == Business.id)
+            .filter(SearchRunResult.search_run_id == search_run_id, Business.contacts_enriched_at.isnot(None))
+            .order_by(SearchRunResult.position)
+            .all()
+        )
+        business_ids = list(dict.fromkeys(business.id for business in businesses))
+        contacts: Dict[int, List[Dict[str, Any]]] = {}
+        for chunk in chunked(business_ids, _LOOKUP_CHUNK):
+            rows = (
+                self.db.query(BusinessContact.business_id, BusinessContact.data)
+                .filter(BusinessContact.business_id.in_(chunk))
+                .order_by(BusinessContact.id)
+            )
+            for business_id, data in rows:
+                contacts.setdefault(business_id, []).append(json.loads(data))
+        results = []
+        seen = set()
+        for business_id, name, website, confidence in businesses:
+            if business_id in seen:
+                continue
+            seen.add(business_id)
+            business_contacts = contacts.get(business_id, [])
+            results.append({
+                "name": name,
+                "website": website,
+                "contacts": business_contacts,
+                "confidence": confidence or 0.0,
+                "status": "success" if business_contacts else "no_contacts_found",
+            })
+        return results
+
+    def find(self, domain: Optional[str] = None, phone: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        """Stored businesses matching a website domain or phone number"""
+        query = self.db.query(Business.data)
+        domain = extract_domain(domain)
+        phone_key = normalize_phone(phone)
+        if domain:
+            query = query.filter(Business.domain == domain)
+        if phone_key:
+            query = query.filter(Business.phone_key == phone_key)
+        if not domain and not phone_key:
+            return []
+        return [json.loads(data) for (data,) in query.limit(limit)]
+
+    def nearby(self, latitude: float, longitude: float, radius_km: float, limit: int = 50) -> List[Dict[str, Any]]:
+        """
+        Stored businesses within `radius_km`, nearest first
+
+        A bounding box on the (latitude, longitude) index narrows the rows
+        before exact distances are computed.
+        """
+        lat_delta = radius_km / 111.32
+        lng_delta = radius_km / max(111.32 * math.cos(math.radians(latitude)), 1e-6)
+        rows = (
+            self.db.query(Business.latitude, Business.longitude, Business.data)
+            .filter(
+                Business.latitude.between(latitude - lat_delta, latitude + lat_delta),
+                Business.longitude.between(longitude - lng_delta, longitude + lng_delta),
+            )
+        )
+        matches = []
+        for lat, lng, data in rows:
+            distance = calculate_distance(latitude, longitude, lat, lng)
+            if distance <= radius_km:
+                matches.append((distance, data))
+        matches.sort(key=lambda match: match[0])
+        return [json.loads(data) for _, data in matches[:limit]]
+
+    def save_contacts(
+        self,
+        place_id: str,
+        domain: Optional[str],
+        contacts: List[Dict[str, Any]],
+        confidence: Optional[float] = None,
+    ) -> int:
+        """
+        Replace the stored contacts of a business with a fresh enrichment result
+
+        Args:
+            place_id: Stored business the contacts belong to
+            domain: Domain of the website the contacts were extracted from
+            contacts: Contact dictionaries
+            confidence: Extraction confidence
+
+        Returns:
+            Number of contacts stored (0 when the business is not stored or
+            the website is not the business's own)
+        """
+        business = self._business_on_domain(place_id, domain)
+        if business is None:
+            return 0
+        self.db.query(BusinessContact).filter(BusinessContact.business_id == business.id).delete(
+            synchronize_session=False
+        )
+        rows = [
+            {
+                "business_id": business.id,
+                "name": contact.get("name") or "",
+                "title": contact.get("title"),
+                "email": (contact.get("email") or "").strip().lower() or None,
+                "phone": contact.get("phone"),
+                "phone_key": normalize_phone(contact.get("phone")),
+                "source_url": contact.get("source_url"),
+                "data": json.dumps(contact, default=str),
+                "created_at": datetime.utcnow(),
+            }
+            for contact in contacts
+        ]
+        if rows:
+            self.db.execute(insert(BusinessContact), rows)
+        business.contacts_enriched_at = datetime.utcnow()
+        business.contacts_confidence = confidence
+        return len(rows)
+
+    def get_contacts(self, place_id: str, domain: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Stored contacts and extraction confidence of a business on `domain`, or None if it was never enriched"""
+        business = self._business_on_domain(place_id, domain)
+        if business is None or business.contacts_enriched_at is None:
+            return None
+        rows = (
+            self.db.query(BusinessContact.data)
+            .filter(BusinessContact.business_id == business.id)
+            .order_by(BusinessContact.id)
+        )
+        return {
+            "contacts": [json.loads(data) for (data,) in rows],
+            "confidence": business.contacts_confidence or 0.0,
+            "enriched_at": business.contacts_enriched_at,
+        }
+
+    def _business_on_domain(self, place_id: str, domain: Optional[str]) -> Optional[Business]:
+        # Contacts are only tied to a business when they come from its own website
+        if not domain:
+            return None
+        return (
+            self.db.query(Business)
+            .filter(Business.source_key == place_id, Business.domain == domain)
+            .one_or_none()
+        )
+
+    def count(self) -> int:
+        return self.db.query(func.count(Business.id)).scalar() or 0
+
+    def _upsert(self, rows: List[Dict[str, Any]]) -> None:
+        """Insert or update rows keyed on source_key with one executemany per chunk"""
+        if not rows:
+            return
+        dialect = self.db.get_bind().dialect.name
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        elif dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        else:
+            existing = {}
+            for chunk in chunked([row["source_key"] for row in rows], _LOOKUP_CHUNK):
+                existing.update(
+                    (business.source_key, business)
+                    for business in self.db.query(Business).filter(Business.source_key.in_(chunk))
+                )
+            for row in rows:
+                business = existing.get(row["source_key"])
+                if business is None:
+                    self.db.add(Business(**row))
+                    continue
+                incoming_wins = SOURCE_PRECEDENCE.get(row["source"] or "", 0) >= SOURCE_PRECEDENCE.get(business.source or "", 0)
+                for column in _UPDATE_COLUMNS:
+                    if row[column] is not None and (incoming_wins or getattr(business, column) is None):
+                        setattr(business, column, row[column])
+            self.db.flush()
+            return
+
+        table = Business.__table__
+        stmt = dialect_insert(Business)
+        incoming_wins = _source_rank(stmt.excluded.source) >= _source_rank(table.c.source)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["source_key"],
+            set_={
+                column: case(
+                    (incoming_wins, func.coalesce(stmt.excluded[column], table.c[column])),
+                    else_=func.coalesce(table.c[column], stmt.excluded[column]),
+                )
+                for column in _UPDATE_COLUMNS
+            },
+        )
+        self.db.execute(stmt, rows)
+
+    @staticmethod
+    def _to_row(result: Dict[str, Any], now: datetime, source: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        key = source_key(result)
+        if key is None:
+            return None
+        latitude = result.get("latitude")
+        longitude = result.get("longitude")
+        has_position = latitude is not None and longitude is not None and (latitude or longitude)
+        phone = result.get("international_phone_number") or result.get("formatted_phone_number")
+        return {
+            "source_key": key,
+            "place_id": result.get("place_id") or None,
+            "cid": result.get("cid") or None,
+            "source": source,
+            "name": result.get("name") or "",
+            "primary_type": result.get("primary_type") or None,
+            "phone": phone or None,
+            "phone_key": normalize_phone(phone),
+            "website": result.get("website") or None,
+            "domain": extract_domain(result.get("website")),
+            "formatted_address": result.get("formatted_address") or None,
+            "city": result.get("city") or None,
+            "state": result.get("state") or None,
+            "country": result.get("country") or None,
+            "postal_code": result.get("postal_code") or None,
+            "latitude": latitude if has_position else None,
+            "longitude": longitude if has_position else None,
+            "geohash": geohash_encode(latitude, longitude) if has_position else None,
+            "rating": result.get("rating"),
+            "user_ratings_total": result.get("user_ratings_total"),
+            "data": json.dumps(result, default=str),
+            "first_seen_at": now,
+            "updated_at": now,
+        }
+
+
+def _source_rank(column: Any) -> Any:
+    """SQL expression ranking a source column by SOURCE_PRECEDENCE (unknown sources rank 0)"""
+    return case(*((column == source, rank) for source, rank in SOURCE_PRECEDENCE.items()), else_=0)
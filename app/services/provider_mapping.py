@@ -0,0 +1,364 @@
+"""
+Provider Mapping - Map search provider items to BusinessResponse in bulk
+Provider payloads repeat one schema for every item, so the keys to read for
+each field are resolved once per key set into a plan and reused. Items whose
+values already have the schema's types are created with model_construct;
+anything else goes through the validating constructor.
+"""
+
+import logging
+import threading
+from operator import itemgetter
+from typing import Any, Callable, Dict, FrozenSet, List, Tuple
+
+from app.schemas.business import BusinessResponse
+
+logger = logging.getLogger(__name__)
+
+# `a or b or ...` fields: the first truthy value wins
+_FIRST_TRUTHY = {
+    "name": ("title", "name", "businessName"),
+    "place_id": ("placeId", "place_id"),
+    "category": ("categoryName", "category"),
+    "types": ("types", "type"),
+    "photos": ("imageUrls", "images", "photoUrls", "photos"),
+    "postal_code": ("postalCode", "zip"),
+    "formatted_phone_number": ("phone", "phoneNumber"),
+    "website": ("website", "domain"),
+}
+
+# The first value that is not None wins
+_FIRST_NON_NULL = {
+    "latitude": ("lat", "latitude"),
+    "longitude": ("lng", "longitude"),
+    "rating": ("rating", "stars", "totalScore"),
+    "user_ratings_total": ("reviewsCount", "reviewCount", "totalReviews", "user_ratings_total"),
+    "business_status": ("businessStatus", "status"),
+    "country": ("country", "countryName", "countryCode"),
+    "international_phone_number": ("internationalPhoneNumber", "phoneUnformatted", "internationalPhone"),
+    "price_level": ("priceLevel", "price"),
+}
+
+# The first non-blank string wins
+_FIRST_STRING = {
+    "google_maps_url": ("googleMapsUrl", "googleMapsUri", "placeUrl", "url"),
+    "formatted_address": ("formattedAddress", "address", "fullAddress", "streetAddress"),
+}
+
+# Copied as-is
+_DIRECT = {
+    "city": "city",
+    "state": "state",
+    "neighborhood": "neighborhood",
+    "street": "street",
+    "claim_this_business": "claimThisBusiness",
+    "rank": "rank",
+    "image_url": "imageUrl",
+    "images_count": "imagesCount",
+    "reviews_distribution": "reviewsDistribution",
+    "temporarily_closed": "temporarilyClosed",
+    "permanently_closed": "permanentlyClosed",
+    "is_advertisement": "isAdvertisement",
+    "cid": "cid",
+    "fid": "fid",
+    "kgmid": "kgmid",
+    "search_string": "searchString",
+    "search_page_url": "searchPageUrl",
+    "scraped_at": "scrapedAt",
+    "additional_info": "additionalInfo",
+}
+
+# Schema types of the optional provider fields
+_STR_FIELDS = (
+    "business_status", "city", "state", "country", "postal_code", "formatted_phone_number",
+    "international_phone_number", "website", "price_level", "neighborhood", "street", "image_url",
+    "cid", "fid", "kgmid", "search_string", "search_page_url", "scraped_at",
+)
+_INT_FIELDS = ("user_ratings_total", "rank", "images_count")
+_BOOL_FIELDS = ("claim_this_business", "temporarily_closed", "permanently_closed", "is_advertisement")
+_DICT_FIELDS = ("reviews_distribution", "additional_info")
+
+_PLAN_CACHE_SIZE = 256
+
+# Nested values passed through for the post-processing in ProviderMapper._fields
+_RAW = {"location": "location", "opening_hours_raw": "openingHours", "categories": "categories"}
+
+
+def _constant(value: Any) -> Callable[[Dict[str, Any]], Any]:
+    return lambda item: value
+
+
+def _first_truthy(keys: Tuple[str, ...], keep_last: bool) -> Callable[[Dict[str, Any]], Any]:
+    def resolve(item: Dict[str, Any]) -> Any:
+        value = None
+        for key in keys:
+            value = item[key]
+            if value:
+                return value
+        return value if keep_last else None
+
+    return resolve
+
+
+def _first_non_null(keys: Tuple[str, ...]) -> Callable[[Dict[str, Any]], Any]:
+    def resolve(item: Dict[str, Any]) -> Any:
+        for key in keys:
+            value = item[key]
+            if value is not None:
+                return value
+        return None
+
+    return resolve
+
+
+def _first_string(keys: Tuple[str, ...]) -> Callable[[Dict[str, Any]], Any]:
+    def resolve(item: Dict[str, Any]) -> Any:
+        for key in keys:
+            value = item[key]
+            if isinstance(value, str) and value.strip():
+                return value
+        return None
+
+    return resolve
+
+
+class _Plan:
+    """Field resolution for one provider key set
+
+    Fields that come from a single present key are read together by one
+    itemgetter; only fields with several candidate keys get a resolver, and
+    fields without any present key start out as None.
+    """
+
+    __slots__ = ("template", "single_fields", "single_getter", "resolvers")
+
+    def __init__(self, keys: FrozenSet[str]):
+        single: Dict[str, str] = {}
+        resolvers: List[Tuple[str, Callable[[Dict[str, Any]], Any]]] = []
+        for field, candidates in _FIRST_TRUTHY.items():
+            found = tuple(key for key in candidates if key in keys)
+            # `a or b` returns the last operand when nothing is truthy, which is None when that key is absent
+            keep_last = candidates[-1] in keys
+            if len(found) == 1 and keep_last:
+                single[field] = found[0]
+            elif found:
+                resolvers.append((field, _first_truthy(found, keep_last)))
+        for field, candidates in _FIRST_NON_NULL.items():
+            found = tuple(key for key in candidates if key in keys)
+            if len(found) == 1:
+                single[field] = found[0]
+            elif found:
+                resolvers.append((field, _first_non_null(found)))
+        for field, candidates in _FIRST_STRING.items():
+            found = tuple(key for key in candidates if key in keys)
+            if found:
+                resolvers.append((field, _first_string(found)))
+        for field, key in {**_DIRECT, **_RAW}.items():
+            if key in keys:
+                single[field] = key
+
+        fields = (*_FIRST_TRUTHY, *_FIRST_NON_NULL, *_FIRST_STRING, *_DIRECT, *_RAW)
+        self.template = dict.fromkeys(fields)
+        self.single_fields = tuple(single)
+        getter = itemgetter(*single.values()) if single else _constant(())
+        self.single_getter = (lambda item: (getter(item),)) if len(single) == 1 else getter
+        self.resolvers = tuple(resolvers)
+
+    def resolve(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        values = self.template.copy()
+        values.update(zip(self.single_fields, self.single_getter(item)))
+        for field, resolver in self.resolvers:
+            values[field] = resolver(item)
+        return values
+
+
+class ProviderMapper:
+    """Service for mapping provider items with cached field-resolution plans"""
+
+    def __init__(self, validate: bool = False):
+        """
+        Initialize the mapper
+
+        Args:
+            validate: Build every item through pydantic validation, even when its
+                values already have the schema types (reference path for tests and benchmarks)
+        """
+        self.validate = validate
+        self._plans: Dict[FrozenSet[str], _Plan] = {}
+        self._lock = threading.Lock()
+
+    def map_items(self, items: List[Dict[str, Any]]) -> List[BusinessResponse]:
+        """
+        Map provider items to BusinessResponse objects
+
+        Args:
+            items: Raw provider items
+
+        Returns:
+            One BusinessResponse per item, in order
+        """
+        results = []
+        plan_keys = None
+        plan = None
+        for item in items:
+            keys = item.keys()
+            # Consecutive items almost always share a schema; only rehash when the key set changes
+            if plan is None or keys != plan_keys:
+                plan_keys = frozenset(keys)
+                plan = self._plan(plan_keys)
+            results.append(self._build(self._fields(item, plan)))
+        return results
+
+    def map_item(self, item: Dict[str, Any]) -> BusinessResponse:
+        return self._build(self._fields(item, self._plan(frozenset(item.keys()))))
+
+    def fields(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """BusinessResponse field values of one provider item, before validation"""
+        return self._fields(item, self._plan(frozenset(item.keys())))
+
+    def _plan(self, keys: FrozenSet[str]) -> _Plan:
+        plan = self._plans.get(keys)
+        if plan is None:
+            plan = _Plan(keys)
+            with self._lock:
+                if len(self._plans) >= _PLAN_CACHE_SIZE:
+                    self._plans.clear()
+                self._plans[keys] = plan
+        return plan
+
+    @staticmethod
+    def _fields(item: Dict[str, Any], plan: _Plan) -> Dict[str, Any]:
+        """Resolve BusinessResponse field values from a provider item"""
+        values = plan.resolve(item)
+
+        location = values.pop("location")
+        if isinstance(location, str):
+            if values["formatted_address"] is None and location.strip():
+                values["formatted_address"] = location
+        elif isinstance(location, dict):
+            if values["formatted_address"] is None:
+                for candidate in (location.get("formattedAddress"), location.get("address")):
+                    if isinstance(candidate, str) and candidate.strip():
+                        values["formatted_address"] = candidate
+                        break
+            if values["latitude"] is None:
+                latitude = location.get("lat")
+                values["latitude"] = latitude if latitude is not None else location.get("latitude")
+            if values["longitude"] is None:
+                longitude = location.get("lng")
+                values["longitude"] = longitude if longitude is not None else location.get("longitude")
+        values["latitude"] = float(values["latitude"] or 0)
+        values["longitude"] = float(values["longitude"] or 0)
+        values["name"] = values["name"] or ""
+        values["place_id"] = values["place_id"] or ""
+
+        category = values.pop("category")
+        types = values["types"] or ([] if not category else [category])
+        if isinstance(types, str):
+            types = [types]
+        if not isinstance(types, list):
+            types = []
+        values["types"] = types
+        values["primary_type"] = types[0] if types else None
+
+        categories = values["categories"]
+        if isinstance(categories, str):
+            categories = [categories]
+        if not isinstance(categories, list):
+            categories = []
+        values["categories"] = categories or types
+
+        photos = values["photos"]
+        if photos is not None and not isinstance(photos, list):
+            photos = [photos]
+        if isinstance(photos, list):
+            cleaned_photos = []
+            for photo in photos:
+                if isinstance(photo, str):
+                    cleaned_photos.append(photo)
+                elif isinstance(photo, dict):
+                    url = photo.get("url") or photo.get("photoUrl") or photo.get("imageUrl")
+                    if url:
+                        cleaned_photos.append(url)
+            photos = cleaned_photos or None
+        image_url = values["image_url"]
+        values["photos"] = photos or ([image_url] if image_url else None)
+
+        opening_hours = None
+        raw_opening_hours = values["opening_hours_raw"]
+        if isinstance(raw_opening_hours, dict):
+            opening_hours = {
+                "open_now": raw_opening_hours.get("openNow"),
+                "weekday_text": raw_opening_hours.get("weekdayText"),
+            }
+        elif isinstance(raw_opening_hours, list):
+            weekday_text = []
+            for entry in raw_opening_hours:
+                if not isinstance(entry, dict):
+                    continue
+                day = entry.get("day")
+                hours = entry.get("hours")
+                if day and hours:
+                    weekday_text.append(f"{day}: {hours}")
+            opening_hours = {"open_now": None, "weekday_text": weekday_text or None}
+        values["opening_hours"] = opening_hours
+        values["opening_hours_raw"] = raw_opening_hours if isinstance(raw_opening_hours, list) else None
+
+        if values["business_status"] is None:
+            if values["permanently_closed"] is True:
+                values["business_status"] = "CLOSED_PERMANENTLY"
+            elif values["temporarily_closed"] is True:
+                values["business_status"] = "CLOSED_TEMPORARILY"
+            else:
+                values["business_status"] = "OPERATIONAL"
+        return values
+
+    def _build(self, fields: Dict[str, Any]) -> BusinessResponse:
+        """Skip validation when every value already has its schema type, validate otherwise"""
+        if self.validate or not _trusted(fields):
+            return BusinessResponse(**fields)
+        if type(fields["rating"]) is int:
+            fields["rating"] = float(fields["rating"])
+        return BusinessResponse.model_construct(**fields)
+
+
+# Optional scalar fields validation would accept unchanged when the value has exactly this type
+_SCALAR_TYPES = (
+    tuple((field, str) for field in _STR_FIELDS)
+    + tuple((field, int) for field in _INT_FIELDS)
+    + tuple((field, bool) for field in _BOOL_FIELDS)
+    + tuple((field, dict) for field in _DICT_FIELDS)
+)
+
+
+def _trusted(values: Dict[str, Any]) -> bool:
+    """Whether validation would accept the values unchanged (ints in the rating field aside)"""
+    if type(values["name"]) is not str or type(values["place_id"]) is not str:
+        return False
+    for field, kind in _SCALAR_TYPES:
+        value = values[field]
+        if value is not None and type(value) is not kind:
+            return False
+    rating = values["rating"]
+    if rating is not None and type(rating) is not float and type(rating) is not int:
+        return False
+    for field in ("types", "categories", "photos"):
+        value = values[field]
+        if value:
+            for entry in value:
+                if type(entry) is not str:
+                    return False
+    opening_hours_raw = values["opening_hours_raw"]
+    if opening_hours_raw:
+        for entry in opening_hours_raw:
+            if type(entry) is not dict:
+                return False
+    return True
+
+
+_mapper = ProviderMapper()
+
+
+def map_provider_items(items: List[Dict[str, Any]]) -> List[BusinessResponse]:
+    """Map provider items with the process-wide plan cache"""
+    return _mapper.map_items(items)
@@ -1,11 +1,39 @@
 """Salesforce API Service (minimal scaffold)"""
+import csv
+import io
 import logging
+import time
 import requests
-from typing import Optional, Dict, Any, List
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Optional, Dict, Any, List, Tuple
 from app.config import settings
+from app.utils.helpers import chunked
+from app.utils.http_client import get_http_session, request_not_sent
 
 logger = logging.getLogger(__name__)
 
+# sObject Collections accept at most 200 records per request
+COLLECTION_SIZE = 200
+COLLECTION_MAX_ATTEMPTS = 3
+# Keep each Bulk API 2.0 upload well below the 150 MB per-job limit
+BULK_MAX_RECORDS_PER_JOB = 100_000
+BULK_TERMINAL_STATES = ("JobComplete", "Failed", "Aborted")
+
+# Lead fields (HubSpotLeadCreate) -> Contact fields
+_CONTACT_FIELDS = {
+    "email": "Email",
+    "firstname": "FirstName",
+    "lastname": "LastName",
+    "phone": "Phone",
+    "address": "MailingStreet",
+    "city": "MailingCity",
+    "state": "MailingState",
+    "country": "MailingCountry",
+    "zipcode": "MailingPostalCode",
+    "jobtitle": "Title",
+}
+
 
 class SalesforceService:
     def __init__(self, access_token: Optional[str] = None, instance_url: Optional[str] = None):
@@ -16,12 +44,13 @@ class SalesforceService:
             "Authorization": f"Bearer {self.access_token}",
             "Content-Type": "application/json"
         }
+        self.session = get_http_session("salesforce")
 
     def verify_connection(self) -> Dict[str, Any]:
         try:
             if not self.instance_url or not self.access_token:
                 return {"connected": False, "message": "Missing Salesforce credentials"}
-            r = requests.get(f"{self.instance_url}/services/data/v{self.api_version}/", headers=self.headers, timeout=10)
+            r = self.session.get(f"{self.instance_url}/services/data/v{self.api_version}/", headers=self.headers, timeout=10)
             if r.status_code == 200:
                 return {"connected": True, "message": "Connected to Salesforce"}
             return {"connected": False, "message": r.text}
@@ -32,7 +61,7 @@ class SalesforceService:
     def create_lead(self, lead_data: Dict[str, Any]) -> Dict[str, Any]:
         try:
             url = f"{self.instance_url}/services/data/v{self.api_version}/sobjects/Contact/"
-            r = requests.post(url, json=lead_data, headers=self.headers, timeout=15)
+            r = self.session.post(url, json=lead_data, headers=self.headers, timeout=15)
             if r.status_code in (200, 201):
                 return {"success": True, "data": r.json()}
             return {"success": False, "error": r.text}
@@ -45,16 +74,315 @@ class SalesforceService:
         return self.create_lead(lead_data)
 
     def batch_create_leads(self, leads: List[Dict[str, Any]]) -> Dict[str, Any]:
-        results = []
-        for l in leads:
-            results.append(self.create_lead(l))
-        return {"success": True, "data": results}
+        """Create Contacts in bulk
+        
+        Up to SALESFORCE_BULK_THRESHOLD leads go through sObject Collections
+        (200 per call, several calls in flight). Larger batches are submitted
+        as Bulk API 2.0 CSV ingest jobs and return job ids to poll with
+        get_bulk_job().
+        """
+        records = [self._to_contact_record(lead) for lead in leads]
+        if len(records) >= settings.SALESFORCE_BULK_THRESHOLD:
+            return self.submit_bulk_job(records)
+        return self._create_with_collections(records)
+
+    def batch_upsert_leads(self, leads: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Create or update Contacts matched on email
+
+        Contacts that already exist with a lead's email are updated by Id,
+        which is safe to repeat; only leads without a match are created. Used
+        to resend leads whose earlier create may have been applied.
+        """
+        started = time.perf_counter()
+        records = [self._to_contact_record(lead) for lead in leads]
+        try:
+            existing = self._contact_ids_by_email([record["Email"] for record in records if record.get("Email")])
+        except Exception as e:
+            logger.error(f"Salesforce contact lookup failed: {str(e)}")
+            outcomes = [
+                {"index": index, "email": record.get("Email"), "success": False, "contact_id": None, "error": str(e)}
+                for index, record in enumerate(records)
+            ]
+            return self._collections_result(outcomes, started)
+
+        updates: List[Tuple[int, Dict[str, Any]]] = []
+        creates: List[Tuple[int, Dict[str, Any]]] = []
+        for index, record in enumerate(records):
+            contact_id = existing.get(str(record.get("Email") or "").lower())
+            if contact_id:
+                updates.append((index, {"Id": contact_id, **record}))
+            else:
+                creates.append((index, record))
+        outcomes: List[Optional[Dict[str, Any]]] = [None] * len(records)
+        self._send_collections(updates, outcomes, method="patch")
+        self._send_collections(creates, outcomes)
+        return self._collections_result(outcomes, started)
+
+    def _create_with_collections(self, records: List[Dict[str, Any]]) -> Dict[str, Any]:
+        started = time.perf_counter()
+        outcomes: List[Optional[Dict[str, Any]]] = [None] * len(records)
+        self._send_collections(list(enumerate(records)), outcomes)
+        return self._collections_result(outcomes, started)
+
+    def _send_collections(
+        self,
+        indexed: List[Tuple[int, Dict[str, Any]]],
+        outcomes: List[Optional[Dict[str, Any]]],
+        method: str = "post",
+    ) -> None:
+        """Send (index, record) pairs as 200-record Collections, several calls in flight"""
+        chunks = list(chunked(indexed, COLLECTION_SIZE))
+        if not chunks:
+            return
+        workers = max(1, min(settings.SALESFORCE_BATCH_CONCURRENCY, len(chunks)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for chunk_outcomes in pool.map(lambda chunk: self._post_collection(chunk, method), chunks):
+                for outcome in chunk_outcomes:
+                    outcomes[outcome["index"]] = outcome
+
+    @staticmethod
+    def _collections_result(outcomes: List[Optional[Dict[str, Any]]], started: float) -> Dict[str, Any]:
+        elapsed = time.perf_counter() - started
+        created = sum(1 for o in outcomes if o and o["success"])
+        result = {
+            "success": created == len(outcomes),
+            "mode": "collections",
+            "total": len(outcomes),
+            "created": created,
+            "failed": len(outcomes) - created,
+            "data": outcomes,
+            "outcomes": outcomes,
+            "elapsed_seconds": round(elapsed, 3),
+            "leads_per_second": round(len(outcomes) / elapsed, 2) if elapsed > 0 else None,
+        }
+        if result["failed"]:
+            result["error"] = next(
+                (o["error"] for o in outcomes if o and not o["success"]), "No result returned for record"
+            )
+        return result
+
+    def _contact_ids_by_email(self, emails: List[str]) -> Dict[str, str]:
+        """Map lower-cased emails to the Id of an existing Contact with that email"""
+        url = f"{self.instance_url}/services/data/v{self.api_version}/query"
+        found: Dict[str, str] = {}
+        for batch in chunked(list(dict.fromkeys(email.lower() for email in emails)), 100):
+            quoted = ", ".join("'" + email.replace("\\", "\\\\").replace("'", "\\'") + "'" for email in batch)
+            r = self.session.get(
+                url, params={"q": f"SELECT Id, Email FROM Contact WHERE Email IN ({quoted})"}, headers=self.headers, timeout=30
+            )
+            while True:
+                if r.status_code != 200:
+                    raise RuntimeError(f"Salesforce API error: {r.status_code}")
+                data = r.json()
+                for record in data.get("records") or []:
+                    if record.get("Email"):
+                        found.setdefault(record["Email"].lower(), record["Id"])
+                if data.get("done", True) or not data.get("nextRecordsUrl"):
+                    break
+                r = self.session.get(f"{self.instance_url}{data['nextRecordsUrl']}", headers=self.headers, timeout=30)
+        return found
+
+    def _post_collection(self, chunk: List[Tuple[int, Dict[str, Any]]], method: str = "post") -> List[Dict[str, Any]]:
+        """Send one sObject Collection; per-record results come back in input order
+
+        Creates (POST) are not idempotent: the request is only resent when it
+        failed while connecting. Timeouts and 5xx responses fail the chunk,
+        since Salesforce may already have created the Contacts. Updates
+        (PATCH by Id) are retried on any transport error, 429 or 5xx.
+        """
+        url = f"{self.instance_url}/services/data/v{self.api_version}/composite/sobjects"
+        payload = {
+            "allOrNone": False,
+            "records": [{"attributes": {"type": "Contact"}, **record} for _, record in chunk],
+        }
+        send = self.session.patch if method == "patch" else self.session.post
+        idempotent = method == "patch"
+        error = "Salesforce request failed"
+        for attempt in range(1, COLLECTION_MAX_ATTEMPTS + 1):
+            try:
+                r = send(url, json=payload, headers=self.headers, timeout=60)
+            except requests.exceptions.RequestException as e:
+                error = str(e)
+                if not (idempotent or request_not_sent(e)):
+                    break
+                time.sleep(2 ** (attempt - 1))
+                continue
+            if r.status_code not in (200, 201):
+                error = f"Salesforce API error: {r.status_code}" if r.status_code >= 500 else r.text
+                if idempotent and (r.status_code == 429 or r.status_code >= 500):
+                    time.sleep(2 ** (attempt - 1))
+                    continue
+                break
+            items = r.json()
+            if not isinstance(items, list):
+                items = []
+            outcomes = []
+            for position, (index, record) in enumerate(chunk):
+                item = items[position] if position < len(items) else None
+                if not isinstance(item, dict):
+                    outcomes.append({
+                        "index": index,
+                        "email": record.get("Email"),
+                        "success": False,
+                        "contact_id": None,
+                        "error": "No result returned for record",
+                    })
+                    continue
+                errors = item.get("errors") or []
+                outcomes.append({
+                    "index": index,
+                    "email": record.get("Email"),
+                    "success": bool(item.get("success")),
+                    "contact_id": item.get("id"),
+                    "error": "; ".join(f"{e.get('statusCode')}: {e.get('message')}" for e in errors) or None,
+                })
+            return outcomes
+        return [
+            {"index": index, "email": record.get("Email"), "success": False, "contact_id": None, "error": error}
+            for index, record in chunk
+        ]
+
+    def submit_bulk_job(self, records: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Upload records as Bulk API 2.0 insert jobs without waiting for them to run"""
+        jobs_url = f"{self.instance_url}/services/data/v{self.api_version}/jobs/ingest"
+        job_ids: List[str] = []
+        try:
+            for job_records in chunked(records, BULK_MAX_RECORDS_PER_JOB):
+                r = self.session.post(
+                    jobs_url,
+                    json={"object": "Contact", "operation": "insert", "contentType": "CSV", "lineEnding": "LF"},
+                    headers=self.headers,
+                    timeout=30,
+                )
+                if r.status_code not in (200, 201):
+                    return {"success": False, "mode": "bulk", "job_ids": job_ids, "error": r.text}
+                job_id = r.json()["id"]
+                job_ids.append(job_id)
+
+                r = self.session.put(
+                    f"{jobs_url}/{job_id}/batches",
+                    data=self._to_csv(job_records).encode("utf-8"),
+                    headers={**self.headers, "Content-Type": "text/csv"},
+                    timeout=300,
+                )
+                if r.status_code not in (200, 201):
+                    return {"success": False, "mode": "bulk", "job_ids": job_ids, "error": r.text}
+
+                r = self.session.patch(
+                    f"{jobs_url}/{job_id}",
+                    json={"state": "UploadComplete"},
+                    headers=self.headers,
+                    timeout=30,
+                )
+                if r.status_code != 200:
+                    return {"success": False, "mode": "bulk", "job_ids": job_ids, "error": r.text}
+        except Exception as e:
+            logger.error(str(e))
+            return {"success": False, "mode": "bulk", "job_ids": job_ids, "error": str(e)}
+
+        logger.info(f"Submitted {len(records)} Salesforce contacts as bulk jobs {job_ids}")
+        return {
+            "success": True,
+            "mode": "bulk",
+            "total": len(records),
+            "job_ids": job_ids,
+            "message": "Bulk jobs submitted; poll /salesforce/jobs/{job_id} for results",
+        }
+
+    def get_bulk_job(self, job_id: str, include_results: bool = True) -> Dict[str, Any]:
+        """Return a Bulk API 2.0 job's state and, once finished, its per-record results"""
+        job_url = f"{self.instance_url}/services/data/v{self.api_version}/jobs/ingest/{job_id}"
+        try:
+            r = self.session.get(job_url, headers=self.headers, timeout=30)
+            if r.status_code != 200:
+                return {"success": False, "error": r.text}
+            job = r.json()
+            result = {
+                "success": True,
+                "job_id": job_id,
+                "state": job.get("state"),
+                "done": job.get("state") in BULK_TERMINAL_STATES,
+                "processed": job.get("numberRecordsProcessed", 0),
+                "failed": job.get("numberRecordsFailed", 0),
+                "error": job.get("errorMessage"),
+            }
+            if result["done"] and include_results:
+                outcomes = []
+                for kind in ("successfulResults", "failedResults"):
+                    r = self.session.get(f"{job_url}/{kind}/", headers={**self.headers, "Accept": "text/csv"}, timeout=120)
+                    if r.status_code != 200:
+                        continue
+                    for row in csv.DictReader(io.StringIO(r.text)):
+                        outcomes.append({
+                            "email": row.get("Email") or None,
+                            "success": kind == "successfulResults",
+                            "contact_id": row.get("sf__Id") or None,
+                            "error": row.get("sf__Error") or None,
+                        })
+                result["outcomes"] = outcomes
+            return result
+        except Exception as e:
+            logger.error(str(e))
+            return {"success": False, "error": str(e)}
+
+    def wait_for_bulk_job(self, job_id: str, timeout: float = 600, poll_interval: float = 5) -> Dict[str, Any]:
+        """Poll a bulk job until it finishes or `timeout` seconds pass"""
+        deadline = time.monotonic() + timeout
+        while True:
+            status = self.get_bulk_job(job_id)
+            if not status.get("success") or status.get("done") or time.monotonic() >= deadline:
+                return status
+            time.sleep(poll_interval)
+
+    @staticmethod
+    def _to_contact_record(lead: Dict[str, Any]) -> Dict[str, Any]:
+        """Map a lead to Contact fields; keys already in Salesforce form pass through"""
+        record: Dict[str, Any] = {}
+        for key, value in lead.items():
+            if value in (None, ""):
+                continue
+            if key in _CONTACT_FIELDS:
+                record[_CONTACT_FIELDS[key]] = value
+            elif key[:1].isupper():
+                record[key] = value
+        if not record.get("LastName"):
+            # LastName is required on Contact
+            record["LastName"] = lead.get("company") or lead.get("email") or "Unknown"
+        return record
+
+    @staticmethod
+    def _to_csv(records: List[Dict[str, Any]]) -> str:
+        columns: Dict[str, None] = {}
+        for record in records:
+            columns.update(dict.fromkeys(record))
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=list(columns), lineterminator="\n")
+        writer.writeheader()
+        writer.writerows(records)
+        return buffer.getvalue()
 
-    def get_contacts(self, limit: int = 100) -> Dict[str, Any]:
+    def get_contacts(
+        self,
+        limit: Optional[int] = 100,
+        modified_since: Optional[datetime] = None,
+        next_url: Optional[str] = None,
+    ) -> Dict[str, Any]:
         try:
-            query = f"SELECT Id, FirstName, LastName, Email, Phone FROM Contact LIMIT {limit}"
-            url = f"{self.instance_url}/services/data/v{self.api_version}/query"
-            r = requests.get(url, params={"q": query}, headers=self.headers, timeout=10)
+            if next_url:
+                # Continuation of a previous query (nextRecordsUrl)
+                r = self.session.get(f"{self.instance_url}{next_url}", headers=self.headers, timeout=30)
+            else:
+                query = (
+                    "SELECT Id, FirstName, LastName, Email, Phone, Account.Name, Account.Website, LastModifiedDate "
+                    "FROM Contact"
+                )
+                if modified_since:
+                    query += f" WHERE LastModifiedDate >= {modified_since.strftime('%Y-%m-%dT%H:%M:%SZ')}"
+                query += " ORDER BY LastModifiedDate ASC"
+                if limit:
+                    query += f" LIMIT {limit}"
+                url = f"{self.instance_url}/services/data/v{self.api_version}/query"
+                r = self.session.get(url, params={"q": query}, headers=self.headers, timeout=30)
             if r.status_code == 200:
                 return {"success": True, "data": r.json()}
             return {"success": False, "error": r.text}
@@ -65,7 +393,7 @@ class SalesforceService:
     def create_deal(self, deal_data: Dict[str, Any]) -> Dict[str, Any]:
         try:
             url = f"{self.instance_url}/services/data/v{self.api_version}/sobjects/Opportunity/"
-            r = requests.post(url, json=deal_data, headers=self.headers, timeout=10)
+            r = self.session.post(url, json=deal_data, headers=self.headers, timeout=10)
             if r.status_code in (200, 201):
                 return {"success": True, "data": r.json()}
             return {"success": False, "error": r.text}
@@ -4,19 +4,125 @@ Modular service for scraping contact/about pages
 """
 
 import requests
-from typing import Optional, Dict, List
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Optional, Dict, List, Tuple
+from urllib.parse import urlparse
 import logging
+import re
+import threading
+import time
 import urllib3
 
+from app.services.contact_discovery_service import ContactDiscoveryService
+
 logger = logging.getLogger(__name__)
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 
+class _HostCircuitBreaker:
+    """Remember hosts that keep timing out or refusing connections"""
+
+    def __init__(self, failure_threshold: int = 2, cooldown_seconds: float = 300.0):
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self._lock = threading.Lock()
+        self._failures: Dict[str, tuple] = {}
+
+    def record_failure(self, host: str) -> None:
+        with self._lock:
+            count, _ = self._failures.get(host, (0, 0.0))
+            self._failures[host] = (count + 1, time.monotonic())
+
+    def record_success(self, host: str) -> None:
+        with self._lock:
+            self._failures.pop(host, None)
+
+    def is_open(self, host: str) -> bool:
+        with self._lock:
+            entry = self._failures.get(host)
+            if not entry:
+                return False
+            count, last_failure = entry
+            if time.monotonic() - last_failure > self.cooldown_seconds:
+                self._failures.pop(host, None)
+                return False
+            return count >= self.failure_threshold
+
+
+# Shared across service instances so one dead site is not re-probed per request
+_host_breaker = _HostCircuitBreaker()
+
+_CHARSET_PATTERN = re.compile(rb'charset=["\']?([\w-]+)', re.IGNORECASE)
+
+
+@dataclass
+class TextSection:
+    """A window of lines around one or more keyword hits"""
+    start_line: int
+    end_line: int  # exclusive
+    text: str
+    hits: int
+    keywords: List[str] = field(default_factory=list)
+
+
+@lru_cache(maxsize=128)
+def _compile_keywords(keywords: Tuple[str, ...], ignore_case: bool = False) -> re.Pattern:
+    # Longest first so overlapping keywords ("contact us" vs "contact") prefer the longer match
+    ordered = sorted(keywords, key=len, reverse=True)
+    flags = re.IGNORECASE if ignore_case else 0
+    return re.compile("|".join(re.escape(keyword) for keyword in ordered), flags)
+
+
+class _VisibleTextTarget:
+    """lxml parser target collecting text outside <script>/<style> as it streams in"""
+
+    _SKIPPED_TAGS = ("script", "style")
+
+    def __init__(self):
+        self.parts: List[str] = []
+        self.visible_chars = 0
+        self._skip_depth = 0
+
+    def start(self, tag, attrib):
+        if tag in self._SKIPPED_TAGS:
+            self._skip_depth += 1
+
+    def end(self, tag):
+        if tag in self._SKIPPED_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+
+    def data(self, data):
+        if self._skip_depth:
+            return
+        self.parts.append(data)
+        # Non-whitespace characters survive cleanup, so this is a lower bound
+        # on the length of the final cleaned text
+        self.visible_chars += len("".join(data.split()))
+
+    def close(self):
+        return "".join(self.parts)
+
+
 class WebScraperService:
     """Service for scraping business websites to find contacts"""
     
     def __init__(self):
         self.timeout = 10
+        # Stream pages through lxml's incremental parser and stop downloading
+        # once enough text has been collected
+        self.streaming = True
+        self.max_text_chars = 5000
+        self.max_stream_bytes = 2_000_000
+        # Overall budget for scrape_contact_pages and per-path probe settings
+        self.contact_deadline = 20
+        self.probe_timeout = 5
+        self.max_parallel_probes = 8
+        # Number of discovered candidate pages to crawl per site
+        self.max_contact_candidates = 4
+        self._breaker = _host_breaker
         # Use a session for connection reuse and simple retry strategies
         self.session = requests.Session()
 
@@ -34,7 +140,7 @@ class WebScraperService:
             'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Mozilla/5.0 (iPhone; CPU iPhone OS 15_0 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/15.0 Mobile/15E148 Safari/604.1',
         ]
-        # Common paths for contact pages
+        # Fallback paths for contact pages when discovery finds nothing
         self.contact_paths = [
             '/contact',
             '/contact-us',
@@ -46,133 +152,315 @@ class WebScraperService:
             '/people'
         ]
     
-    def scrape_website(self, url: str) -> Optional[str]:
+    def scrape_website(self, url: str, deadline: Optional[float] = None) -> Optional[str]:
         """
         Scrape a website and return cleaned HTML content
         
         Args:
             url: Website URL to scrape
+            deadline: Optional time.monotonic() value after which no retries are attempted
             
         Returns:
             Cleaned text content from the website or None if failed
         """
         if not url:
             return None
+        text, _ = self._scrape_page(url, deadline=deadline, stream=self.streaming)
+        return text
+
+    def _scrape_page(
+        self,
+        url: str,
+        deadline: Optional[float] = None,
+        stream: bool = False,
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Scrape a page and return both its cleaned text and raw HTML
         
+        Args:
+            url: Website URL to scrape
+            deadline: Optional time.monotonic() value after which no retries are attempted
+            stream: Extract text incrementally and stop early; raw HTML is not kept
+            
+        Returns:
+            Tuple of (text limited to 5000 chars, raw HTML or None when streaming); (None, None) if failed
+        """
+        # Ensure URL has protocol
+        if not url.startswith(('http://', 'https://')):
+            url = 'https://' + url
+        host = self._host(url)
+        if self._breaker.is_open(host):
+            logger.debug(f"Skipping {url}: host {host} is unreachable")
+            return None, None
+
         try:
-            # Ensure URL has protocol
-            if not url.startswith(('http://', 'https://')):
-                url = 'https://' + url
+            response = self._get_with_retries(url, deadline=deadline, stream=stream)
+            if response is None:
+                return None, None
+            self._breaker.record_success(host)
+
+            if stream:
+                try:
+                    text = self.stream_text(response, max_chars=self.max_text_chars)
+                finally:
+                    response.close()
+                return (text[: self.max_text_chars] if text is not None else None), None
+
+            text = self.html_to_text(response.content)
+            if text is None:
+                return None, None
             
-            # Try a small number of attempts rotating headers and toggling scheme on 403
-            response = None
-            last_exc = None
-            for attempt in range(3):
-                # rotate user agent
-                ua = self._user_agents[attempt % len(self._user_agents)]
-                headers = {**self.headers, 'User-Agent': ua, 'Referer': url}
+            return text[: self.max_text_chars], response.text  # Limit to first 5000 chars for LLM efficiency
+            
+        except requests.exceptions.Timeout:
+            self._breaker.record_failure(host)
+            logger.warning(f"Timeout scraping {url}")
+            return None, None
+        except requests.exceptions.ConnectionError:
+            self._breaker.record_failure(host)
+            logger.warning(f"Connection error scraping {url}")
+            return None, None
+        except Exception as e:
+            logger.warning(f"Error scraping {url}: {str(e)}")
+            return None, None
+
+    def fetch_html(self, url: str, attempts: int = 3, deadline: Optional[float] = None) -> Optional[str]:
+        """
+        Fetch the raw HTML of a page using the same retry strategy as scrape_website
+        
+        Args:
+            url: Page URL to fetch
+            attempts: Number of User-Agent rotations to try
+            deadline: Optional time.monotonic() value bounding all attempts
+            
+        Returns:
+            Decoded HTML or None if the page could not be fetched
+        """
+        if not url:
+            return None
+        if not url.startswith(('http://', 'https://')):
+            url = 'https://' + url
+
+        if self._breaker.is_open(self._host(url)):
+            return None
+
+        try:
+            response = self._get_with_retries(url, attempts=attempts, deadline=deadline)
+        except Exception as e:
+            logger.debug(f"Error fetching {url}: {str(e)}")
+            return None
+        if response is None or response.status_code >= 400:
+            return None
+        return response.text
+
+    def html_to_text(self, html) -> Optional[str]:
+        """
+        Convert HTML (str or bytes) into newline separated visible text
+        
+        Args:
+            html: Raw HTML document
+            
+        Returns:
+            Cleaned text or None if bs4 is unavailable
+        """
+        # Parse and clean HTML (import BeautifulSoup lazily so missing
+        # optional dependency doesn't break app startup)
+        try:
+            from bs4 import BeautifulSoup
+        except ImportError:
+            logger.error("bs4 (beautifulsoup4) is not installed; cannot parse HTML")
+            return None
+
+        soup = BeautifulSoup(html, 'lxml')
+        
+        # Remove script and style elements
+        for script in soup(['script', 'style']):
+            script.decompose()
+        
+        # Get text
+        text = soup.get_text()
+        
+        # Clean up whitespace
+        return self._clean_text(text)
+
+    def stream_text(self, response: requests.Response, max_chars: int = 5000) -> Optional[str]:
+        """
+        Extract visible text from a streamed response, reading chunks into
+        lxml's incremental parser until enough text has been gathered
+        
+        Args:
+            response: Response obtained with stream=True
+            max_chars: Stop downloading once the cleaned text will exceed this
+            
+        Returns:
+            Cleaned text in the same format as html_to_text
+        """
+        try:
+            from lxml import etree
+        except ImportError:
+            return self.html_to_text(response.content)
+
+        target = _VisibleTextTarget()
+        parser = None
+        received = 0
+        for chunk in response.iter_content(chunk_size=16384):
+            if not chunk:
+                continue
+            if parser is None:
+                parser = etree.HTMLParser(target=target, encoding=self._stream_encoding(response, chunk))
+            parser.feed(chunk)
+            received += len(chunk)
+            if target.visible_chars >= max_chars or received >= self.max_stream_bytes:
+                break
+        if parser is None:
+            return ""
+        try:
+            text = parser.close()
+        except etree.LxmlError:
+            text = target.close()
+        return self._clean_text(text)
+
+    def _stream_encoding(self, response: requests.Response, first_chunk: bytes) -> str:
+        """Charset from the Content-Type header or a <meta> tag, defaulting to UTF-8"""
+        content_type = response.headers.get('Content-Type', '') or ''
+        match = _CHARSET_PATTERN.search(content_type.encode('latin-1', 'ignore'))
+        if not match:
+            match = _CHARSET_PATTERN.search(first_chunk[:4096])
+        return match.group(1).decode('ascii').lower() if match else 'utf-8'
+
+    @staticmethod
+    def _clean_text(text: str) -> str:
+        lines = (line.strip() for line in text.splitlines())
+        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+        return '\n'.join(chunk for chunk in chunks if chunk)
+
+    def _get_with_retries(
+        self,
+        url: str,
+        attempts: int = 3,
+        deadline: Optional[float] = None,
+        stream: bool = False,
+    ) -> Optional[requests.Response]:
+        """
+        GET a URL rotating User-Agents, toggling scheme on 403 and retrying
+        without certificate verification on SSL errors
+        
+        Args:
+            url: Absolute URL to fetch
+            attempts: Number of attempts
+            deadline: Optional time.monotonic() value bounding all attempts
+            stream: Defer downloading the body (caller must close the response)
+            
+        Returns:
+            Last response received, or None if nothing was attempted
+        """
+        # Try a small number of attempts rotating headers and toggling scheme on 403
+        response = None
+        last_exc = None
+        for attempt in range(attempts):
+            if stream and response is not None:
+                # Release the connection held by the previous streamed attempt
+                response.close()
+            timeout = self._remaining_timeout(deadline)
+            if timeout is None:
+                last_exc = last_exc or requests.exceptions.Timeout(f"Deadline exceeded for {url}")
+                break
+            # rotate user agent
+            ua = self._user_agents[attempt % len(self._user_agents)]
+            headers = {**self.headers, 'User-Agent': ua, 'Referer': url}
+            try:
+                response = self.session.get(
+                    url,
+                    headers=headers,
+                    timeout=timeout,
+                    allow_redirects=True,
+                    stream=stream,
+                )
+                # Missing pages will not appear on retry
+                if response.status_code in (404, 410):
+                    break
+                # If not a 403, break and parse
+                if response.status_code == 403:
+                    logger.debug(f"Attempt {attempt+1}: 403 for {url} with UA={ua}")
+                    # try switching scheme (https <-> http) once
+                    if url.startswith('https://'):
+                        alt = 'http://' + url[len('https://'):]
+                    elif url.startswith('http://'):
+                        alt = 'https://' + url[len('http://'):]
+                    else:
+                        alt = None
+
+                    if alt:
+                        logger.debug(f"Trying alternate scheme: {alt}")
+                        try:
+                            response = self.session.get(alt, headers=headers, timeout=timeout, allow_redirects=True, stream=stream)
+                            if response.status_code != 403:
+                                url = alt
+                                break
+                        except Exception as exc:
+                            last_exc = exc
+                    # otherwise continue loop and try another UA
+                    last_exc = Exception(f"403 Forbidden for {url}")
+                    continue
+
+                response.raise_for_status()
+                break
+            except requests.exceptions.SSLError as exc:
+                last_exc = exc
+                logger.debug(f"Attempt {attempt+1} SSL verification failed for {url}: {exc}")
+
+                # Fallback for websites with incomplete certificate chains:
+                # retry same request without certificate verification.
                 try:
                     response = self.session.get(
                         url,
                         headers=headers,
-                        timeout=self.timeout,
+                        timeout=timeout,
                         allow_redirects=True,
+                        verify=False,
+                        stream=stream,
                     )
-                    # If not a 403, break and parse
-                    if response.status_code == 403:
-                        logger.debug(f"Attempt {attempt+1}: 403 for {url} with UA={ua}")
-                        # try switching scheme (https <-> http) once
-                        if url.startswith('https://'):
-                            alt = 'http://' + url[len('https://'):]
-                        elif url.startswith('http://'):
-                            alt = 'https://' + url[len('http://'):]
-                        else:
-                            alt = None
-
-                        if alt:
-                            logger.debug(f"Trying alternate scheme: {alt}")
-                            try:
-                                response = self.session.get(alt, headers=headers, timeout=self.timeout, allow_redirects=True)
-                                if response.status_code != 403:
-                                    url = alt
-                                    break
-                            except Exception as exc:
-                                last_exc = exc
-                        # otherwise continue loop and try another UA
-                        last_exc = Exception(f"403 Forbidden for {url}")
-                        continue
-
                     response.raise_for_status()
+                    logger.warning(f"SSL verify disabled for {url} due to certificate validation failure")
                     break
-                except requests.exceptions.SSLError as exc:
-                    last_exc = exc
-                    logger.debug(f"Attempt {attempt+1} SSL verification failed for {url}: {exc}")
-
-                    # Fallback for websites with incomplete certificate chains:
-                    # retry same request without certificate verification.
-                    try:
-                        response = self.session.get(
-                            url,
-                            headers=headers,
-                            timeout=self.timeout,
-                            allow_redirects=True,
-                            verify=False,
-                        )
-                        response.raise_for_status()
-                        logger.warning(f"SSL verify disabled for {url} due to certificate validation failure")
-                        break
-                    except requests.exceptions.RequestException as insecure_exc:
-                        last_exc = insecure_exc
-                        logger.debug(f"Attempt {attempt+1} insecure retry failed for {url}: {insecure_exc}")
-                        continue
-                except requests.exceptions.RequestException as exc:
-                    last_exc = exc
-                    logger.debug(f"Attempt {attempt+1} request failed for {url}: {exc}")
+                except requests.exceptions.RequestException as insecure_exc:
+                    last_exc = insecure_exc
+                    logger.debug(f"Attempt {attempt+1} insecure retry failed for {url}: {insecure_exc}")
                     continue
+            except requests.exceptions.RequestException as exc:
+                last_exc = exc
+                logger.debug(f"Attempt {attempt+1} request failed for {url}: {exc}")
+                # Unreachable hosts will not come back within the retry window
+                if isinstance(exc, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+                    break
+                continue
 
-            if response is None:
-                if last_exc:
-                    raise last_exc
-                return None
-            
-            # Parse and clean HTML (import BeautifulSoup lazily so missing
-            # optional dependency doesn't break app startup)
-            try:
-                from bs4 import BeautifulSoup
-            except ImportError:
-                logger.error("bs4 (beautifulsoup4) is not installed; cannot parse HTML")
-                return None
+        if response is None and last_exc:
+            raise last_exc
+        return response
 
-            soup = BeautifulSoup(response.content, 'lxml')
-            
-            # Remove script and style elements
-            for script in soup(['script', 'style']):
-                script.decompose()
-            
-            # Get text
-            text = soup.get_text()
-            
-            # Clean up whitespace
-            lines = (line.strip() for line in text.splitlines())
-            chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-            text = '\n'.join(chunk for chunk in chunks if chunk)
-            
-            return text[:5000]  # Limit to first 5000 chars for LLM efficiency
-            
-        except requests.exceptions.Timeout:
-            logger.warning(f"Timeout scraping {url}")
-            return None
-        except requests.exceptions.ConnectionError:
-            logger.warning(f"Connection error scraping {url}")
-            return None
-        except Exception as e:
-            logger.warning(f"Error scraping {url}: {str(e)}")
+    def _remaining_timeout(self, deadline: Optional[float]) -> Optional[float]:
+        """Per-request timeout bounded by the deadline, or None once it has passed"""
+        if deadline is None:
+            return self.timeout
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
             return None
+        return min(self.timeout, remaining)
+
+    @staticmethod
+    def _host(url: str) -> str:
+        return urlparse(url).netloc.lower()
     
     def scrape_contact_pages(self, website_url: str) -> Optional[str]:
         """
         Try to find and scrape contact/about pages
         
+        The main site is fetched first; if it is thin, likely contact pages are
+        discovered from its links, robots.txt and sitemap (falling back to
+        common paths) and probed concurrently under one shared deadline. The
+        first page with enough content wins.
+        
         Args:
             website_url: Base website URL
             
@@ -181,22 +469,137 @@ class WebScraperService:
         """
         if not website_url:
             return None
+        if not website_url.startswith(('http://', 'https://')):
+            website_url = 'https://' + website_url
+        deadline = time.monotonic() + self.contact_deadline
         
         # Try main website first
-        main_content = self.scrape_website(website_url)
+        main_content, main_html = self._scrape_page(website_url, deadline=deadline)
         if main_content and len(main_content) > 500:
             return main_content
-        
-        # Try common contact page paths
-        for path in self.contact_paths:
-            contact_url = website_url.rstrip('/') + path
-            content = self.scrape_website(contact_url)
-            if content and len(content) > 300:
-                return content
 
+        if self._breaker.is_open(self._host(website_url)):
+            logger.debug(f"Not probing contact pages for unreachable {website_url}")
+            return main_content
+        
+        # Probe discovered (or common) contact pages in parallel
+        contact_urls = self.discover_contact_urls(website_url, homepage_html=main_html or "", deadline=deadline)
+        content = self._probe_contact_pages(contact_urls, deadline)
+        if content:
+            return content
         
         # Return main content if nothing better found
         return main_content
+
+    def discover_contact_urls(
+        self,
+        website_url: str,
+        homepage_html: Optional[str] = None,
+        deadline: Optional[float] = None,
+        limit: Optional[int] = None,
+        fallback_paths: Optional[List[str]] = None,
+    ) -> List[str]:
+        """
+        Rank likely contact pages for a site, falling back to the common paths
+        
+        Args:
+            website_url: Base website URL
+            homepage_html: Already fetched homepage HTML, if any
+            deadline: Optional time.monotonic() value bounding discovery requests
+            limit: Maximum candidates (defaults to max_contact_candidates)
+            fallback_paths: Paths to guess when discovery finds nothing
+            
+        Returns:
+            Candidate contact page URLs, best first
+        """
+        if not website_url.startswith(('http://', 'https://')):
+            website_url = 'https://' + website_url
+        discovery = ContactDiscoveryService(
+            fetch=lambda url: self.fetch_html(url, attempts=1, deadline=deadline),
+        )
+        candidates = discovery.discover(
+            website_url,
+            homepage_html=homepage_html,
+            limit=limit or self.max_contact_candidates,
+        )
+        if candidates:
+            return candidates
+        return [website_url.rstrip('/') + path for path in (fallback_paths or self.contact_paths)]
+
+    def _probe_contact_pages(self, urls: List[str], deadline: float) -> Optional[str]:
+        """
+        Scrape candidate URLs concurrently and return the first with enough content
+        
+        Args:
+            urls: Candidate contact page URLs
+            deadline: time.monotonic() value shared by all probes
+            
+        Returns:
+            Content of the first good page, or None
+        """
+        if not urls:
+            return None
+        stop = threading.Event()
+        executor = ThreadPoolExecutor(max_workers=min(len(urls), self.max_parallel_probes))
+        futures = [executor.submit(self._probe_and_scrape, url, deadline, stop) for url in urls]
+        try:
+            for future in as_completed(futures, timeout=max(0.0, deadline - time.monotonic())):
+                content = future.result()
+                if content and len(content) > 300:
+                    stop.set()
+                    return content
+        except FuturesTimeoutError:
+            logger.debug(f"Contact page probing hit its deadline for {urls[0]}")
+        finally:
+            stop.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+        return None
+
+    def _probe_and_scrape(self, url: str, deadline: float, stop: threading.Event) -> Optional[str]:
+        """Cheap existence probe followed by a full scrape if the page is there"""
+        host = self._host(url)
+        if stop.is_set() or self._breaker.is_open(host):
+            return None
+        if not self._probe(url, deadline):
+            return None
+        if stop.is_set():
+            return None
+        return self.scrape_website(url, deadline=deadline)
+
+    def _probe(self, url: str, deadline: float) -> bool:
+        """
+        HEAD the URL (falling back to a header-only streamed GET when HEAD is
+        not supported) and report whether a full scrape is worthwhile
+        """
+        timeout = self._remaining_timeout(deadline)
+        if timeout is None:
+            return False
+        timeout = min(timeout, self.probe_timeout)
+        host = self._host(url)
+        try:
+            response = self._probe_request(self.session.head, url, timeout)
+            if response.status_code in (405, 501):
+                response = self._probe_request(self.session.get, url, timeout, stream=True)
+                response.close()
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as exc:
+            logger.debug(f"Probe failed for {url}: {exc}")
+            self._breaker.record_failure(host)
+            return False
+        except requests.exceptions.RequestException as exc:
+            logger.debug(f"Probe error for {url}: {exc}")
+            return False
+        # 403/429 may still succeed with the rotating User-Agent scrape
+        return response.status_code not in (404, 410)
+
+    def _probe_request(self, send, url: str, timeout: float, **kwargs) -> requests.Response:
+        """Send a probe with certificate verification, retrying without it on SSL errors like the scrape does"""
+        try:
+            return send(url, headers=self.headers, timeout=timeout, allow_redirects=True, **kwargs)
+        except requests.exceptions.SSLError as exc:
+            logger.debug(f"Probe SSL verification failed for {url}: {exc}")
+            response = send(url, headers=self.headers, timeout=timeout, allow_redirects=True, verify=False, **kwargs)
+            logger.warning(f"SSL verify disabled for {url} due to certificate validation failure")
+            return response
     
     def extract_text_section(self, html_text: str, keywords: List[str]) -> Optional[str]:
         """
@@ -212,20 +615,91 @@ class WebScraperService:
         if not html_text:
             return None
         
-        lines = html_text.split('\n')
-        relevant_lines = []
-        
-        # Find lines containing keywords
-        for line in lines:
-            lower_line = line.lower()
-            if any(keyword.lower() in lower_line for keyword in keywords):
-                # Collect context around keyword lines
-                start = max(0, lines.index(line) - 2)
-                end = min(len(lines), lines.index(line) + 3)
-                relevant_lines.extend(lines[start:end])
-        
-        if relevant_lines:
-            return '\n'.join(relevant_lines)
+        sections = self.find_text_sections(html_text, keywords)
+        if sections:
+            # Merged windows in document order, each line emitted once
+            sections.sort(key=lambda section: section.start_line)
+            return '\n'.join(section.text for section in sections)
         
         # If no keywords found, return first 1000 chars
         return html_text[:1000]
+
+    def find_text_sections(
+        self,
+        html_text: str,
+        keywords: List[str],
+        context: int = 2,
+        max_sections: Optional[int] = None,
+    ) -> List[TextSection]:
+        """
+        Find keyword hits in one pass and return merged, ranked context windows
+        
+        All keywords are matched case-insensitively with a single compiled
+        alternation. Each hit line contributes a window of `context` lines on
+        either side; overlapping or touching windows are merged.
+        
+        Args:
+            html_text: Text content from scraped page
+            keywords: Keywords to search for
+            context: Lines of context before and after each hit
+            max_sections: Optional cap on returned sections
+            
+        Returns:
+            Sections ordered by hit count, then distinct keywords, then position
+        """
+        if not html_text:
+            return []
+        normalized = tuple(sorted({keyword.lower() for keyword in keywords if keyword}))
+        if not normalized:
+            return []
+        # Scanning lowercased text with a case-sensitive pattern is several times
+        # faster than re.IGNORECASE; only possible when lowering keeps offsets
+        scan_text = html_text.lower()
+        if len(scan_text) == len(html_text):
+            pattern = _compile_keywords(normalized)
+        else:
+            scan_text = html_text
+            pattern = _compile_keywords(normalized, ignore_case=True)
+
+        lines = html_text.split('\n')
+        line_starts = [0]
+        for line in lines[:-1]:
+            line_starts.append(line_starts[-1] + len(line) + 1)
+
+        # line index -> set of matched keywords, filled from one scan of the text
+        hits_by_line: Dict[int, set] = {}
+        for match in pattern.finditer(scan_text):
+            line_index = bisect_right(line_starts, match.start()) - 1
+            hits_by_line.setdefault(line_index, set()).add(match.group(0).lower())
+
+        sections: List[TextSection] = []
+        current = None
+        for line_index in sorted(hits_by_line):
+            start = max(0, line_index - context)
+            end = min(len(lines), line_index + context + 1)
+            if current and start <= current[1]:
+                current[1] = end
+                current[2] += 1
+                current[3].update(hits_by_line[line_index])
+            else:
+                if current:
+                    sections.append(self._make_section(lines, current))
+                current = [start, end, 1, set(hits_by_line[line_index])]
+        if current:
+            sections.append(self._make_section(lines, current))
+
+        sections.sort(key=lambda section: (-section.hits, -len(section.keywords), section.start_line))
+        if max_sections is not None:
+            sections = sections[:max_sections]
+        return sections
+
+    @staticmethod
+    def _make_section(lines: List[str], window: list) -> TextSection:
+        start, end, hits, matched = window
+        return TextSection(
+            start_line=start,
+            end_line=end,
+            text='\n'.join(lines[start:end]),
+            hits=hits,
+            keywords=sorted(matched),
+        )
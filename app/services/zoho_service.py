@@ -1,12 +1,37 @@
 """Zoho CRM API Service (minimal scaffold)"""
 import logging
+import time
 import requests
-from typing import Optional, Dict, Any, List
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Optional, Dict, Any, List, Tuple
 from app.config import settings
+from app.utils.helpers import chunked, parse_retry_after
+from app.utils.http_client import get_http_session, request_not_sent
+from app.utils.token_bucket import get_token_bucket
 
 logger = logging.getLogger(__name__)
 
 ZOHO_BASE = settings.ZOHO_BASE_URL
+# Zoho accepts at most 100 records per insert/upsert call
+ZOHO_BATCH_SIZE = 100
+ZOHO_MAX_ATTEMPTS = 4
+
+# Lead fields (HubSpotLeadCreate) -> Zoho Leads fields
+_LEAD_FIELDS = {
+    "email": "Email",
+    "firstname": "First_Name",
+    "lastname": "Last_Name",
+    "phone": "Phone",
+    "company": "Company",
+    "website": "Website",
+    "address": "Street",
+    "city": "City",
+    "state": "State",
+    "country": "Country",
+    "zipcode": "Zip_Code",
+    "jobtitle": "Designation",
+}
 
 
 class ZohoService:
@@ -17,10 +42,11 @@ class ZohoService:
             "Authorization": f"Zoho-oauthtoken {self.access_token}",
             "Content-Type": "application/json"
         }
+        self.session = get_http_session("zoho")
 
     def verify_connection(self) -> Dict[str, Any]:
         try:
-            r = requests.get(f"{self.base_url}/users", headers=self.headers, timeout=10)
+            r = self.session.get(f"{self.base_url}/users", headers=self.headers, timeout=10)
             if r.status_code == 200:
                 return {"connected": True, "message": "Connected to Zoho"}
             else:
@@ -32,7 +58,7 @@ class ZohoService:
     def create_lead(self, lead_data: Dict[str, Any]) -> Dict[str, Any]:
         try:
             payload = {"data": [lead_data]}
-            r = requests.post(f"{self.base_url}/Leads", json=payload, headers=self.headers, timeout=15)
+            r = self.session.post(f"{self.base_url}/Leads", json=payload, headers=self.headers, timeout=15)
             if r.status_code in (200, 201):
                 return {"success": True, "data": r.json()}
             return {"success": False, "error": r.text}
@@ -41,18 +67,180 @@ class ZohoService:
             return {"success": False, "error": str(e)}
 
     def batch_create_leads(self, leads: List[Dict[str, Any]]) -> Dict[str, Any]:
-        return self.create_lead({"data": leads})
+        """Insert leads in concurrent 100-record calls with per-record status
+
+        Inserts are not idempotent, so a chunk is only resent after a 429 or a
+        failure to connect; use batch_upsert_leads for retries that cannot
+        duplicate leads.
+        """
+        return self._send_batches("/Leads", leads, idempotent=False)
+
+    def batch_upsert_leads(
+        self,
+        leads: List[Dict[str, Any]],
+        duplicate_check_fields: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """Insert or update leads matched on duplicate_check_fields (Email by default)"""
+        return self._send_batches(
+            "/Leads/upsert",
+            leads,
+            {"duplicate_check_fields": duplicate_check_fields or ["Email"]},
+        )
 
     def create_or_update_lead(self, lead_data: Dict[str, Any]) -> Dict[str, Any]:
-        # Zoho upsert requires external_id logic; keep simple: create
-        return self.create_lead(lead_data)
+        result = self.batch_upsert_leads([lead_data])
+        outcome = (result.get("outcomes") or [{}])[0]
+        if outcome.get("success"):
+            return {"success": True, "data": outcome}
+        return {"success": False, "error": outcome.get("error") or result.get("error")}
 
-    def get_contacts(self, limit: int = 100) -> Dict[str, Any]:
+    def _send_batches(
+        self,
+        path: str,
+        leads: List[Dict[str, Any]],
+        extra: Optional[Dict[str, Any]] = None,
+        idempotent: bool = True,
+    ) -> Dict[str, Any]:
+        started = time.perf_counter()
+        records = [self._to_lead_record(lead) for lead in leads]
+        chunks = list(chunked(list(enumerate(records)), ZOHO_BATCH_SIZE))
+        outcomes: List[Optional[Dict[str, Any]]] = [None] * len(records)
+        if chunks:
+            workers = max(1, min(settings.ZOHO_BATCH_CONCURRENCY, len(chunks)))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                for chunk_outcomes in pool.map(lambda chunk: self._post_chunk(path, chunk, extra, idempotent), chunks):
+                    for outcome in chunk_outcomes:
+                        outcomes[outcome["index"]] = outcome
+
+        elapsed = time.perf_counter() - started
+        succeeded = [o for o in outcomes if o and o["success"]]
+        updated = sum(1 for o in succeeded if o.get("action") == "update")
+        failed = len(records) - len(succeeded)
+        result = {
+            "success": failed == 0,
+            "total": len(records),
+            "created": len(succeeded) - updated,
+            "updated": updated,
+            "failed": failed,
+            "data": outcomes,
+            "outcomes": outcomes,
+            "elapsed_seconds": round(elapsed, 3),
+            "leads_per_second": round(len(records) / elapsed, 2) if elapsed > 0 else None,
+        }
+        if failed:
+            result["error"] = next(
+                (o["error"] for o in outcomes if o and not o["success"]), "No result returned for record"
+            )
+        return result
+
+    def _post_chunk(
+        self,
+        path: str,
+        chunk: List[Tuple[int, Dict[str, Any]]],
+        extra: Optional[Dict[str, Any]],
+        idempotent: bool = True,
+    ) -> List[Dict[str, Any]]:
+        """POST one chunk under the org's rate limit; Zoho answers per record in input order"""
+        payload = {"data": [record for _, record in chunk], **(extra or {})}
+        bucket = get_token_bucket(
+            "zoho", self.access_token, rate=settings.ZOHO_RATE_LIMIT_PER_MINUTE / 60.0, capacity=settings.ZOHO_BATCH_CONCURRENCY
+        )
+        error = "Zoho request failed"
+        for attempt in range(1, ZOHO_MAX_ATTEMPTS + 1):
+            bucket.acquire()
+            try:
+                r = self.session.post(f"{self.base_url}{path}", json=payload, headers=self.headers, timeout=30)
+            except requests.exceptions.RequestException as e:
+                error = str(e)
+                if not idempotent and not request_not_sent(e):
+                    break
+                time.sleep(2 ** (attempt - 1))
+                continue
+            if r.status_code == 429:
+                error = "Zoho API error: 429"
+                bucket.pause(parse_retry_after(r.headers.get("Retry-After"), default=min(2 ** attempt, 60)))
+                continue
+            if r.status_code >= 500:
+                error = f"Zoho API error: {r.status_code}"
+                if not idempotent:
+                    break
+                time.sleep(2 ** (attempt - 1))
+                continue
+            try:
+                items = r.json().get("data") or []
+            except ValueError:
+                items = []
+            if not items:
+                error = r.text
+                break
+            outcomes = []
+            for position, (index, record) in enumerate(chunk):
+                item = items[position] if position < len(items) else None
+                if not isinstance(item, dict):
+                    outcomes.append({
+                        "index": index,
+                        "email": record.get("Email"),
+                        "success": False,
+                        "id": None,
+                        "error": "No result returned for record",
+                    })
+                    continue
+                ok = item.get("status") == "success"
+                outcomes.append({
+                    "index": index,
+                    "email": record.get("Email"),
+                    "success": ok,
+                    "id": (item.get("details") or {}).get("id") if ok else None,
+                    "action": item.get("action"),
+                    "code": item.get("code"),
+                    "error": None if ok else f"{item.get('code')}: {item.get('message')}",
+                })
+            return outcomes
+        return [
+            {"index": index, "email": record.get("Email"), "success": False, "id": None, "error": error}
+            for index, record in chunk
+        ]
+
+    @staticmethod
+    def _to_lead_record(lead: Dict[str, Any]) -> Dict[str, Any]:
+        """Map a lead to Zoho Leads fields; keys already in Zoho form pass through"""
+        record: Dict[str, Any] = {}
+        for key, value in lead.items():
+            if value in (None, ""):
+                continue
+            if key in _LEAD_FIELDS:
+                record[_LEAD_FIELDS[key]] = value
+            elif key[:1].isupper():
+                record[key] = value
+        # Last_Name and Company are mandatory on Zoho Leads
+        record.setdefault("Last_Name", record.get("Company") or record.get("Email") or "Unknown")
+        record.setdefault("Company", record.get("Last_Name"))
+        return record
+
+    def get_contacts(
+        self,
+        limit: int = 100,
+        page: int = 1,
+        modified_since: Optional[datetime] = None,
+        page_token: Optional[str] = None,
+        module: str = "Contacts",
+    ) -> Dict[str, Any]:
+        """List records of a person module ("Contacts" or "Leads", which this app pushes to), oldest change first"""
         try:
-            params = {"per_page": limit}
-            r = requests.get(f"{self.base_url}/Contacts", headers=self.headers, params=params, timeout=10)
+            params: Dict[str, Any] = {"per_page": limit, "sort_by": "Modified_Time", "sort_order": "asc"}
+            if page_token:
+                params["page_token"] = page_token
+            else:
+                params["page"] = page
+            headers = self.headers
+            if modified_since:
+                headers = {**self.headers, "If-Modified-Since": modified_since.strftime("%Y-%m-%dT%H:%M:%S+00:00")}
+            r = self.session.get(f"{self.base_url}/{module}", headers=headers, params=params, timeout=10)
             if r.status_code == 200:
                 return {"success": True, "data": r.json()}
+            if r.status_code in (204, 304):
+                # Nothing (new) to return
+                return {"success": True, "data": {"data": [], "info": {"more_records": False}}}
             return {"success": False, "error": r.text}
         except Exception as e:
             logger.error(str(e))
@@ -61,7 +249,7 @@ class ZohoService:
     def create_deal(self, deal_data: Dict[str, Any]) -> Dict[str, Any]:
         try:
             payload = {"data": [deal_data]}
-            r = requests.post(f"{self.base_url}/Deals", json=payload, headers=self.headers, timeout=10)
+            r = self.session.post(f"{self.base_url}/Deals", json=payload, headers=self.headers, timeout=10)
             if r.status_code in (200, 201):
                 return {"success": True, "data": r.json()}
             return {"success": False, "error": r.text}
@@ -1,15 +1,22 @@
 """Auth utilities for JWT and current user handling."""
+import time
 from datetime import datetime, timedelta
 from typing import Optional
-from fastapi import Depends, HTTPException, Cookie, Header
+from fastapi import Depends, HTTPException, Cookie, Header, Request
 from jose import JWTError, jwt
 from sqlalchemy.orm import Session
 from app.config import settings
 from app.db import models
-from app.db.session import get_db
+from app.db.session import SessionLocal, get_db
+from app.utils.ttl_cache import TTLCache
 
 TOKEN_COOKIE_NAME = "leadgen_session"
 
+# token -> (subject, exp): skips signature checks for tokens already verified
+_token_cache = TTLCache(ttl=settings.AUTH_TOKEN_CACHE_TTL, maxsize=10000)
+# google_sub -> user id; the row itself is read on every request so balances are current in every worker
+_user_id_cache = TTLCache(ttl=settings.AUTH_USER_CACHE_TTL, maxsize=10000)
+
 
 def create_access_token(subject: str) -> str:
     """Create a signed JWT for the given subject."""
@@ -22,14 +29,77 @@ def create_access_token(subject: str) -> str:
 
 
 def decode_access_token(token: str) -> str:
-    """Decode JWT and return subject."""
+    """Decode JWT and return subject.
+
+    Verified tokens are remembered until their own expiry (or the cache TTL),
+    so a session cookie is only verified once per process in that window.
+    """
+    cached = _token_cache.get(token)
+    if cached is not None and cached[1] > time.time():
+        return cached[0]
     payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
     subject = payload.get("sub")
     if not subject:
         raise JWTError("Missing subject")
+    exp = payload.get("exp")
+    _token_cache.set(token, (subject, float(exp) if exp is not None else float("inf")))
     return subject
 
 
+def load_user(subject: str, db: Optional[Session] = None) -> Optional[models.User]:
+    """Return the User for a token subject, read from the database.
+
+    Only the subject's user id is cached, so the row is a primary-key lookup
+    and columns such as credits are never stale, whichever worker changed
+    them. With db the instance is bound to that session; without it a
+    detached copy is returned.
+    """
+    own_session = db is None
+    if own_session:
+        db = SessionLocal()
+    try:
+        user_id = _user_id_cache.get(subject)
+        user = db.get(models.User, user_id) if user_id is not None else None
+        if user is None:
+            user = db.query(models.User).filter(models.User.google_sub == subject).first()
+            if user is None:
+                return None
+            _user_id_cache.set(subject, user.id)
+        if own_session:
+            db.expunge(user)
+        return user
+    finally:
+        if own_session:
+            db.close()
+
+
+def invalidate_user(subject: Optional[str]) -> None:
+    """Forget the cached user id of a subject, e.g. after it was linked to another row."""
+    if subject:
+        _user_id_cache.pop(subject)
+
+
+def get_request_user(request: Optional[Request], token: Optional[str], db: Optional[Session] = None) -> Optional[models.User]:
+    """Resolve a token to a User once per request.
+
+    Several dependencies (rate limiting, optional and required auth) look at
+    the same token; the result is kept on request.state for the later ones.
+    """
+    if not token:
+        return None
+    state = getattr(request, "state", None)
+    memo = getattr(state, "auth_user", None) if state is not None else None
+    if memo is not None and memo[0] == token:
+        return memo[1]
+    try:
+        user = load_user(decode_access_token(token), db)
+    except JWTError:
+        user = None
+    if state is not None:
+        state.auth_user = (token, user)
+    return user
+
+
 def _get_token_from_header(authorization: Optional[str]) -> Optional[str]:
     if not authorization:
         return None
@@ -40,6 +110,7 @@ def _get_token_from_header(authorization: Optional[str]) -> Optional[str]:
 
 
 def get_current_user(
+    request: Request,
     db: Session = Depends(get_db),
     session_token: Optional[str] = Cookie(default=None, alias=TOKEN_COOKIE_NAME),
     authorization: Optional[str] = Header(default=None),
@@ -49,28 +120,26 @@ def get_current_user(
     if not token:
         raise HTTPException(status_code=401, detail="Not authenticated")
     try:
-        subject = decode_access_token(token)
+        decode_access_token(token)
     except JWTError:
         raise HTTPException(status_code=401, detail="Invalid session")
 
-    user = db.query(models.User).filter(models.User.google_sub == subject).first()
+    user = get_request_user(request, token, db)
     if not user:
         raise HTTPException(status_code=401, detail="User not found")
-    return user
+    # Bind to this request's session without re-selecting the row (a no-op if it was loaded there)
+    return db.merge(user, load=False)
 
 
 def get_optional_user(
+    request: Request,
     db: Session = Depends(get_db),
     session_token: Optional[str] = Cookie(default=None, alias=TOKEN_COOKIE_NAME),
     authorization: Optional[str] = Header(default=None),
 ) -> Optional[models.User]:
     """Return user if authenticated, otherwise None."""
     token = session_token or _get_token_from_header(authorization)
-    if not token:
+    user = get_request_user(request, token, db)
+    if user is None:
         return None
-    try:
-        subject = decode_access_token(token)
-    except JWTError:
-        return None
-
-    return db.query(models.User).filter(models.User.google_sub == subject).first()
+    return db.merge(user, load=False)
@@ -58,3 +58,23 @@ class CrmStreamlitHelper:
             return r.json()
         except Exception as e:
             return {"success": False, "error": str(e)}
+
+    def push_leads(self, leads: List[Dict[str, Any]], skip_existing: bool = False) -> Dict[str, Any]:
+        """Queue a background push; poll push_status() with the returned job_id."""
+        try:
+            r = requests.post(
+                f"{self.api_base_url}/api/v1/crm/{self.provider}/push",
+                json={"leads": leads},
+                params={"skip_existing": skip_existing},
+                timeout=60,
+            )
+            return r.json()
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+
+    def push_status(self, job_id: str) -> Dict[str, Any]:
+        try:
+            r = requests.get(f"{self.api_base_url}/api/v1/crm/push/{job_id}", timeout=10)
+            return r.json()
+        except Exception as e:
+            return {"success": False, "error": str(e)}
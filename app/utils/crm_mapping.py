@@ -0,0 +1,49 @@
+"""Mapping from business search results to CRM leads."""
+import re
+from typing import Any, Dict, Mapping, Optional
+from app.config import settings
+
+_EMAIL_LOCAL_UNSAFE = re.compile(r"[^a-z0-9.]+")
+
+
+def placeholder_email(name: str, place_id: Optional[str] = None) -> str:
+    """Synthetic address for businesses without a known email.
+
+    A short place_id suffix keeps same-name branches from being merged by email-keyed upserts.
+    The domain must pass EmailStr validation, which rejects special-use TLDs such as ".local".
+    """
+    local = _EMAIL_LOCAL_UNSAFE.sub(".", (name or "business").lower()).strip(".") or "business"
+    local = re.sub(r"\.{2,}", ".", local)
+    if place_id:
+        local = f"{local}.{re.sub(r'[^a-z0-9]', '', place_id.lower())[-8:]}"
+    return f"{local}@{settings.LEAD_PLACEHOLDER_EMAIL_DOMAIN}"
+
+
+def business_to_lead(business: Mapping[str, Any]) -> Dict[str, Any]:
+    """Map a BusinessResponse-shaped dict (or the convert endpoint's input) to a lead dict.
+
+    Works on plain dicts so thousands of saved results can be mapped without model validation.
+    """
+    name = (business.get("name") or "").strip()
+    words = name.split()
+    types = business.get("types") or []
+    return {
+        "email": business.get("email") or placeholder_email(name, business.get("place_id")),
+        "firstname": words[0] if words else "Business",
+        "lastname": " ".join(words[1:]) if len(words) > 1 else name,
+        "phone": business.get("phone")
+        or business.get("international_phone_number")
+        or business.get("formatted_phone_number"),
+        "company": name or None,
+        "website": business.get("website"),
+        "address": business.get("address") or business.get("formatted_address"),
+        "city": business.get("city"),
+        "state": business.get("state"),
+        "country": business.get("country"),
+        "zipcode": business.get("postal_code"),
+        "business_type": business.get("business_type") or business.get("primary_type") or (types[0] if types else None),
+        "rating": business.get("rating"),
+        "review_count": business.get("review_count") or business.get("user_ratings_total"),
+        "latitude": business.get("latitude"),
+        "longitude": business.get("longitude"),
+    }
@@ -1,6 +1,10 @@
 """Helper Utilities"""
 import math
-from typing import List, Dict, Any
+import re
+from typing import List, Dict, Any, Iterable, Iterator, Optional, TypeVar
+from urllib.parse import urlparse
+
+T = TypeVar("T")
 
 
 def calculate_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
@@ -29,6 +33,129 @@ def calculate_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> fl
     return R * c
 
 
+def chunked(items: Iterable[T], size: int) -> Iterator[List[T]]:
+    """
+    Split an iterable into lists of at most `size` items
+    
+    Args:
+        items: Items to split
+        size: Maximum chunk size
+        
+    Returns:
+        Iterator over chunks, preserving order
+    """
+    if size < 1:
+        raise ValueError("Chunk size must be positive")
+    chunk: List[T] = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def parse_retry_after(value: Any, default: float) -> float:
+    """
+    Parse a Retry-After header (delta seconds) into a wait in seconds
+    
+    Args:
+        value: Header value
+        default: Wait to use when the header is missing or not numeric
+        
+    Returns:
+        Seconds to wait
+    """
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return default
+
+
+def normalize_phone(value: Any) -> Optional[str]:
+    """
+    Reduce a phone number to a comparable key
+    
+    Keeps the last 10 digits so "+1 (555) 010-2030" and "555-010-2030" match.
+    
+    Args:
+        value: Raw phone number
+        
+    Returns:
+        Digit string, or None when too short to be a phone number
+    """
+    digits = re.sub(r"\D", "", str(value or ""))
+    if len(digits) < 7:
+        return None
+    return digits[-10:]
+
+
+def extract_domain(value: Any) -> Optional[str]:
+    """
+    Extract a bare, lowercase domain from a URL, host or email address
+    
+    Args:
+        value: URL ("https://www.acme.com/x"), host ("acme.com") or email ("a@acme.com")
+        
+    Returns:
+        Domain without "www.", or None
+    """
+    value = str(value or "").strip().lower()
+    if not value:
+        return None
+    if "@" in value and "/" not in value:
+        host = value.rsplit("@", 1)[1]
+    else:
+        host = urlparse(value if "//" in value else "//" + value).hostname or ""
+    host = host.strip(".")
+    if host.startswith("www."):
+        host = host[4:]
+    return host if "." in host else None
+
+
+_GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+def geohash_encode(latitude: float, longitude: float, precision: int = 7) -> str:
+    """
+    Encode coordinates as a geohash
+    
+    Nearby points share a prefix, so a plain string index answers "same
+    neighbourhood" lookups (precision 7 is a ~150 m cell, 6 is ~1 km).
+    
+    Args:
+        latitude: Latitude in degrees
+        longitude: Longitude in degrees
+        precision: Number of characters
+        
+    Returns:
+        Geohash string
+    """
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    value = 0
+    even = True
+    while len(chars) < precision:
+        target, span = (longitude, lon_range) if even else (latitude, lat_range)
+        mid = (span[0] + span[1]) / 2
+        value <<= 1
+        if target >= mid:
+            value |= 1
+            span[0] = mid
+        else:
+            span[1] = mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(_GEOHASH_ALPHABET[value])
+            bits = 0
+            value = 0
+    return "".join(chars)
+
+
 def get_response_mode_info() -> dict:
     """
     Get information about available response modes and their field mappings
@@ -87,6 +214,96 @@ def get_response_mode_info() -> dict:
     }
 
 
+def result_columns(results: Iterable[Dict[str, Any]], limited_fields: Optional[List[str]] = None) -> List[str]:
+    """
+    Columns of normalized results, found in one pass
+    
+    Without limited_fields this is every key of every record, in first-seen
+    order. With limited_fields it is the limited fields (in their order) that
+    hold a non-null value in at least one record; the scan stops as soon as
+    all of them have been seen with data.
+    
+    Args:
+        results: Result dictionaries
+        limited_fields: Optional list of fields to include
+        
+    Returns:
+        Column names
+    """
+    if limited_fields:
+        pending = dict.fromkeys(limited_fields)
+        for result in results:
+            for field in [field for field in pending if result.get(field) is not None]:
+                del pending[field]
+            if not pending:
+                break
+        return [field for field in dict.fromkeys(limited_fields) if field not in pending]
+
+    columns: Dict[str, None] = {}
+    known = columns.keys()
+    for result in results:
+        # A C-level subset test; new keys are rare after the first few records
+        if not result.keys() <= known:
+            for key in result:
+                if key not in columns:
+                    columns[key] = None
+    return list(columns)
+
+
+def iter_normalized_results(
+    results: Iterable[Dict[str, Any]],
+    limited_fields: Optional[List[str]] = None,
+    columns: Optional[List[str]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield results with a fixed set of fields, one at a time
+    
+    Pass `columns` (e.g. from result_columns) to stream a one-shot iterable in
+    a single pass; otherwise `results` must be re-iterable, as the columns
+    are computed first.
+    
+    Args:
+        results: Result dictionaries
+        limited_fields: Optional list of fields to include (see normalize_results_consistency)
+        columns: Precomputed columns
+        
+    Returns:
+        Iterator over normalized results
+    """
+    if columns is None:
+        columns = result_columns(results, limited_fields)
+    if limited_fields:
+        for result in results:
+            yield {key: result.get(key) for key in columns}
+        return
+    template = dict.fromkeys(columns)
+    for result in results:
+        row = template.copy()
+        row.update(result)
+        # Keys outside the precomputed columns are dropped to keep the schema fixed
+        if len(row) != len(template):
+            row = {key: row[key] for key in columns}
+        yield row
+
+
+def normalize_results_columnar(
+    results: List[Dict[str, Any]],
+    limited_fields: Optional[List[str]] = None,
+) -> Dict[str, List[Any]]:
+    """
+    Normalized results as one list of values per field
+    
+    Args:
+        results: Result dictionaries
+        limited_fields: Optional list of fields to include (see normalize_results_consistency)
+        
+    Returns:
+        Field name -> values aligned with `results`
+    """
+    columns = result_columns(results, limited_fields)
+    return {key: [result.get(key) for result in results] for key in columns}
+
+
 def normalize_results_consistency(results: List[Dict[str, Any]], limited_fields: List[str] = None) -> List[Dict[str, Any]]:
     """
     Normalize results to ensure field consistency across all records.
@@ -104,34 +321,4 @@ def normalize_results_consistency(results: List[Dict[str, Any]], limited_fields:
     """
     if not results:
         return results
-    
-    # If limited_fields specified, filter to only those fields first
-    if limited_fields:
-        results = [{k: result.get(k) for k in limited_fields} for result in results]
-        
-        # Find which limited fields have at least one non-null value
-        fields_with_data = set()
-        for result in results:
-            for key, value in result.items():
-                if value is not None:
-                    fields_with_data.add(key)
-        
-        # Filter results to only include fields that have data
-        results = [{k: v for k, v in result.items() if k in fields_with_data} for result in results]
-    
-    # Collect all unique keys across all results
-    all_keys = set()
-    for result in results:
-        all_keys.update(result.keys())
-    
-    # Normalize each result to have all keys
-    normalized_results = []
-    for result in results:
-        normalized = {}
-        for key in all_keys:
-            normalized[key] = result.get(key, None)
-        normalized_results.append(normalized)
-    
-    return normalized_results
-
-
+    return list(iter_normalized_results(results, limited_fields))
@@ -1,32 +1,12 @@
-"""Simple IP-based daily rate limiter backed by SQLite."""
-import sqlite3
-import os
+"""Simple IP-based daily rate limiter.
+
+Counters live in the store chosen by RATE_LIMIT_BACKEND (see rate_limit_store).
+"""
 from datetime import datetime
 from fastapi import Request, HTTPException
 from app.config import settings
-from app.utils.auth import TOKEN_COOKIE_NAME, decode_access_token
-from app.db.session import SessionLocal
-from app.db import models
-
-
-# DB placed at repo root
-DB_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "ip_rate_limiter.sqlite")
-
-
-def _get_conn():
-    db_file = os.path.abspath(DB_PATH)
-    os.makedirs(os.path.dirname(db_file), exist_ok=True)
-    conn = sqlite3.connect(db_file, timeout=5)
-    conn.execute(
-        """CREATE TABLE IF NOT EXISTS ip_limits (
-            ip TEXT NOT NULL,
-            date TEXT NOT NULL,
-            count INTEGER NOT NULL,
-            PRIMARY KEY(ip, date)
-        )"""
-    )
-    conn.commit()
-    return conn
+from app.utils.auth import TOKEN_COOKIE_NAME, get_request_user
+from app.utils.rate_limit_store import get_counter_store
 
 
 def _today():
@@ -42,24 +22,9 @@ def increment_or_check(ip: str, limit: int = 3) -> int:
         # treat missing ip as part of same bucket
         ip = "unknown"
 
-    conn = _get_conn()
-    cur = conn.cursor()
-    today = _today()
-    cur.execute("SELECT count FROM ip_limits WHERE ip = ? AND date = ?", (ip, today))
-    row = cur.fetchone()
-    if row:
-        count = int(row[0])
-        if count >= limit:
-            conn.close()
-            raise HTTPException(status_code=429, detail=f"Daily anonymous query limit reached ({limit})")
-        count += 1
-        cur.execute("UPDATE ip_limits SET count = ? WHERE ip = ? AND date = ?", (count, ip, today))
-    else:
-        count = 1
-        cur.execute("INSERT INTO ip_limits(ip, date, count) VALUES(?, ?, ?)", (ip, today, count))
-
-    conn.commit()
-    conn.close()
+    count = get_counter_store().hit(ip, _today(), limit)
+    if count is None:
+        raise HTTPException(status_code=429, detail=f"Daily anonymous query limit reached ({limit})")
     return count
 
 
@@ -75,20 +40,9 @@ async def enforce_ip_daily_limit(request: Request):
         if auth_header and auth_header.lower().startswith("bearer "):
             token = auth_header.split(" ", 1)[1]
 
-    if token:
-        try:
-            subject = decode_access_token(token)
-        except Exception:
-            subject = None
-
-        if subject:
-            db = SessionLocal()
-            try:
-                user = db.query(models.User).filter(models.User.google_sub == subject).first()
-                if user and user.credits > 0:
-                    return
-            finally:
-                db.close()
+    user = get_request_user(request, token)
+    if user and user.credits > 0:
+        return
 
     # Admin bypass via header
     admin_token = request.headers.get("x-admin-bypass-token")
@@ -0,0 +1,181 @@
+"""Incremental reader for large JSON uploads.
+
+Reads a JSON array (or an object holding one under a known key) in chunks and
+yields the array's elements one at a time, so memory is bounded by the chunk
+size and the largest single element rather than by the file size.
+"""
+import codecs
+import json
+import re
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Tuple
+
+_WHITESPACE = " \t\n\r"
+_LITERALS = ("true", "false", "null", "NaN", "Infinity", "-Infinity")
+# What is left unparsed of a number cut off after its "." or exponent marker
+_NUMBER_TAIL = re.compile(r"\.|[eE][-+]?")
+
+# Stands in for an object member's array value that has not been read yet
+_ARRAY = object()
+
+
+class JsonArrayReader:
+    """Stream the elements of a top-level JSON array.
+
+    If the document is an object instead, the first member named in
+    `array_keys` whose value is an array is streamed, and every other member
+    is collected in `fields` (small scalars such as a query string). An object
+    without such a member is yielded as the only element.
+
+    Args:
+        read: Async callable returning up to n bytes, b"" at end of file
+            (e.g. UploadFile.read)
+        array_keys: Object members that may hold the array
+        chunk_size: Bytes requested per read
+    """
+
+    def __init__(
+        self,
+        read: Callable[[int], Awaitable[bytes]],
+        array_keys: Tuple[str, ...] = (),
+        chunk_size: int = 64 * 1024,
+    ):
+        self._read = read
+        self.array_keys = array_keys
+        self.chunk_size = chunk_size
+        self.fields: Dict[str, Any] = {}
+        self._decoder = json.JSONDecoder()
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    async def items(self) -> AsyncIterator[Any]:
+        """Yield array elements in document order; raises ValueError on malformed input"""
+        first = await self._peek()
+        if first is None:
+            raise ValueError("Uploaded file is empty")
+        if first == "[":
+            self._pos += 1
+            async for item in self._array():
+                yield item
+        elif first == "{":
+            self._pos += 1
+            streamed = False
+            async for key, value in self._members():
+                if key in self.array_keys and not streamed and value is _ARRAY:
+                    streamed = True
+                    async for item in self._array():
+                        yield item
+                elif value is _ARRAY:
+                    self.fields[key] = [item async for item in self._array()]
+                else:
+                    self.fields[key] = value
+            if not streamed:
+                for key in self.array_keys:
+                    if self.fields.get(key) is not None:
+                        raise ValueError(f'"{key}" must be an array')
+                if self.fields:
+                    yield self.fields
+        else:
+            await self._value()
+            raise ValueError("Payload must be a JSON object or array")
+        if await self._peek() is not None:
+            raise ValueError("Uploaded file is not valid JSON")
+
+    async def _array(self) -> AsyncIterator[Any]:
+        """Elements of an array whose "[" was consumed"""
+        expect_comma = False
+        while True:
+            char = await self._peek()
+            if char == "]":
+                self._pos += 1
+                return
+            if expect_comma:
+                if char != ",":
+                    raise ValueError("Uploaded file is not valid JSON")
+                self._pos += 1
+            yield await self._value()
+            expect_comma = True
+
+    async def _members(self) -> AsyncIterator[Tuple[str, Any]]:
+        """(key, value) pairs of an object whose "{" was consumed; arrays are left unread as _ARRAY"""
+        expect_comma = False
+        while True:
+            char = await self._peek()
+            if char == "}":
+                self._pos += 1
+                return
+            if expect_comma:
+                if char != ",":
+                    raise ValueError("Uploaded file is not valid JSON")
+                self._pos += 1
+            key = await self._value()
+            if not isinstance(key, str) or await self._peek() != ":":
+                raise ValueError("Uploaded file is not valid JSON")
+            self._pos += 1
+            if await self._peek() == "[":
+                self._pos += 1
+                yield key, _ARRAY
+            else:
+                yield key, await self._value()
+            expect_comma = True
+
+    async def _value(self) -> Any:
+        """Decode the next complete JSON value, reading more input until it fits"""
+        await self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError as error:
+                # Only a value cut off by the end of the buffer can be completed by reading more;
+                # anything else is malformed and fails now instead of buffering the rest of the file
+                if self._eof or not self._truncated(error):
+                    raise ValueError("Uploaded file is not valid JSON")
+            else:
+                # A number that ends with the buffer (or with its "." or exponent marker) may
+                # continue in the next chunk
+                if self._eof or not (
+                    end == len(self._buffer)
+                    or (type(value) in (int, float) and _NUMBER_TAIL.fullmatch(self._buffer, end))
+                ):
+                    self._pos = end
+                    return value
+            await self._fill(grow=True)
+
+    def _truncated(self, error: json.JSONDecodeError) -> bool:
+        """Whether a decode error is explained by the buffer ending mid-value"""
+        remaining = len(self._buffer) - error.pos
+        if remaining <= 0 or error.msg.startswith("Unterminated string"):
+            return True
+        if error.msg.startswith("Invalid \\uXXXX escape"):
+            return remaining < 6
+        # A literal split across chunks ("tr" + "ue") fails where it starts, a number ("1." + "5") after its digits
+        tail = self._buffer[error.pos:]
+        return any(literal.startswith(tail) for literal in _LITERALS) or _NUMBER_TAIL.fullmatch(tail) is not None
+
+    async def _peek(self) -> Optional[str]:
+        """Skip whitespace and return the next character without consuming it (None at end of input)"""
+        while True:
+            buffer = self._buffer
+            pos = self._pos
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            self._pos = pos
+            if pos < len(buffer):
+                return buffer[pos]
+            if self._eof:
+                return None
+            await self._fill()
+
+    async def _fill(self, grow: bool = False) -> None:
+        # When a value spans chunks, read as much again as is already buffered so large values
+        # are re-parsed a logarithmic rather than linear number of times
+        size = self.chunk_size
+        if grow:
+            size = max(size, len(self._buffer) - self._pos)
+        chunk = await self._read(size)
+        text = self._utf8.decode(chunk or b"", final=not chunk)
+        if not chunk:
+            self._eof = True
+        self._buffer = self._buffer[self._pos:] + text
+        self._pos = 0
@@ -0,0 +1,258 @@
+"""Counter stores for the anonymous daily rate limiter.
+
+Each store implements `hit(key, window, limit)`: atomically add one to the
+counter for (key, window) unless it already reached `limit`. It returns the new
+count, or None when the request must be rejected.
+
+- MemoryCounterStore: sharded in-process counters, persisted write-behind to SQLite
+- SqliteCounterStore: one atomic UPSERT ... RETURNING per hit, shared by all workers on a host
+- RedisCounterStore: one Lua call per hit, shared by workers on any host
+"""
+import atexit
+import logging
+import os
+import sqlite3
+import threading
+import zlib
+from typing import Dict, Iterable, Optional, Tuple
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# DB placed at repo root
+DB_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "ip_rate_limiter.sqlite")
+
+_CREATE_TABLE = """CREATE TABLE IF NOT EXISTS ip_limits (
+    ip TEXT NOT NULL,
+    date TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY(ip, date)
+)"""
+
+# Insert the first hit or bump the counter, but only while it is below the limit.
+# When the WHERE clause fails no row is returned, which means "limit reached".
+_HIT_SQL = """INSERT INTO ip_limits(ip, date, count) VALUES(?, ?, 1)
+ON CONFLICT(ip, date) DO UPDATE SET count = count + 1 WHERE count < ?
+RETURNING count"""
+
+# Write-behind merge: counters only grow within a day, so keep the larger value
+_MERGE_SQL = """INSERT INTO ip_limits(ip, date, count) VALUES(?, ?, ?)
+ON CONFLICT(ip, date) DO UPDATE SET count = MAX(count, excluded.count)"""
+
+
+class SqliteCounterStore:
+    """Counters in a SQLite file, one atomic statement per hit.
+
+    Connections are opened once per thread and the table is created once per
+    store, instead of on every request.
+    """
+
+    def __init__(self, path: str = DB_PATH):
+        self.path = os.path.abspath(path)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._local = threading.local()
+        conn = self._conn()
+        conn.execute(_CREATE_TABLE)
+        conn.commit()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def hit(self, key: str, window: str, limit: int) -> Optional[int]:
+        row = self._conn().execute(_HIT_SQL, (key, window, limit)).fetchone()
+        return int(row[0]) if row else None
+
+    def get(self, key: str, window: str) -> int:
+        row = self._conn().execute(
+            "SELECT count FROM ip_limits WHERE ip = ? AND date = ?", (key, window)
+        ).fetchone()
+        return int(row[0]) if row else 0
+
+    def merge(self, counts: Iterable[Tuple[str, str, int]]) -> None:
+        conn = self._conn()
+        conn.execute("BEGIN")
+        try:
+            conn.executemany(_MERGE_SQL, counts)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def prune(self, keep_window: str) -> None:
+        """Drop counters for windows older than `keep_window` (ISO dates sort lexically)."""
+        self._conn().execute("DELETE FROM ip_limits WHERE date < ?", (keep_window,))
+
+
+class _Shard:
+    __slots__ = ("lock", "counts", "dirty")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counts: Dict[Tuple[str, str], int] = {}
+        self.dirty: set = set()
+
+
+class MemoryCounterStore:
+    """In-process counters split across independently locked shards.
+
+    A hit only takes the lock of the shard its key hashes to, so concurrent
+    requests from different IPs rarely wait on each other. Counters are seeded
+    from SQLite the first time a key is seen in a window (so restarts do not
+    reset limits) and dirty counters are flushed back every `flush_interval`
+    seconds by a background thread. Limits are per process, so the store is
+    only used with a single worker (see _build_store).
+    """
+
+    def __init__(self, persist: Optional[SqliteCounterStore] = None, shards: int = 16, flush_interval: float = 5.0):
+        self.persist = persist
+        self._shards = [_Shard() for _ in range(max(1, shards))]
+        self._window: Optional[str] = None
+        self._stop = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        if persist is not None and flush_interval > 0:
+            self._flusher = threading.Thread(
+                target=self._flush_loop, args=(flush_interval,), name="rate-limit-flush", daemon=True
+            )
+            self._flusher.start()
+            atexit.register(self.close)
+
+    def _shard(self, key: str) -> _Shard:
+        return self._shards[zlib.crc32(key.encode()) % len(self._shards)]
+
+    def hit(self, key: str, window: str, limit: int) -> Optional[int]:
+        if window != self._window:
+            self._roll(window)
+        shard = self._shard(key)
+        slot = (key, window)
+        with shard.lock:
+            known = slot in shard.counts
+        # Stays 0 if a concurrent roll dropped a slot that was known: it belonged to an earlier window
+        seeded = 0
+        if not known:
+            # First hit for this key in the window: read the persisted count outside the lock
+            seeded = self.persist.get(key, window) if self.persist is not None else 0
+        with shard.lock:
+            count = shard.counts.get(slot)
+            if count is None:
+                count = seeded
+            if count >= limit:
+                shard.counts[slot] = count
+                return None
+            shard.counts[slot] = count + 1
+            shard.dirty.add(slot)
+        return count + 1
+
+    def _roll(self, window: str) -> None:
+        """Forget counters from earlier windows once the day changes."""
+        self.flush()
+        for shard in self._shards:
+            with shard.lock:
+                shard.counts = {slot: c for slot, c in shard.counts.items() if slot[1] >= window}
+                shard.dirty = {slot for slot in shard.dirty if slot[1] >= window}
+        self._window = window
+        if self.persist is not None:
+            self.persist.prune(window)
+
+    def flush(self) -> int:
+        """Write dirty counters to SQLite. Returns the number of rows written."""
+        if self.persist is None:
+            return 0
+        pending = []
+        for shard in self._shards:
+            with shard.lock:
+                pending.extend((key, window, shard.counts[(key, window)]) for key, window in shard.dirty)
+                shard.dirty = set()
+        if pending:
+            try:
+                self.persist.merge(pending)
+            except Exception as e:
+                logger.warning(f"Rate limit flush failed, will retry: {e}")
+                for key, window, _ in pending:
+                    shard = self._shard(key)
+                    with shard.lock:
+                        shard.dirty.add((key, window))
+                return 0
+        return len(pending)
+
+    def _flush_loop(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            self.flush()
+
+    def close(self) -> None:
+        self._stop.set()
+        self.flush()
+
+
+# KEYS[1] = counter key, ARGV[1] = limit, ARGV[2] = ttl seconds
+_REDIS_HIT_SCRIPT = """
+local count = tonumber(redis.call('GET', KEYS[1]) or '0')
+if count >= tonumber(ARGV[1]) then
+    return -1
+end
+count = redis.call('INCR', KEYS[1])
+if count == 1 then
+    redis.call('EXPIRE', KEYS[1], ARGV[2])
+end
+return count
+"""
+
+
+class RedisCounterStore:
+    """Counters in Redis (or any server speaking its protocol, e.g. Valkey or KeyDB)."""
+
+    def __init__(self, url: str, prefix: str = "ip_limits", ttl: int = 2 * 86400):
+        import redis  # lazy: only needed when RATE_LIMIT_BACKEND=redis
+
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+        self.ttl = ttl
+        self._hit = self.client.register_script(_REDIS_HIT_SCRIPT)
+
+    def hit(self, key: str, window: str, limit: int) -> Optional[int]:
+        count = int(self._hit(keys=[f"{self.prefix}:{window}:{key}"], args=[limit, self.ttl]))
+        return None if count < 0 else count
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_counter_store():
+    """Return the process-wide store selected by RATE_LIMIT_BACKEND."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = _build_store(settings.RATE_LIMIT_BACKEND.lower())
+    return _store
+
+
+def _build_store(backend: str):
+    if backend == "redis":
+        try:
+            return RedisCounterStore(settings.RATE_LIMIT_REDIS_URL)
+        except ImportError:
+            logger.warning("RATE_LIMIT_BACKEND=redis but the redis package is not installed; using sqlite")
+            backend = "sqlite"
+    if backend == "memory" and _worker_count() > 1:
+        # Each worker would count against its own copy of the daily budget
+        logger.warning("RATE_LIMIT_BACKEND=memory is per process and several workers are running; using sqlite")
+        backend = "sqlite"
+    if backend == "memory":
+        return MemoryCounterStore(SqliteCounterStore(), flush_interval=settings.RATE_LIMIT_FLUSH_INTERVAL)
+    return SqliteCounterStore()
+
+
+def _worker_count() -> int:
+    """Worker processes serving the app, from uvicorn's/gunicorn's WEB_CONCURRENCY"""
+    try:
+        return int(os.getenv("WEB_CONCURRENCY", "1"))
+    except ValueError:
+        return 1
@@ -0,0 +1,93 @@
+"""Fast JSON responses for large payloads.
+
+Routes that already hold validated Pydantic models can return them wrapped in
+JSONModelResponse. FastAPI skips `response_model` processing for Response
+objects, so the models are not dumped, re-validated and re-encoded a second
+time. Models are serialized by pydantic-core, and everything else goes
+through orjson when it is installed.
+"""
+import json
+from typing import Any, Dict, List, Optional, Sequence
+
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    return jsonable_encoder(value)
+
+
+def dumps_json(content: Any, pretty: bool = False) -> bytes:
+    """
+    Serialize a response body to UTF-8 JSON
+
+    Args:
+        content: Pydantic model or JSON-compatible value
+        pretty: Indent by two spaces instead of the compact default
+
+    Returns:
+        Encoded JSON
+    """
+    if isinstance(content, BaseModel):
+        return content.model_dump_json(indent=2 if pretty else None).encode("utf-8")
+    try:
+        import orjson  # optional: the stdlib encoder is used without it
+    except ImportError:
+        orjson = None
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+        return orjson.dumps(content, default=_default, option=option)
+    return json.dumps(
+        content,
+        default=_default,
+        ensure_ascii=False,
+        indent=2 if pretty else None,
+        separators=None if pretty else (",", ":"),
+    ).encode("utf-8")
+
+
+class JSONModelResponse(JSONResponse):
+    """JSONResponse that serializes models without re-validating them, compact unless `pretty`"""
+
+    def __init__(self, content: Any, status_code: int = 200, pretty: bool = False, headers: Optional[dict] = None, **kwargs):
+        self.pretty = pretty
+        super().__init__(content, status_code=status_code, headers=headers, **kwargs)
+
+    def render(self, content: Any) -> bytes:
+        return dumps_json(content, pretty=self.pretty)
+
+
+def export_response(
+    records: Sequence[Dict[str, Any]],
+    file_format: str,
+    fields: Optional[str],
+    stem: str,
+) -> StreamingResponse:
+    """
+    Stream records as a CSV, Parquet or XLSX download
+
+    Args:
+        records: Result dictionaries
+        file_format: csv, parquet or xlsx
+        fields: Optional comma-separated fields to keep
+        stem: Download file name without extension
+    """
+    from app.services.export_service import ResultExporter
+
+    limited_fields: Optional[List[str]] = [f.strip() for f in fields.split(",") if f.strip()] if fields else None
+    try:
+        exporter = ResultExporter(file_format.lower())
+        body = exporter.stream(records, limited_fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ImportError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+    return StreamingResponse(
+        body,
+        media_type=exporter.media_type,
+        headers={"Content-Disposition": f"attachment; filename={exporter.filename(stem)}"},
+    )
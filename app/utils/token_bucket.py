@@ -0,0 +1,57 @@
+"""Thread-safe token bucket for pacing outbound API calls."""
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+
+class TokenBucket:
+    """Classic token bucket: `rate` tokens per second, bursts up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0, timeout: Optional[float] = None) -> bool:
+        """Block until `tokens` are available. Returns False if `timeout` elapses first."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now >= self._paused_until and self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return True
+                wait = max(self._paused_until - now, (tokens - self._tokens) / self.rate)
+            if deadline is not None and time.monotonic() + wait > deadline:
+                return False
+            time.sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        """Stop handing out tokens for `seconds` (e.g. after a 429 with Retry-After)."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = 0.0
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated = now
+
+
+_buckets: Dict[Tuple[str, str], TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def get_token_bucket(provider: str, key: str, rate: float, capacity: Optional[float] = None) -> TokenBucket:
+    """Return the process-wide bucket for a provider account (e.g. one HubSpot portal token)."""
+    with _buckets_lock:
+        bucket = _buckets.get((provider, key))
+        if bucket is None:
+            bucket = TokenBucket(rate, capacity)
+            _buckets[(provider, key)] = bucket
+        return bucket
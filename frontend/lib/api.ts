@@ -181,6 +181,20 @@ export const upsertLead = async (provider: string, lead: Lead) => {
   return response.data;
 };
 
+// Server-side export of a saved search (query.search_id) to a CRM
+export const exportSearchToCrm = async (provider: string, searchId: string, skipExisting: boolean = false) => {
+  const response = await apiClient.post(`/api/v1/crm/${provider}/export`, {
+    search_id: searchId,
+    skip_existing: skipExisting,
+  });
+  return response.data;
+};
+
+export const getPushStatus = async (jobId: string) => {
+  const response = await apiClient.get(`/api/v1/crm/push/${jobId}`);
+  return response.data;
+};
+
 // Deal APIs
 export const createDeal = async (provider: string, deal: Deal) => {
   const response = await apiClient.post(`/api/v1/${provider}/deals`, deal);
@@ -196,21 +210,24 @@ export const searchContacts = async (provider: string, query: string, limit: num
 };
 
 // Enrichment APIs
+// Pass the search result's placeId to store contacts and reuse them on later calls
 export const enrichBusiness = async (
   name: string,
   website: string,
-  address?: string
+  address?: string,
+  placeId?: string
 ): Promise<EnrichmentResponse> => {
   const response = await apiClient.post('/api/v1/enrichment/enrich', {
     name,
     website,
     address,
+    place_id: placeId,
   });
   return response.data;
 };
 
 export const batchEnrichBusinesses = async (
-  businesses: Array<{ name: string; website: string; address?: string }>
+  businesses: Array<{ name: string; website: string; address?: string; place_id?: string }>
 ) => {
   const response = await apiClient.post('/api/v1/enrichment/batch-enrich', {
     businesses,
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark concurrent searches by one user: the previous ORM read-modify-write
+debit (`user.credits -= 1; db.commit()`) against CreditLedger reserve + settle.
+
+Reports throughput and whether the final balance matches the number of
+searches that were allowed (the legacy path loses updates under concurrency).
+
+Usage:
+  python scripts/benchmark_credit_ledger.py [searches] [threads]
+"""
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.db import models  # noqa: E402
+from app.db.session import Base  # noqa: E402
+from app.services.credit_ledger import CreditLedger  # noqa: E402
+
+# Simulated provider latency between the credit check and the debit
+SEARCH_SECONDS = 0.005
+
+
+def make_factory(path, credits):
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False, "timeout": 60})
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine)
+    db = factory()
+    db.add(models.User(id=1, google_sub="bench", email="bench@example.com", name="Bench", credits=credits))
+    db.commit()
+    db.close()
+    return factory
+
+
+def legacy_search(factory):
+    db = factory()
+    try:
+        user = db.get(models.User, 1)
+        if user.credits <= 0:
+            return False
+        time.sleep(SEARCH_SECONDS)
+        user.credits -= 1
+        db.commit()
+        return True
+    finally:
+        db.close()
+
+
+def ledger_search(factory, ledger):
+    db = factory()
+    try:
+        reservation_id = ledger.reserve(db, 1)
+        if reservation_id is None:
+            return False
+        time.sleep(SEARCH_SECONDS)
+        ledger.settle(reservation_id)
+        return True
+    finally:
+        db.close()
+
+
+def run(label, factory, search, searches, threads, credits):
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        allowed = sum(pool.map(lambda _: search(), range(searches)))
+    elapsed = time.perf_counter() - started
+    db = factory()
+    balance = db.get(models.User, 1).credits
+    db.close()
+    consistent = balance == credits - allowed
+    print(
+        f"{label:<8} {searches} searches  {elapsed:7.3f}s  {searches / elapsed:8.1f}/s  "
+        f"allowed={allowed} balance={balance} consistent={consistent}"
+    )
+
+
+def main():
+    searches = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+    credits = searches // 2
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy = make_factory(os.path.join(tmp, "legacy.sqlite"), credits)
+        run("legacy", legacy, lambda: legacy_search(legacy), searches, threads, credits)
+
+        factory = make_factory(os.path.join(tmp, "ledger.sqlite"), credits)
+        ledger = CreditLedger(factory, settle_batch_size=50, settle_interval=5)
+        run("ledger", factory, lambda: ledger_search(factory, ledger), searches, threads, credits)
+        ledger.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark SQLite write throughput for the previous bare engine against
+create_db_engine (WAL, synchronous=NORMAL, busy timeout, mmap).
+
+The workload mixes concurrent search traffic (credit reserve + settle, saved
+search run insert, user reads) with Stripe webhook credit grants.
+
+Usage:
+  python scripts/benchmark_db_engine.py [operations] [threads]
+"""
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.exc import OperationalError  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.db import models  # noqa: E402
+from app.db.session import Base, create_db_engine  # noqa: E402
+from app.services.credit_ledger import CreditLedger  # noqa: E402
+
+USERS = 50
+RESULTS = json.dumps([{"name": f"Business {i}", "place_id": f"place-{i}"} for i in range(20)])
+
+
+def seed(factory):
+    db = factory()
+    db.add_all(
+        models.User(id=i, google_sub=f"sub-{i}", email=f"u{i}@example.com", name=f"U{i}", credits=1_000_000)
+        for i in range(1, USERS + 1)
+    )
+    db.commit()
+    db.close()
+
+
+def operation(factory, ledger, rng):
+    db = factory()
+    try:
+        user_id = rng.randint(1, USERS)
+        kind = rng.random()
+        if kind < 0.6:
+            # Search: read the user, reserve a credit, save the run, settle
+            db.get(models.User, user_id)
+            reservation_id = ledger.reserve(db, user_id)
+            db.add(models.SearchRun(id=str(uuid.uuid4()), user_id=user_id, route="/search", query="{}",
+                                    total_results=20, results=RESULTS))
+            db.commit()
+            ledger.settle(reservation_id)
+        elif kind < 0.7:
+            # Webhook: grant purchased credits
+            ledger.grant(db, user_id, 100, "purchase", str(uuid.uuid4()))
+        else:
+            # Profile / credits reads
+            db.get(models.User, user_id)
+        return True
+    except OperationalError:
+        db.rollback()
+        return False
+    finally:
+        db.close()
+
+
+def run(label, engine, operations, threads):
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine, autoflush=False)
+    seed(factory)
+    ledger = CreditLedger(factory, settle_batch_size=50, settle_interval=1)
+    rngs = [random.Random(i) for i in range(operations)]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        ok = sum(pool.map(lambda rng: operation(factory, ledger, rng), rngs))
+    ledger.flush()
+    elapsed = time.perf_counter() - started
+    print(f"{label:<8} {operations} ops  {elapsed:7.3f}s  {operations / elapsed:8.1f} ops/s  errors={operations - ok}")
+    engine.dispose()
+
+
+def main():
+    operations = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+
+    with tempfile.TemporaryDirectory() as tmp:
+        bare = create_engine(f"sqlite:///{os.path.join(tmp, 'bare.sqlite')}", connect_args={"check_same_thread": False})
+        run("bare", bare, operations, threads)
+        tuned = create_db_engine(f"sqlite:///{os.path.join(tmp, 'tuned.sqlite')}")
+        run("tuned", tuned, operations, threads)
+
+
+if __name__ == "__main__":
+    main()
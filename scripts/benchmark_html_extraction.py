@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Compare full-document and streaming HTML-to-text extraction in WebScraperService.
+Builds a synthetic heavy homepage (inline scripts, large footer) and reports
+time per page and peak traced memory for both modes.
+
+Usage:
+  python scripts/benchmark_html_extraction.py [size_mb]
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.services.web_scraper_service import WebScraperService  # noqa: E402
+
+
+class FakeStreamedResponse:
+    """Minimal stand-in for a streamed requests.Response"""
+
+    def __init__(self, body: bytes):
+        self._body = body
+        self.headers = {"Content-Type": "text/html; charset=utf-8"}
+        self.bytes_read = 0
+
+    @property
+    def content(self) -> bytes:
+        self.bytes_read = len(self._body)
+        return self._body
+
+    def iter_content(self, chunk_size: int = 16384):
+        for offset in range(0, len(self._body), chunk_size):
+            self.bytes_read = offset + chunk_size
+            yield self._body[offset:offset + chunk_size]
+
+
+def build_page(size_mb: float) -> bytes:
+    parts = ["<html><head><title>Acme Plumbing</title>"]
+    parts.append("<script>" + "var x = 1;" * 20000 + "</script></head><body>")
+    paragraph = (
+        "<div class='card'><h2>Service {i}</h2><p>We install, repair and maintain "
+        "water heaters, pipes and fixtures. Call 555-0100 for service {i}.</p></div>\n"
+    )
+    i = 0
+    while sum(len(p) for p in parts) < size_mb * 1024 * 1024:
+        parts.append(paragraph.format(i=i))
+        i += 1
+    parts.append("</body></html>")
+    return "".join(parts).encode("utf-8")
+
+
+def measure(label, func):
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<10} {elapsed * 1000:8.1f} ms  peak {peak / 1024 / 1024:7.2f} MB  chars {len(result or '')}")
+    return result
+
+
+def main():
+    size_mb = float(sys.argv[1]) if len(sys.argv) > 1 else 3.0
+    body = build_page(size_mb)
+    scraper = WebScraperService()
+    print(f"Synthetic page: {len(body) / 1024 / 1024:.2f} MB")
+
+    full_response = FakeStreamedResponse(body)
+    full = measure("full", lambda: scraper.html_to_text(full_response.content)[: scraper.max_text_chars])
+
+    streamed_response = FakeStreamedResponse(body)
+    streamed = measure(
+        "streaming",
+        lambda: scraper.stream_text(streamed_response, max_chars=scraper.max_text_chars)[: scraper.max_text_chars],
+    )
+    print(f"bytes read: full {full_response.bytes_read}, streaming {streamed_response.bytes_read}")
+    print(f"identical output: {full == streamed}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Benchmark search response serialization.
+
+Compares FastAPI's response_model path (dump, re-validate, jsonable_encoder,
+json.dumps), the upload route's former json.dumps(indent=2), and
+JSONModelResponse (compact and pretty) for 50- and 5000-result payloads.
+
+Usage:
+  python scripts/benchmark_json_responses.py [results ...]
+"""
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_response_field  # noqa: E402
+
+from app.schemas.business import SearchResultsResponse  # noqa: E402
+from app.services.provider_mapping import ProviderMapper  # noqa: E402
+from app.utils.responses import JSONModelResponse  # noqa: E402
+from benchmark_provider_mapping import build  # noqa: E402
+
+RESPONSE_FIELD = create_response_field(name="Response_search", type_=SearchResultsResponse)
+
+
+def fastapi_response_model(payload):
+    content = asyncio.run(serialize_response(field=RESPONSE_FIELD, response_content=payload, is_coroutine=True))
+    return JSONResponse(content).body
+
+
+def stdlib_indent(payload):
+    return json.dumps(payload.model_dump(), ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def model_response(payload):
+    return JSONModelResponse(payload).body
+
+
+def model_response_pretty(payload):
+    return JSONModelResponse(payload, pretty=True).body
+
+
+def timed(fn, payload, rounds):
+    best = float("inf")
+    body = b""
+    for _ in range(rounds):
+        started = time.perf_counter()
+        body = fn(payload)
+        best = min(best, time.perf_counter() - started)
+    return best, len(body)
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [50, 5000]
+    for count in sizes:
+        results = ProviderMapper().map_items(build(count))
+        payload = SearchResultsResponse(total_results=len(results), results=results, query={"query": "shops"})
+        rounds = 200 if count <= 100 else 5
+        print(f"{count} results")
+        for fn in (fastapi_response_model, stdlib_indent, model_response, model_response_pretty):
+            elapsed, size = timed(fn, payload, rounds)
+            print(f"  {fn.__name__:<24} {elapsed * 1000:>9.2f} ms {size / 1e3:>10.1f} kB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark normalize_results_consistency against its former multi-pass version.
+
+Builds BusinessResponse-like records with a few optional fields missing and
+times full normalization, the limited-field projection, columnar output and
+the streaming generator.
+
+Usage:
+  python scripts/benchmark_normalize_results.py [records]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.utils.helpers import (  # noqa: E402
+    get_response_mode_info,
+    iter_normalized_results,
+    normalize_results_columnar,
+    normalize_results_consistency,
+    result_columns,
+)
+
+FIELDS = ["name", "place_id", "address", "latitude", "longitude", "business_type", "phone", "website",
+          "rating", "review_count", "opening_hours", "business_status", "price_level", "types",
+          "formatted_phone", "photos", "city", "state", "country", "postal_code"]
+
+
+def legacy_normalize(results, limited_fields=None):
+    """The implementation before the single-pass rewrite"""
+    if not results:
+        return results
+    if limited_fields:
+        results = [{k: result.get(k) for k in limited_fields} for result in results]
+        fields_with_data = set()
+        for result in results:
+            for key, value in result.items():
+                if value is not None:
+                    fields_with_data.add(key)
+        results = [{k: v for k, v in result.items() if k in fields_with_data} for result in results]
+    all_keys = set()
+    for result in results:
+        all_keys.update(result.keys())
+    normalized_results = []
+    for result in results:
+        normalized = {}
+        for key in all_keys:
+            normalized[key] = result.get(key, None)
+        normalized_results.append(normalized)
+    return normalized_results
+
+
+def build(count, seed=7):
+    rng = random.Random(seed)
+    records = []
+    for i in range(count):
+        record = {field: f"{field}-{i}" for field in FIELDS if field in ("name", "place_id") or rng.random() > 0.1}
+        if "phone" in record and rng.random() < 0.3:
+            record["phone"] = None
+        records.append(record)
+    return records
+
+
+def timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - started, result
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    records = build(count)
+    limited = get_response_mode_info()["limited"]["fields"]
+
+    cases = [
+        ("full rows", lambda: legacy_normalize(records), lambda: normalize_results_consistency(records)),
+        ("limited rows", lambda: legacy_normalize(records, limited),
+         lambda: normalize_results_consistency(records, limited)),
+    ]
+    print(f"records: {count}")
+    for label, old, new in cases:
+        old_time, old_rows = timed(old)
+        new_time, new_rows = timed(new)
+        assert old_rows == new_rows
+        print(f"  {label:<14} legacy {old_time * 1000:>8.1f} ms   single-pass {new_time * 1000:>8.1f} ms   "
+              f"{old_time / new_time:.1f}x")
+
+    columnar_time, _ = timed(lambda: normalize_results_columnar(records, limited))
+    print(f"  {'columnar':<14} {columnar_time * 1000:>8.1f} ms (limited fields)")
+    columns = result_columns(records)
+    stream_time, streamed = timed(lambda: sum(1 for _ in iter_normalized_results(iter(records), columns=columns)))
+    print(f"  {'generator':<14} {stream_time * 1000:>8.1f} ms for {streamed} rows with precomputed columns")
+
+
+if __name__ == "__main__":
+    main()
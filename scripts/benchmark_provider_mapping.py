@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark provider-item mapping: cached field-resolution plans with
+unvalidated construction of well-typed items vs. the same plans with
+pydantic validation of every item.
+
+Generates provider items in the scraper's schema and reports items per
+second for both mappers, checking that they produce the same results.
+
+Usage:
+  python scripts/benchmark_provider_mapping.py [items] [rounds]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.services.provider_mapping import ProviderMapper  # noqa: E402
+
+KINDS = ["Pizza restaurant", "Cafe", "Dentist", "Plumber", "Bakery", "Hair salon", "Florist", "Gym"]
+
+
+def build(count, seed=7):
+    rng = random.Random(seed)
+    items = []
+    for i in range(count):
+        kind = rng.choice(KINDS)
+        items.append({
+            "title": f"Business {i}",
+            "placeId": f"ChIJ{i:08d}",
+            "categoryName": kind,
+            "categories": [kind, "Store"],
+            "address": f"{i} Main St, Springfield",
+            "street": f"{i} Main St",
+            "city": "Springfield",
+            "state": "IL",
+            "countryCode": "US",
+            "postalCode": "62701",
+            "location": {"lat": 39.78 + rng.random() / 10, "lng": -89.65 + rng.random() / 10},
+            "phone": "(217) 555-0100",
+            "phoneUnformatted": "+12175550100",
+            "website": f"https://business{i}.test",
+            "totalScore": round(rng.uniform(3, 5), 1),
+            "reviewsCount": rng.randint(0, 2000),
+            "price": "$$",
+            "url": f"https://www.google.com/maps/place/?q=place_id:ChIJ{i:08d}",
+            "imageUrl": f"https://images.test/{i}.jpg",
+            "imagesCount": rng.randint(0, 50),
+            "openingHours": [{"day": day, "hours": "9 AM to 5 PM"} for day in ("Monday", "Tuesday", "Wednesday")],
+            "reviewsDistribution": {"oneStar": 1, "fiveStar": 10},
+            "permanentlyClosed": False,
+            "temporarilyClosed": False,
+            "isAdvertisement": False,
+            "cid": str(rng.randint(10**17, 10**18)),
+            "rank": i + 1,
+            "searchString": "shops",
+            "scrapedAt": "2024-01-01T00:00:00.000Z",
+            "additionalInfo": {"Service options": [{"Delivery": True}]},
+        })
+    return items
+
+
+def timed(fn, rounds):
+    best = float("inf")
+    result = None
+    for _ in range(rounds):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    items = build(count)
+
+    reference_time, reference = timed(lambda: ProviderMapper(validate=True).map_items(items), rounds)
+    planned_time, planned = timed(lambda: ProviderMapper().map_items(items), rounds)
+
+    same = all(a.model_dump_json() == b.model_dump_json() for a, b in zip(reference, planned))
+    print(f"items:             {count}")
+    print(f"validated:         {count / reference_time:,.0f} items/s ({reference_time * 1000:.1f} ms)")
+    print(f"trusted construct: {count / planned_time:,.0f} items/s ({planned_time * 1000:.1f} ms)")
+    print(f"speedup:           {reference_time / planned_time:.1f}x")
+    print(f"identical output:  {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Benchmark the anonymous rate limiter backends against the previous
+implementation (new SQLite connection + CREATE TABLE + SELECT/UPDATE per hit).
+
+Usage:
+  python scripts/benchmark_rate_limiter.py [hits] [threads]
+"""
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.utils.rate_limit_store import MemoryCounterStore, SqliteCounterStore  # noqa: E402
+
+WINDOW = "2024-01-01"
+LIMIT = 1_000_000
+
+
+def legacy_hit(path, ip):
+    """Previous increment_or_check body"""
+    conn = sqlite3.connect(path, timeout=30)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS ip_limits (ip TEXT NOT NULL, date TEXT NOT NULL, "
+        "count INTEGER NOT NULL, PRIMARY KEY(ip, date))"
+    )
+    conn.commit()
+    cur = conn.cursor()
+    cur.execute("SELECT count FROM ip_limits WHERE ip = ? AND date = ?", (ip, WINDOW))
+    row = cur.fetchone()
+    if row:
+        cur.execute("UPDATE ip_limits SET count = ? WHERE ip = ? AND date = ?", (row[0] + 1, ip, WINDOW))
+    else:
+        cur.execute("INSERT INTO ip_limits(ip, date, count) VALUES(?, ?, 1)", (ip, WINDOW))
+    conn.commit()
+    conn.close()
+
+
+def run(label, hit, hits, threads, distinct_ips=1_000):
+    ips = [f"10.0.{(i % distinct_ips) // 256}.{i % 256}" for i in range(hits)]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(hit, ips))
+    elapsed = time.perf_counter() - started
+    print(f"{label:<14} {hits:>7} hits  {elapsed:8.3f}s  {elapsed / hits * 1e6:9.1f} us/hit")
+
+
+def main():
+    hits = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_path = os.path.join(tmp, "legacy.sqlite")
+        run("legacy", lambda ip: legacy_hit(legacy_path, ip), hits, threads)
+
+        sqlite_store = SqliteCounterStore(os.path.join(tmp, "sqlite.sqlite"))
+        run("sqlite", lambda ip: sqlite_store.hit(ip, WINDOW, LIMIT), hits, threads)
+
+        memory_store = MemoryCounterStore(SqliteCounterStore(os.path.join(tmp, "memory.sqlite")), flush_interval=0)
+        # The first hit per IP reads its persisted count once; later hits stay in memory
+        run("memory (cold)", lambda ip: memory_store.hit(ip, WINDOW, LIMIT), hits, threads)
+        run("memory (warm)", lambda ip: memory_store.hit(ip, WINDOW, LIMIT), hits * 10, threads)
+        started = time.perf_counter()
+        written = memory_store.flush()
+        print(f"flush          {written:>7} rows  {time.perf_counter() - started:8.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Benchmark WebScraperService.extract_text_section against the previous
+quadratic implementation on a large synthetic page.
+
+Usage:
+  python scripts/benchmark_text_sections.py [lines]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.services.web_scraper_service import WebScraperService  # noqa: E402
+
+KEYWORDS = ["email", "phone", "contact", "team", "director"]
+
+
+def legacy_extract_text_section(html_text, keywords):
+    """Previous implementation (lines.index inside the loop)"""
+    lines = html_text.split('\n')
+    relevant_lines = []
+    for line in lines:
+        lower_line = line.lower()
+        if any(keyword.lower() in lower_line for keyword in keywords):
+            start = max(0, lines.index(line) - 2)
+            end = min(len(lines), lines.index(line) + 3)
+            relevant_lines.extend(lines[start:end])
+    if relevant_lines:
+        return '\n'.join(relevant_lines)
+    return html_text[:1000]
+
+
+def build_text(line_count: int) -> str:
+    rng = random.Random(42)
+    filler = ["Our services include repairs", "Open Monday to Friday", "Serving the city since 1985",
+              "Free estimates available", "Licensed and insured"]
+    lines = []
+    for i in range(line_count):
+        if rng.random() < 0.01:
+            lines.append(f"Contact {rng.choice(KEYWORDS)} desk {i}: call 555-{i % 10000:04d}")
+        else:
+            lines.append(f"{rng.choice(filler)} ({i})")
+    return "\n".join(lines)
+
+
+def timed(func):
+    started = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - started
+
+
+def main():
+    line_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    text = build_text(line_count)
+    scraper = WebScraperService()
+
+    sections, elapsed = timed(lambda: scraper.find_text_sections(text, KEYWORDS))
+    print(f"find_text_sections     {elapsed * 1000:9.1f} ms  sections {len(sections)}")
+    _, elapsed = timed(lambda: scraper.extract_text_section(text, KEYWORDS))
+    print(f"extract_text_section   {elapsed * 1000:9.1f} ms")
+    legacy, elapsed = timed(lambda: legacy_extract_text_section(text, KEYWORDS))
+    print(f"legacy implementation  {elapsed * 1000:9.1f} ms  output lines {legacy.count(chr(10)) + 1}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark peak memory of the provider upload import, whole-file vs. streamed.
+
+Writes provider exports of increasing size to a temporary file and converts
+each one the old way (read, json.loads, map, json.dumps) and through the
+streaming upload route, reporting tracemalloc peaks and throughput.
+
+Usage:
+  python scripts/benchmark_upload_import.py [items ...]
+"""
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.routes.businesses import (  # noqa: E402
+    _build_import_response,
+    import_provider_businesses_upload,
+)
+from benchmark_provider_mapping import build  # noqa: E402
+
+
+class FileUpload:
+    def __init__(self, path):
+        self.filename = os.path.basename(path)
+        self._file = open(path, "rb")
+
+    async def read(self, size=-1):
+        return self._file.read(size)
+
+    def close(self):
+        self._file.close()
+
+
+def whole_file(path):
+    with open(path, "rb") as f:
+        payload = json.loads(f.read().decode("utf-8"))
+    response_payload = _build_import_response(payload, route_name="benchmark")
+    return len(json.dumps(response_payload.model_dump(), ensure_ascii=False, indent=2))
+
+
+def streamed(path):
+    async def run():
+        upload = FileUpload(path)
+        try:
+            response = await import_provider_businesses_upload(upload, pretty=False)
+            return sum([len(chunk) async for chunk in response.body_iterator])
+        finally:
+            upload.close()
+
+    return asyncio.run(run())
+
+
+def measure(fn, path):
+    tracemalloc.start()
+    started = time.perf_counter()
+    size = fn(path)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak, elapsed, size
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [2_000, 10_000, 40_000]
+    print(f"{'items':>8} {'file MB':>8} {'whole peak MB':>14} {'stream peak MB':>15} {'whole s':>8} {'stream s':>9}")
+    for count in sizes:
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+            json.dump(build(count), f)
+            path = f.name
+        try:
+            file_mb = os.path.getsize(path) / 1e6
+            whole_peak, whole_time, _ = measure(whole_file, path)
+            stream_peak, stream_time, _ = measure(streamed, path)
+        finally:
+            os.unlink(path)
+        print(f"{count:>8} {file_mb:>8.1f} {whole_peak / 1e6:>14.1f} {stream_peak / 1e6:>15.1f} "
+              f"{whole_time:>8.2f} {stream_time:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Unit Tests for auth token and user caching"""
+import pytest
+from types import SimpleNamespace
+from unittest.mock import patch
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.db.session import Base
+from app.db import models
+from app.utils import auth
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Session on a throwaway SQLite file with one user"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'auth.sqlite'}")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    session.add(models.User(google_sub="sub-1", email="a@acme.test", name="A", credits=5))
+    session.commit()
+    auth._user_id_cache.clear()
+    yield session
+    session.close()
+    auth._user_id_cache.clear()
+
+
+class TestAuthCache:
+    """Test suite for memoized token decoding and the user cache"""
+
+    def test_token_verified_once(self):
+        """A token's signature is only checked on first use"""
+        token = auth.create_access_token("sub-memo")
+        with patch("app.utils.auth.jwt.decode", wraps=auth.jwt.decode) as decode:
+            assert auth.decode_access_token(token) == "sub-memo"
+            assert auth.decode_access_token(token) == "sub-memo"
+        assert decode.call_count == 1
+
+    def test_user_cached_per_request_and_process(self, db):
+        """Users load once per request; only the id is cached across requests, so balances stay current"""
+        token = auth.create_access_token("sub-1")
+        request = SimpleNamespace(state=SimpleNamespace())
+
+        user = auth.get_optional_user(request, db=db, session_token=token, authorization=None)
+        with patch.object(auth, "load_user", side_effect=AssertionError("not memoized")):
+            assert auth.get_request_user(request, token, db).credits == 5
+        assert auth._user_id_cache.get("sub-1") == user.id
+
+        # Another worker changes the balance; nothing in this process is invalidated
+        other = sessionmaker(bind=db.get_bind())()
+        other.query(models.User).update({"credits": 9})
+        other.commit()
+        other.close()
+
+        with patch.object(auth, "SessionLocal", sessionmaker(bind=db.get_bind())):
+            assert auth.load_user("sub-1").credits == 9
+        db.expire_all()
+        assert auth.load_user("sub-1", db).credits == 9
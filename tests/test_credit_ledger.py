@@ -0,0 +1,99 @@
+"""Unit Tests for the credit ledger"""
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import create_engine, func
+from sqlalchemy.orm import sessionmaker
+from app.db.session import Base
+from app.db import models
+from app.services.credit_ledger import CreditHold, CreditLedger
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    """Session factory on a throwaway SQLite file with one user holding 5 credits"""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'ledger.sqlite'}",
+        connect_args={"check_same_thread": False, "timeout": 30},
+    )
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine)
+    db = factory()
+    db.add(models.User(id=1, google_sub="sub-1", email="a@acme.test", name="A", credits=5))
+    db.commit()
+    db.close()
+    return factory
+
+
+def _credits(session_factory):
+    db = session_factory()
+    try:
+        return db.get(models.User, 1).credits
+    finally:
+        db.close()
+
+
+class TestCreditLedger:
+    """Test suite for reserve / settle / refund"""
+
+    def test_concurrent_reserves_never_overdraw(self, session_factory):
+        """Only as many searches as there are credits get a reservation"""
+        ledger = CreditLedger(session_factory, settle_batch_size=100, settle_interval=60)
+
+        def reserve(_):
+            db = session_factory()
+            try:
+                return ledger.reserve(db, 1)
+            finally:
+                db.close()
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            reservations = list(pool.map(reserve, range(20)))
+
+        granted = [r for r in reservations if r]
+        assert len(granted) == 5
+        assert _credits(session_factory) == 0
+
+        for reservation_id in granted[:3]:
+            ledger.settle(reservation_id)
+        assert ledger.flush() == 3
+
+        db = session_factory()
+        assert ledger.refund(db, granted[3]) is True
+        assert ledger.refund(db, granted[3]) is False
+        assert db.query(func.sum(models.CreditLedgerEntry.delta)).scalar() == -4
+        assert db.query(models.CreditReservation).filter_by(status="settled").count() == 3
+        db.close()
+        assert _credits(session_factory) == 1
+
+    def test_partial_batch_flushed_by_timer(self, session_factory):
+        """Settlements are written after settle_interval without another settle() or flush()"""
+        import time
+
+        ledger = CreditLedger(session_factory, settle_batch_size=100, settle_interval=0.05)
+        db = session_factory()
+        ledger.settle(ledger.reserve(db, 1))
+
+        deadline = time.monotonic() + 5
+        while db.query(models.CreditReservation).filter_by(status="settled").count() == 0:
+            assert time.monotonic() < deadline, "settlement was not flushed"
+            time.sleep(0.02)
+        db.close()
+        assert ledger._pending == [] and ledger._timer is None
+
+    def test_hold_refunds_unless_settled(self, session_factory):
+        """A hold released without settling gives the credit back"""
+        ledger = CreditLedger(session_factory, settle_batch_size=1)
+        db = session_factory()
+        user = db.get(models.User, 1)
+
+        failed = CreditHold(ledger, db, user)
+        assert failed.reserve() is True
+        failed.release()
+        assert _credits(session_factory) == 5
+
+        succeeded = CreditHold(ledger, db, db.get(models.User, 1))
+        succeeded.reserve()
+        succeeded.settle()
+        succeeded.release()
+        db.close()
+        assert _credits(session_factory) == 4
@@ -0,0 +1,163 @@
+"""Unit Tests for the local CRM contact mirror"""
+import pytest
+from datetime import datetime
+from unittest.mock import Mock
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.db.session import Base
+from app.db import models  # noqa: F401
+from app.services.crm_mirror_service import CrmMirrorService
+
+
+@pytest.fixture
+def db():
+    """In-memory database session"""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def _hubspot_contact(contact_id, email, updated, **props):
+    return {"id": contact_id, "updatedAt": updated, "properties": {"email": email, **props}}
+
+
+class TestCrmMirror:
+    """Test suite for CRM mirror sync and lookups"""
+
+    def test_full_then_incremental_sync(self, db):
+        """First sync pages the list API, later syncs only ask for changes"""
+        service = Mock()
+        service.get_contacts.side_effect = [
+            {"success": True, "data": {
+                "results": [_hubspot_contact("1", "Ann@Acme.test", "2024-01-01T00:00:00Z")],
+                "paging": {"next": {"after": "1"}},
+            }},
+            {"success": True, "data": {
+                "results": [_hubspot_contact("2", "bob@gmail.com", "2024-02-01T00:00:00Z", phone="+1 555 010 2030")],
+            }},
+        ]
+        service.get_contacts_modified_since.return_value = {"success": True, "data": {
+            "results": [_hubspot_contact("1", "ann@acme.test", "2024-03-01T00:00:00Z", firstname="Ann")],
+        }}
+        mirror = CrmMirrorService(db)
+
+        first = mirror.sync("hubspot", service)
+        second = mirror.sync("hubspot", service)
+
+        assert first["synced"] == 2 and first["mode"] == "full"
+        assert second["mode"] == "incremental" and second["contacts"] == 2
+        assert service.get_contacts_modified_since.call_args.args[0] == datetime(2024, 2, 1)
+        assert db.query(models.CrmContact).filter_by(external_id="1").one().firstname == "Ann"
+
+    def test_search_window_that_cannot_advance_fails(self, db, monkeypatch):
+        """A full search window of contacts sharing one timestamp stops the sync instead of looping"""
+        monkeypatch.setattr("app.services.crm_mirror_service._HUBSPOT_SEARCH_WINDOW", 2)
+        db.add(models.CrmSyncState(provider="hubspot", modified_cursor=datetime(2024, 1, 1), contacts=0))
+        db.commit()
+        service = Mock()
+        service.get_contacts_modified_since.return_value = {"success": True, "data": {
+            "results": [_hubspot_contact(str(i), f"c{i}@acme.test", "2024-01-01T00:00:00Z") for i in range(2)],
+            "paging": {"next": {"after": "2"}},
+        }}
+
+        result = CrmMirrorService(db).sync("hubspot", service)
+
+        assert result["success"] is False and "full sync" in result["error"]
+        assert service.get_contacts_modified_since.call_count == 1
+
+    def test_partition_new_matches_email_phone_and_domain(self, db):
+        """Existing contacts are found by email, phone or company domain, not free-mail domains"""
+        mirror = CrmMirrorService(db)
+        mirror._upsert([
+            mirror._to_row("hubspot", _hubspot_contact("1", "ann@acme.test", None), datetime.utcnow()),
+            mirror._to_row("hubspot", _hubspot_contact("2", "bob@gmail.com", None, phone="555-010-2030"), datetime.utcnow()),
+        ])
+
+        new, existing = mirror.partition_new("hubspot", [
+            {"email": "ANN@acme.test"},
+            {"email": "x@other.test", "phone": "+1 (555) 010-2030"},
+            {"email": "sales@other.test", "website": "https://www.acme.test"},
+            {"email": "carol@gmail.com"},
+        ])
+
+        assert [match["matched_on"] for match in existing] == ["email", "phone", "domain"]
+        assert new == [{"email": "carol@gmail.com"}]
+
+    def test_placeholder_emails_do_not_match_by_domain(self, db):
+        """Synthetic lead emails share one domain, which must not make every website-less lead a duplicate"""
+        from app.utils.crm_mapping import placeholder_email
+
+        mirror = CrmMirrorService(db)
+        mirror._upsert([
+            mirror._to_row("hubspot", _hubspot_contact("1", placeholder_email("Joe's Pizza", "ChIJjoe"), None), datetime.utcnow()),
+        ])
+        lead = {"email": placeholder_email("Laundromat", "ChIJlaundry")}
+
+        new, existing = mirror.partition_new("hubspot", [lead])
+
+        assert new == [lead] and existing == []
+
+    def test_zoho_mirror_includes_pushed_leads(self, db):
+        """Zoho Leads, which pushes write, are mirrored along with Contacts"""
+        service = Mock()
+        modules = {
+            "Leads": [{"id": "1", "Email": "lead@acme.test", "Company": "Acme", "Modified_Time": "2024-01-02T00:00:00+00:00"}],
+            "Contacts": [{"id": "2", "Email": "ann@other.test", "Account_Name": {"name": "Other"}}],
+        }
+        service.get_contacts.side_effect = lambda module, **kwargs: {
+            "success": True, "data": {"data": modules[module], "info": {"more_records": False}},
+        }
+
+        result = CrmMirrorService(db).sync("zoho", service)
+        new, existing = CrmMirrorService(db).partition_new("zoho", [{"email": "lead@acme.test"}])
+
+        assert result["synced"] == 2 and new == []
+        assert {call.kwargs["module"] for call in service.get_contacts.call_args_list} == {"Leads", "Contacts"}
+        assert {c.company for c in db.query(models.CrmContact)} == {"Acme", "Other"}
+
+    def test_search_from_mirror(self, db):
+        """Mirror search pages with an offset cursor"""
+        mirror = CrmMirrorService(db)
+        mirror._upsert([
+            mirror._to_row("zoho", {"id": str(i), "Email": f"p{i}@acme.test", "Last_Name": "Smith"}, datetime.utcnow())
+            for i in range(3)
+        ])
+
+        page = mirror.search("zoho", "smi", limit=2)
+
+        assert page["total"] == 3
+        assert len(page["contacts"]) == 2 and page["next_after"] == "2"
+        assert mirror.search("zoho", "acme.test")["total"] == 3
+
+    def test_search_filters_without_query(self, db):
+        """Email, domain and company filters work alone and are ANDed with the query"""
+        import asyncio
+        from fastapi import HTTPException
+        from app.routes.hubspot import search_contacts
+
+        mirror = CrmMirrorService(db)
+        mirror._upsert([
+            mirror._to_row("hubspot", _hubspot_contact("1", "ann@acme.test", "2024-01-01T00:00:00Z", company="Acme", lastname="Lee"), datetime.utcnow()),
+            mirror._to_row("hubspot", _hubspot_contact("2", "bob@acme.test", "2024-01-01T00:00:00Z", company="Acme Labs", lastname="Lee"), datetime.utcnow()),
+            mirror._to_row("hubspot", _hubspot_contact("3", "cy@gmail.com", "2024-01-01T00:00:00Z", company="acme", lastname="Ray"), datetime.utcnow()),
+        ])
+        db.commit()
+
+        def search(**kwargs):
+            return asyncio.run(search_contacts(**{
+                "query": None, "limit": 10, "after": None, "email": None, "domain": None,
+                "company": None, "source": "mirror", "service": None, "db": db, **kwargs,
+            }))
+
+        assert search(company="ACME")["total"] == 2
+        assert search(domain="gmail.com")["contacts"][0]["id"] == "3"
+        assert search(query="lee", company="Acme")["total"] == 1
+        assert search(email="Bob@acme.test", domain="acme.test")["total"] == 1
+        with pytest.raises(HTTPException) as exc:
+            search()
+        assert exc.value.status_code == 422
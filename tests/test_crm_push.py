@@ -0,0 +1,266 @@
+"""Unit Tests for the CRM push pipeline"""
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.db.session import Base
+from app.db import models
+from app.services.crm_push_pipeline import AdaptiveConcurrencyLimiter, CrmPushPipeline
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    """Session factory on a throwaway SQLite file"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'push.sqlite'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine)
+
+
+class FakeHubSpot:
+    """Upserts everything except leads without an email"""
+
+    def __init__(self):
+        self.calls = []
+
+    def batch_upsert_leads(self, leads):
+        self.calls.append(len(leads))
+        outcomes = [
+            {"index": i, "success": bool(lead.get("email")), "contact_id": f"c-{lead.get('email')}",
+             "error": None if lead.get("email") else "Email is required for upsert"}
+            for i, lead in enumerate(leads)
+        ]
+        return {"success": all(o["success"] for o in outcomes), "outcomes": outcomes}
+
+
+def _wait(pipeline, job_id):
+    pipeline._running[job_id].join(timeout=10)
+    return pipeline.status(job_id)
+
+
+class TestCrmPushPipeline:
+    """Test suite for queued, checkpointed CRM pushes"""
+
+    def test_push_completes_in_provider_batches(self, session_factory):
+        """Leads are pushed in provider-sized batches and outcomes are checkpointed"""
+        service = FakeHubSpot()
+        pipeline = CrmPushPipeline(lambda provider: service, session_factory=session_factory, max_concurrency=3, queue_size=2)
+        leads = [{"email": f"lead{i}@acme.test"} for i in range(449)] + [{"email": None}]
+
+        job = pipeline.submit("hubspot", leads)
+        status = _wait(pipeline, job["job_id"])
+
+        assert sorted(service.calls) == [50, 100, 100, 100, 100]
+        assert status["status"] == "completed_with_errors"
+        assert (status["succeeded"], status["failed"], status["pending"]) == (449, 1, 0)
+        assert pipeline.failures(job["job_id"])[0]["error"] == "Email is required for upsert"
+
+    def test_resume_skips_checkpointed_items(self, session_factory):
+        """A resumed job only sends items that were not finished before the restart"""
+        service = FakeHubSpot()
+        pipeline = CrmPushPipeline(lambda provider: service, session_factory=session_factory, max_concurrency=2)
+        job = pipeline.submit("hubspot", [{"email": f"lead{i}@acme.test"} for i in range(250)], start=False)
+
+        # Simulate a crash after the first 120 items were pushed
+        db = session_factory()
+        db.query(models.CrmPushItem).filter(models.CrmPushItem.seq < 120).update({"status": "done"})
+        db.query(models.CrmPushJob).update({"status": "running", "succeeded": 120})
+        db.commit()
+        db.close()
+
+        restarted = CrmPushPipeline(lambda provider: service, session_factory=session_factory, max_concurrency=2)
+        assert restarted.resume_unfinished() == [job["job_id"]]
+        status = _wait(restarted, job["job_id"])
+
+        assert sum(service.calls) == 130
+        assert status["status"] == "completed" and status["succeeded"] == 250
+
+    def test_restart_claims_jobs_once_and_upserts_in_flight_items(self, session_factory):
+        """Of several restarted workers only one resumes a job, and items in flight at the crash are upserted"""
+        from datetime import datetime, timedelta
+
+        class FakeSalesforce:
+            def __init__(self):
+                self.created, self.upserted = [], []
+
+            def _result(self, leads):
+                return {"success": True, "outcomes": [{"success": True, "contact_id": lead["email"]} for lead in leads]}
+
+            def batch_create_leads(self, leads):
+                self.created.extend(lead["email"] for lead in leads)
+                return self._result(leads)
+
+            def batch_upsert_leads(self, leads):
+                self.upserted.extend(lead["email"] for lead in leads)
+                return self._result(leads)
+
+        service = FakeSalesforce()
+        pipeline = CrmPushPipeline(lambda provider: service, session_factory=session_factory)
+        crashed = pipeline.submit("salesforce", [{"email": f"lead{i}@acme.test"} for i in range(300)], start=False)
+        live = pipeline.submit("salesforce", [{"email": "other@acme.test"}], start=False)
+
+        # The first 200 items were in flight when their worker died; the other job's owner is alive
+        db = session_factory()
+        db.query(models.CrmPushItem).filter(
+            models.CrmPushItem.job_id == crashed["job_id"], models.CrmPushItem.seq < 200
+        ).update({"status": "sending"})
+        db.query(models.CrmPushJob).filter(models.CrmPushJob.id == crashed["job_id"]).update(
+            {"status": "running", "owner": "dead", "updated_at": datetime.utcnow() - timedelta(hours=1)}
+        )
+        db.query(models.CrmPushJob).filter(models.CrmPushJob.id == live["job_id"]).update(
+            {"status": "running", "owner": "alive", "updated_at": datetime.utcnow()}
+        )
+        db.commit()
+        db.close()
+
+        workers = [CrmPushPipeline(lambda provider: service, session_factory=session_factory) for _ in range(3)]
+        resumed = [worker.resume_unfinished() for worker in workers]
+
+        assert sorted(resumed) == [[], [], [crashed["job_id"]]]
+        status = _wait(workers[resumed.index([crashed["job_id"]])], crashed["job_id"])
+        assert len(service.upserted) == 200 and len(service.created) == 100
+        assert status["status"] == "completed" and status["succeeded"] == 300
+        assert pipeline.status(live["job_id"])["status"] == "running"
+
+    def test_limiter_backs_off_and_recovers(self):
+        """Concurrency halves on throttling and grows back after clean calls"""
+        limiter = AdaptiveConcurrencyLimiter(initial=4, maximum=8)
+
+        limiter.acquire()
+        limiter.release(congested=True)
+        assert limiter.limit == 2
+
+        for _ in range(2):
+            limiter.acquire()
+            limiter.release(congested=False)
+        assert limiter.limit == 3
+
+
+class TestSearchExport:
+    """Test suite for mapping saved search results to leads"""
+
+    def test_business_to_lead(self):
+        """Business results map to valid leads with distinct placeholder emails per place"""
+        from app.schemas.hubspot import HubSpotLeadCreate
+        from app.utils.crm_mapping import business_to_lead
+
+        business = {
+            "name": "Joe's Pizza & Co",
+            "place_id": "ChIJabc123XYZ",
+            "formatted_address": "1 Main St",
+            "international_phone_number": "+1 555 010 2030",
+            "types": ["restaurant"],
+            "user_ratings_total": 40,
+        }
+        lead = business_to_lead(business)
+        other_branch = business_to_lead({**business, "place_id": "ChIJdef456UVW"})
+
+        assert HubSpotLeadCreate(**lead).company == "Joe's Pizza & Co"
+        assert lead["business_type"] == "restaurant" and lead["review_count"] == 40
+        assert lead["email"] != other_branch["email"]
+
+    def test_search_run_results_are_stored(self, session_factory):
+        """Saved runs upsert businesses by place_id and read back in order"""
+        from app.services.lead_store import LeadStore
+
+        db = session_factory()
+        store = LeadStore(db)
+        first = [
+            {"name": "Acme Plumbing", "place_id": "p1", "website": "https://www.acme.test/x",
+             "international_phone_number": "+1 555 010 2030", "latitude": 40.71, "longitude": -74.0},
+            {"name": "Cid Only Cafe", "cid": "987", "latitude": 40.72, "longitude": -74.01},
+            {"name": "No Identity", "latitude": 1.0, "longitude": 1.0},
+        ]
+        db.add(models.SearchRun(id="run-1", route="/search", query="{}", total_results=3, results="[]"))
+        db.flush()
+        assert store.save_search_run("run-1", first) == 2
+        db.commit()
+
+        refreshed = store.upsert_businesses([{"name": "Acme Plumbing & Heating", "place_id": "p1", "latitude": 40.71, "longitude": -74.0}])
+        db.commit()
+
+        assert store.count() == 2
+        assert refreshed[0] == store.ids_for(["p1"])["p1"]
+        assert [b["name"] for b in store.run_results("run-1")] == ["Acme Plumbing & Heating", "Cid Only Cafe"]
+        assert store.find(domain="acme.test")[0]["place_id"] == "p1"
+        assert store.find(phone="555-010-2030")[0]["place_id"] == "p1"
+        assert [b["name"] for b in store.nearby(40.71, -74.0, radius_km=0.5)] == ["Acme Plumbing & Heating"]
+        db.close()
+
+    def test_search_runs_are_stored_once_and_private(self, session_factory):
+        """Runs keep only unlinked results as JSON, anonymous searches are not saved and runs need their owner"""
+        import json
+        from fastapi import HTTPException
+        from app.routes.businesses import _get_search_run, _save_search_run
+        from app.schemas.business import BusinessResponse, SearchResultsResponse
+        from app.services.lead_store import LeadStore
+
+        db = session_factory()
+        owner = models.User(google_sub="sub-1", email="owner@acme.test", name="Owner", credits=0)
+        other = models.User(google_sub="sub-2", email="other@acme.test", name="Other", credits=0)
+        db.add_all([owner, other])
+        db.commit()
+
+        def payload():
+            results = [
+                BusinessResponse(name="Acme Plumbing", place_id="p1", latitude=40.71, longitude=-74.0),
+                BusinessResponse(name="No Identity", place_id="", latitude=1.0, longitude=1.0),
+            ]
+            return SearchResultsResponse(total_results=2, results=results, query={})
+
+        anonymous = payload()
+        _save_search_run(db, "/search", anonymous, None)
+        assert "search_id" not in anonymous.query
+        assert db.query(models.SearchRun).count() == 0
+
+        saved = payload()
+        _save_search_run(db, "/search", saved, owner)
+        run = db.get(models.SearchRun, saved.query["search_id"])
+
+        assert [r["name"] for r in json.loads(run.results)] == ["No Identity"]
+        assert [r["name"] for r in LeadStore(db).search_run_records(run)] == ["Acme Plumbing", "No Identity"]
+        assert _get_search_run(db, run.id, owner) is run
+        for user in (None, other):
+            with pytest.raises(HTTPException):
+                _get_search_run(db, run.id, user)
+        db.close()
+
+    def test_job_export_requires_owner(self, session_factory):
+        """Push jobs owned by a user cannot be re-exported, inspected or resumed by anyone else"""
+        import asyncio
+        from fastapi import HTTPException
+        from app.routes.crm import ExportRequest, export_to_crm, push_status, resume_push
+
+        db = session_factory()
+        owner = models.User(google_sub="sub-1", email="owner@acme.test", name="Owner", credits=0)
+        other = models.User(google_sub="sub-2", email="other@acme.test", name="Other", credits=0)
+        db.add_all([owner, other])
+        db.flush()
+        db.add(models.CrmPushJob(id="job-1", provider="hubspot", user_id=owner.id, status="completed"))
+        db.commit()
+
+        for user in (None, other):
+            for call in (
+                export_to_crm("hubspot", ExportRequest(job_id="job-1"), user=user, db=db),
+                push_status("job-1", failures=10, user=user, db=db),
+                resume_push("job-1", retry_failed=True, user=user, db=db),
+            ):
+                with pytest.raises(HTTPException) as exc:
+                    asyncio.run(call)
+                assert exc.value.status_code == 404
+        db.close()
+
+    def test_contacts_only_stored_from_business_website(self, session_factory):
+        """Contacts scraped from another site are neither stored on nor served for a business"""
+        from app.services.lead_store import LeadStore
+
+        db = session_factory()
+        store = LeadStore(db)
+        store.upsert_businesses([{"name": "Acme Plumbing", "place_id": "p1", "website": "https://www.acme.test/"}])
+        contacts = [{"name": "Ann", "email": "ann@acme.test"}]
+
+        assert store.save_contacts("p1", "evil.test", contacts, 0.9) == 0
+        assert store.save_contacts("p1", "acme.test", contacts, 0.9) == 1
+        db.commit()
+
+        assert store.get_contacts("p1", "evil.test") is None
+        assert store.get_contacts("p1", "acme.test")["contacts"][0]["email"] == "ann@acme.test"
+        db.close()
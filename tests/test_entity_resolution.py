@@ -0,0 +1,76 @@
+"""Unit Tests for cross-source entity resolution"""
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.db.session import Base
+from app.db import models
+from app.services.entity_resolution import EntityResolver
+from app.services.lead_store import LeadStore
+
+
+GOOGLE = {"name": "Joe's Pizza", "place_id": "ChIJjoe", "latitude": 40.7306, "longitude": -73.9866,
+          "formatted_phone_number": "(212) 555-0100", "types": ["restaurant"], "rating": 4.5}
+PROVIDER = {"name": "Joes Pizza LLC", "place_id": "", "cid": "1234", "latitude": 40.7307, "longitude": -73.9867,
+            "international_phone_number": "+1 212-555-0100", "website": "https://joespizza.test",
+            "types": ["pizza_restaurant"], "rating": 4.4}
+NEIGHBOUR = {"name": "Village Laundromat", "place_id": "ChIJlaundry", "latitude": 40.7308, "longitude": -73.9865}
+
+
+class TestEntityResolver:
+    """Test suite for blocking, clustering and merging"""
+
+    def test_cross_source_records_merge_by_precedence(self):
+        """The same shop from Google and the provider becomes one record with Google's values first"""
+        resolver = EntityResolver()
+        merged = resolver.resolve([PROVIDER, NEIGHBOUR, GOOGLE], ["provider", "google_places", "google_places"])
+
+        assert len(merged) == 2
+        joes = merged[0]
+        assert joes["name"] == "Joe's Pizza" and joes["rating"] == 4.5
+        assert joes["website"] == "https://joespizza.test"
+        assert joes["types"] == ["restaurant", "pizza_restaurant"]
+        assert resolver.stats["comparisons"] < 3 * 2
+
+    def test_record_without_place_id_does_not_bridge_places(self):
+        """Two branches sharing a phone stay apart even when a provider record matches both"""
+        branches = [
+            {"name": "Burger Co", "place_id": place_id, "formatted_phone_number": "(212) 555-0199",
+             "latitude": 40.70 + offset, "longitude": -74.0}
+            for place_id, offset in (("p1", 0.0), ("p2", 0.2))
+        ]
+        provider = {"name": "Burger Co", "place_id": "", "cid": "77", "international_phone_number": "+1 212-555-0199",
+                    "latitude": 40.70, "longitude": -74.0}
+
+        resolver = EntityResolver()
+        merged = resolver.resolve([provider, *branches], ["provider", "google_places", "google_places"])
+
+        assert sorted(record["place_id"] for record in merged) == ["p1", "p2"]
+
+    def test_oversized_blocks_are_split(self):
+        """A shared domain across a chain does not compare every branch with every other"""
+        branches = [
+            {"name": f"Burger Co {i}", "place_id": f"p{i}", "website": "https://burger.test",
+             "latitude": 40 + i * 0.5, "longitude": -74.0}
+            for i in range(30)
+        ]
+        resolver = EntityResolver(max_block_size=10)
+        assert len(resolver.resolve(branches, "google_places")) == 30
+        assert resolver.stats["comparisons"] == 0
+
+    def test_link_stored_assigns_entities(self, tmp_path):
+        """Stored rows from different sources share an entity id and export once"""
+        engine = create_engine(f"sqlite:///{tmp_path / 'er.sqlite'}")
+        Base.metadata.create_all(bind=engine)
+        db = sessionmaker(bind=engine)()
+        store = LeadStore(db)
+        for run_id, results, source in (("r1", [GOOGLE, NEIGHBOUR], "google_places"), ("r2", [PROVIDER], "provider")):
+            db.add(models.SearchRun(id=run_id, route="/search", query="{}", total_results=len(results), results="[]"))
+            db.flush()
+            store.save_search_run(run_id, results, source)
+            db.commit()
+
+        entities = {b.source_key: b.entity_id for b in db.query(models.Business)}
+        assert entities["ChIJjoe"] == entities["cid:1234"] != entities["ChIJlaundry"]
+        exported = store.run_results("r2")
+        assert len(exported) == 1 and exported[0]["name"] == "Joe's Pizza"
+        assert exported[0]["website"] == "https://joespizza.test"
+        db.close()
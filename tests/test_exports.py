@@ -0,0 +1,71 @@
+"""Unit Tests for CSV / Parquet / XLSX result exports"""
+import io
+import pytest
+from app.services.export_service import ResultExporter, enrichment_rows, export_columns
+from app.utils.helpers import normalize_results_consistency
+
+
+RESULTS = [
+    {"name": "Joe's Pizza", "place_id": "p1", "rating": 4.5, "user_ratings_total": 120,
+     "types": ["restaurant", "pizza"], "opening_hours": {"open_now": True}, "temporarily_closed": False},
+    {"name": "Laundromat, Inc", "place_id": "p2", "rating": 4, "website": "https://laundry.test",
+     "user_ratings_total": None},
+    {"name": "Florist", "place_id": "p3", "types": [], "website": None},
+]
+
+
+class TestResultExporter:
+    """Test suite for chunked tabular exports"""
+
+    def test_columns_follow_normalize_results_consistency(self):
+        """Every field seen becomes a column; limited fields without data are dropped"""
+        normalized = normalize_results_consistency(RESULTS)
+        assert [name for name, _ in export_columns(RESULTS)] == list(normalized[0])
+
+        for fields in (["name", "website", "phone"], ["website", "name", "website"]):
+            limited = normalize_results_consistency(RESULTS, fields)
+            assert [name for name, _ in export_columns(RESULTS, fields)] == list(limited[0])
+        assert [name for name, _ in export_columns(RESULTS, ["name", "website", "phone"])] == ["name", "website"]
+
+    def test_csv_is_written_in_chunks(self):
+        """Chunks share one header and fixed columns; lists and dicts are flattened to text"""
+        pd = pytest.importorskip("pandas")
+        exporter = ResultExporter("csv", chunk_size=2)
+
+        chunks = list(exporter.stream(RESULTS * 3))
+        frame = pd.read_csv(io.BytesIO(b"".join(chunks)))
+
+        assert len(chunks) == 1 + 5
+        assert len(frame) == 9
+        assert frame.loc[0, "types"] == "restaurant; pizza"
+        assert frame.loc[0, "opening_hours"] == '{"open_now": true}'
+        assert frame.loc[1, "name"] == "Laundromat, Inc"
+        assert frame["user_ratings_total"].dropna().tolist() == [120, 120, 120]
+
+    @pytest.mark.parametrize("file_format", ["parquet", "xlsx"])
+    def test_binary_formats_round_trip(self, file_format):
+        """Parquet and XLSX exports read back with the same rows and columns"""
+        pd = pytest.importorskip("pandas")
+        pytest.importorskip("pyarrow" if file_format == "parquet" else "openpyxl")
+        exporter = ResultExporter(file_format, chunk_size=2)
+
+        data = b"".join(exporter.stream(RESULTS, ["name", "rating", "website"]))
+        reader = pd.read_parquet if file_format == "parquet" else pd.read_excel
+        frame = reader(io.BytesIO(data))
+
+        assert list(frame.columns) == ["name", "rating", "website"]
+        assert frame["name"].tolist() == ["Joe's Pizza", "Laundromat, Inc", "Florist"]
+        assert frame["rating"].tolist()[:2] == [4.5, 4.0]
+
+    def test_enrichment_rows_one_per_contact(self):
+        """Contacts become rows under their business; businesses without contacts keep one row"""
+        rows = enrichment_rows([
+            {"name": "Acme", "website": "https://acme.test", "status": "success", "confidence": 0.9,
+             "contacts": [{"name": "Ann", "email": "ann@acme.test"}, {"name": "Bob", "title": "CEO"}]},
+            {"name": "Empty", "website": "https://empty.test", "status": "no_contacts_found", "confidence": 0.0,
+             "contacts": []},
+        ])
+
+        assert [row["business_name"] for row in rows] == ["Acme", "Acme", "Empty"]
+        assert rows[0]["contact_email"] == "ann@acme.test" and rows[1]["contact_title"] == "CEO"
+        assert "contact_name" not in rows[2]
@@ -1,5 +1,6 @@
 """Unit Tests for HubSpot Service"""
 import pytest
+import requests
 from unittest.mock import Mock, patch, MagicMock
 from app.services.hubspot_service import HubSpotService
 
@@ -12,7 +13,7 @@ class TestHubSpotService:
         """Create a HubSpot service instance for testing"""
         return HubSpotService(access_token="test-token")
     
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_verify_connection_success(self, mock_get, hubspot_service):
         """Test successful HubSpot connection verification"""
         mock_response = Mock()
@@ -24,7 +25,7 @@ class TestHubSpotService:
         assert result.get("connected") == True
         assert "message" in result
     
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_verify_connection_failure(self, mock_get, hubspot_service):
         """Test failed HubSpot connection verification"""
         mock_response = Mock()
@@ -36,7 +37,7 @@ class TestHubSpotService:
         
         assert result.get("connected") == False
     
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def test_create_lead_success(self, mock_post, hubspot_service):
         """Test successful lead creation"""
         mock_response = Mock()
@@ -57,15 +58,15 @@ class TestHubSpotService:
         assert result.get("success") == True
         assert result.get("contact_id") == "contact-123"
     
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def test_create_batch_leads(self, mock_post, hubspot_service):
         """Test batch lead creation"""
         mock_response = Mock()
         mock_response.status_code = 200
         mock_response.json.return_value = {
             "results": [
-                {"id": "contact-1"},
-                {"id": "contact-2"}
+                {"id": "contact-1", "properties": {"email": "test1@example.com"}},
+                {"id": "contact-2", "properties": {"email": "test2@example.com"}}
             ]
         }
         mock_post.return_value = mock_response
@@ -79,7 +80,137 @@ class TestHubSpotService:
         
         assert result.get("success") == True
         assert result.get("total") == 2
-    
+
+    @patch('requests.Session.post')
+    def test_batch_leads_are_chunked(self, mock_post, hubspot_service):
+        """Test large batches are split into 100-lead requests"""
+        def respond(url, json=None, **kwargs):
+            response = Mock()
+            response.status_code = 201
+            response.json.return_value = {
+                "results": [
+                    {"id": f"id-{item['properties'][0]['value']}", "properties": {"email": item["properties"][0]["value"]}}
+                    for item in reversed(json["inputs"])
+                ]
+            }
+            return response
+        mock_post.side_effect = respond
+
+        leads = [{"email": f"lead{i}@example.com"} for i in range(250)]
+        result = hubspot_service.batch_create_leads(leads)
+
+        assert mock_post.call_count == 3
+        assert max(len(call.kwargs["json"]["inputs"]) for call in mock_post.call_args_list) == 100
+        assert result.get("created") == 250
+        assert result["outcomes"][7]["contact_id"] == "id-lead7@example.com"
+
+    @patch('time.sleep')
+    @patch('requests.Session.post')
+    def test_batch_leads_retry_after_429(self, mock_post, mock_sleep):
+        """Test rate-limited chunks are retried after Retry-After"""
+        service = HubSpotService(access_token="retry-token")
+        limited = Mock(status_code=429, headers={"Retry-After": "0"})
+        ok = Mock(status_code=201)
+        ok.json.return_value = {"results": [{"id": "contact-1", "properties": {"email": "test1@example.com"}}]}
+        mock_post.side_effect = [limited, ok]
+
+        result = service.batch_create_leads([{"email": "test1@example.com"}])
+
+        assert result.get("success") == True
+        assert result.get("retried_chunks") == 1
+        assert result["outcomes"][0]["contact_id"] == "contact-1"
+
+    @patch('time.sleep')
+    @patch('requests.Session.post')
+    def test_batch_create_not_resent_after_timeout_or_5xx(self, mock_post, mock_sleep):
+        """Test creates are only resent when the request never reached HubSpot"""
+        service = HubSpotService(access_token="no-resend-token")
+        ok = Mock(status_code=201)
+        ok.json.return_value = {"results": [{"id": "contact-1", "properties": {"email": "test1@example.com"}}]}
+
+        mock_post.side_effect = [requests.exceptions.ReadTimeout("read timed out"), ok]
+        timed_out = service.batch_create_leads([{"email": "test1@example.com"}])
+        assert mock_post.call_count == 1 and timed_out["failed"] == 1
+
+        mock_post.reset_mock()
+        mock_post.side_effect = [Mock(status_code=503), ok]
+        unavailable = service.batch_create_leads([{"email": "test1@example.com"}])
+        assert mock_post.call_count == 1 and unavailable["error"] == "HubSpot API error: 503"
+
+        mock_post.reset_mock()
+        mock_post.side_effect = [requests.exceptions.ConnectTimeout("connect timed out"), ok]
+        reconnected = service.batch_create_leads([{"email": "test1@example.com"}])
+        assert mock_post.call_count == 2 and reconnected["created"] == 1
+
+    @patch('requests.Session.post')
+    def test_partial_batch_results_match_only_by_email(self, mock_post, hubspot_service):
+        """Test a lead without a result is failed rather than given another result's id"""
+        mock_post.return_value = Mock(status_code=207, json=Mock(return_value={
+            "results": [
+                {"id": "contact-2", "properties": {"email": "b@example.com"}},
+                {"id": "contact-9", "properties": {"email": "other@example.com"}},
+            ],
+            "errors": [{"message": "Property values were not valid"}],
+        }))
+
+        result = hubspot_service.batch_create_leads([{"email": "a@example.com"}, {"email": "b@example.com"}])
+
+        first, second = result["outcomes"]
+        assert first["success"] is False and "contact_id" not in first
+        assert "could not be matched" in first["error"]
+        assert second["success"] is True and second["contact_id"] == "contact-2"
+        assert result["created"] == 1 and result["failed"] == 1
+
+    @patch('requests.Session.post')
+    def test_batch_upsert_dedupes_by_email(self, mock_post, hubspot_service):
+        """Test duplicate emails are merged and created/updated are counted"""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {
+            "results": [
+                {"id": "contact-1", "new": True, "properties": {"email": "a@example.com"}},
+                {"id": "contact-2", "new": False, "properties": {"email": "b@example.com"}}
+            ]
+        }
+        mock_post.return_value = mock_response
+
+        leads = [
+            {"email": "a@example.com", "firstname": "Ann"},
+            {"email": "b@example.com"},
+            {"email": "A@example.com", "phone": "555"}
+        ]
+        result = hubspot_service.batch_upsert_leads(leads)
+
+        inputs = mock_post.call_args.kwargs["json"]["inputs"]
+        assert len(inputs) == 2
+        assert {"name": "phone", "value": "555"} in inputs[0]["properties"]
+        assert result.get("created") == 1
+        assert result.get("updated") == 1
+        assert result["outcomes"][2]["contact_id"] == "contact-1"
+
+    @patch('requests.Session.post')
+    def test_search_contacts_uses_search_api(self, mock_post):
+        """Test search runs server side, pages with a cursor and is cached"""
+        service = HubSpotService(access_token="search-token")
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {
+            "total": 120000,
+            "results": [{"id": "1", "properties": {"email": "jane@acme.test"}}],
+            "paging": {"next": {"after": "10"}}
+        }
+        mock_post.return_value = mock_response
+
+        first = service.search_contacts("jane@ACME.test", limit=10)
+        second = service.search_contacts("jane@ACME.test", limit=10)
+
+        body = mock_post.call_args.kwargs["json"]
+        assert mock_post.call_args.args[0].endswith("/crm/v3/objects/contacts/search")
+        assert body["filterGroups"][0]["filters"][0]["value"] == "jane@acme.test"
+        assert first["next_after"] == "10" and first["total"] == 120000
+        assert second["cached"] is True
+        assert mock_post.call_count == 1
+
     def test_map_to_hubspot_properties(self, hubspot_service):
         """Test mapping lead data to HubSpot properties"""
         lead_data = {
@@ -0,0 +1,124 @@
+"""Unit Tests for planned provider-item mapping and streamed provider imports"""
+import asyncio
+import io
+import json
+import pytest
+from fastapi import HTTPException
+from pydantic import ValidationError
+from app.config import settings
+from app.routes.businesses import _build_import_response, import_provider_businesses_upload
+from app.services.provider_mapping import ProviderMapper
+
+
+ITEMS = [
+    {"title": "Joe's Pizza", "placeId": "ChIJjoe", "categoryName": "Pizza", "location": {"lat": 40.73, "lng": -73.98},
+     "address": "1 Main St", "totalScore": 4, "reviewsCount": 10, "imageUrls": ["a.jpg", {"url": "b.jpg"}],
+     "openingHours": [{"day": "Monday", "hours": "9-5"}], "phone": "(212) 555-0100", "permanentlyClosed": True,
+     "postalCode": ""},
+    {"name": "Laundromat", "place_id": "ChIJlaundry", "location": "2 Side St", "types": "laundry",
+     "openingHours": {"openNow": True}, "stars": 4.5, "zip": "", "cid": "9", "imageUrl": "c.jpg"},
+    {"businessName": "Plumber", "latitude": "40.5", "longitude": -74, "price": "$$", "website": "",
+     "domain": "plumber.test", "additionalInfo": {"Payments": ["Cash"]}},
+    {},
+]
+
+
+class TestProviderMapper:
+    """Test suite for field-resolution plans"""
+
+    def test_matches_validated_mapping(self):
+        """Trusted construction produces exactly what validating the resolved fields produces, across schemas"""
+        mapper = ProviderMapper()
+        mapped = mapper.map_items(ITEMS + ITEMS)
+        validated = ProviderMapper(validate=True).map_items(ITEMS + ITEMS)
+
+        for result, expected in zip(mapped, validated):
+            assert result.model_dump_json() == expected.model_dump_json()
+            assert result.model_fields_set == expected.model_fields_set
+        assert len(mapper._plans) == len(ITEMS)
+
+        joe, laundry, plumber, empty = mapped[:4]
+        assert joe.name == "Joe's Pizza" and joe.rating == 4.0 and isinstance(joe.rating, float)
+        assert joe.photos == ["a.jpg", "b.jpg"] and joe.business_status == "CLOSED_PERMANENTLY"
+        assert laundry.formatted_address == "2 Side St" and laundry.types == ["laundry"]
+        assert plumber.website == "plumber.test" and plumber.latitude == 40.5
+        assert empty.name == "" and empty.business_status == "OPERATIONAL"
+
+    def test_untrusted_values_are_validated(self):
+        """Values of the wrong type go through validation: coerced when possible, rejected otherwise"""
+        mapper = ProviderMapper()
+
+        assert mapper.map_item({"title": "Cafe", "reviewsCount": "12"}).user_ratings_total == 12
+        with pytest.raises(ValidationError):
+            mapper.map_item({"title": "Cafe", "price": 2})
+
+
+class _Upload:
+    """Minimal UploadFile stand-in that hands out small chunks"""
+
+    def __init__(self, content: bytes, filename: str = "export.json", chunk: int = 5):
+        self.filename = filename
+        self._stream = io.BytesIO(content)
+        self._chunk = chunk
+
+    async def read(self, size: int = -1) -> bytes:
+        return self._stream.read(min(size, self._chunk))
+
+
+def _upload(payload, pretty: bool = False) -> dict:
+    async def run():
+        upload = _Upload(json.dumps(payload, ensure_ascii=False).encode())
+        response = await import_provider_businesses_upload(upload, pretty=pretty)
+        return b"".join([chunk async for chunk in response.body_iterator])
+
+    return json.loads(asyncio.run(run()))
+
+
+class TestStreamingUpload:
+    """Test suite for the streamed /search/business/import/upload"""
+
+    def test_streamed_response_matches_import(self, monkeypatch):
+        """Batches streamed while parsing add up to the response of the JSON-body import"""
+        monkeypatch.setattr(settings, "IMPORT_STREAM_BATCH_SIZE", 3)
+        items = [
+            {**item, "placeId": f"ChIJ{i}", "title": f"Café {i}", "lat": 40 + i, "lng": -73 - i, "domain": f"cafe{i}.test",
+             "cid": str(i)}
+            for i, item in enumerate(ITEMS * 3)
+        ]
+        for payload in (items, {"items": items, "searchString": "pizza"}):
+            expected = _build_import_response(payload, route_name="test").model_dump()
+            assert _upload(payload) == expected
+            assert _upload(payload, pretty=True) == expected
+
+    def test_errors_before_streaming(self):
+        """Provider errors and malformed files are rejected before the download starts"""
+        empty = _upload([{"error": "no_search_results", "errorDescription": "none"}])
+        assert empty["total_results"] == 0 and empty["results"] == []
+
+        for payload in ([{"error": "rate_limited", "errorDescription": "slow down"}], [1, 2], {"items": {}}):
+            with pytest.raises(HTTPException) as exc:
+                _upload(payload)
+            assert exc.value.status_code == 400
+
+    def test_malformed_element_fails_without_buffering(self):
+        """A broken element is reported at once instead of reading the rest of the upload"""
+        from app.utils.json_stream import JsonArrayReader
+
+        good = json.dumps({"title": "Cafe", "note": "x" * 200})
+        content = ("[" + good + ', {"title": "Broken" "x": 1}, ' + ", ".join([good] * 5000) + "]").encode()
+        upload = _Upload(content, chunk=1024)
+
+        async def run():
+            return [item async for item in JsonArrayReader(upload.read, chunk_size=1024).items()]
+
+        with pytest.raises(ValueError):
+            asyncio.run(run())
+        assert upload._stream.tell() < 10_000
+
+        # Values split across chunks, literals and escapes included, still parse
+        split = _Upload(json.dumps([{"a": True, "b": None, "c": "é\\u00e9", "d": -1.5e3}] * 50).encode(), chunk=3)
+
+        async def read_split():
+            return [item async for item in JsonArrayReader(split.read, chunk_size=3).items()]
+
+        assert asyncio.run(read_split()) == [{"a": True, "b": None, "c": "é\\u00e9", "d": -1.5e3}] * 50
@@ -0,0 +1,45 @@
+"""Unit Tests for the anonymous rate limiter counter stores"""
+from concurrent.futures import ThreadPoolExecutor
+from app.utils.rate_limit_store import MemoryCounterStore, SqliteCounterStore
+
+
+class TestCounterStores:
+    """Test suite for rate limit counter backends"""
+
+    def test_sqlite_hit_is_atomic(self, tmp_path):
+        """Concurrent hits never push a counter past the limit"""
+        store = SqliteCounterStore(str(tmp_path / "limits.sqlite"))
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(lambda _: store.hit("1.2.3.4", "2024-01-01", 3), range(20)))
+
+        assert sorted(r for r in results if r is not None) == [1, 2, 3]
+        assert results.count(None) == 17
+        assert store.hit("1.2.3.4", "2024-01-02", 3) == 1
+
+    def test_memory_store_persists_write_behind(self, tmp_path):
+        """Memory counters flush to SQLite and seed a fresh process"""
+        persist = SqliteCounterStore(str(tmp_path / "limits.sqlite"))
+        store = MemoryCounterStore(persist, shards=4, flush_interval=0)
+
+        assert [store.hit("5.6.7.8", "2024-01-01", 3) for _ in range(2)] == [1, 2]
+        assert store.flush() == 1
+        assert persist.get("5.6.7.8", "2024-01-01") == 2
+
+        restarted = MemoryCounterStore(persist, flush_interval=0)
+        assert restarted.hit("5.6.7.8", "2024-01-01", 3) == 3
+        assert restarted.hit("5.6.7.8", "2024-01-01", 3) is None
+
+    def test_memory_backend_refused_with_several_workers(self, tmp_path, monkeypatch):
+        """Per-process counters are only used when a single worker serves the app"""
+        from functools import partial
+        from app.utils import rate_limit_store
+
+        monkeypatch.setattr(rate_limit_store, "SqliteCounterStore", partial(SqliteCounterStore, str(tmp_path / "l.sqlite")))
+        monkeypatch.setenv("WEB_CONCURRENCY", "4")
+        assert isinstance(rate_limit_store._build_store("memory"), SqliteCounterStore)
+
+        monkeypatch.setenv("WEB_CONCURRENCY", "1")
+        store = rate_limit_store._build_store("memory")
+        assert isinstance(store, MemoryCounterStore)
+        store.close()
@@ -0,0 +1,111 @@
+"""Unit Tests for Salesforce Service"""
+import pytest
+import requests
+from unittest.mock import Mock, patch
+from app.services.salesforce_service import SalesforceService
+
+
+class TestSalesforceBatch:
+    """Test suite for Salesforce batch ingestion"""
+
+    @pytest.fixture
+    def service(self):
+        """Create a Salesforce service instance for testing"""
+        return SalesforceService(access_token="test-token", instance_url="https://acme.my.salesforce.com")
+
+    @patch('requests.Session.post')
+    def test_collections_chunk_200(self, mock_post, service):
+        """Test batches are sent as 200-record sObject Collections with per-record results"""
+        def respond(url, json=None, **kwargs):
+            results = [{"id": f"003{i}", "success": True, "errors": []} for i in range(len(json["records"]))]
+            results[0] = {"id": None, "success": False, "errors": [{"statusCode": "DUPLICATES_DETECTED", "message": "dup"}]}
+            return Mock(status_code=200, json=Mock(return_value=results))
+        mock_post.side_effect = respond
+
+        leads = [{"email": f"lead{i}@acme.test", "firstname": "Lead"} for i in range(450)]
+        result = service.batch_create_leads(leads)
+
+        assert mock_post.call_count == 3
+        assert all(call.args[0].endswith("/composite/sobjects") for call in mock_post.call_args_list)
+        first_chunk = min(mock_post.call_args_list, key=lambda call: call.kwargs["json"]["records"][0]["Email"])
+        record = first_chunk.kwargs["json"]["records"][1]
+        assert record["Email"] == "lead1@acme.test" and record["attributes"] == {"type": "Contact"}
+        assert result["created"] == 447 and result["failed"] == 3
+        assert result["outcomes"][200]["error"] == "DUPLICATES_DETECTED: dup"
+
+    @patch('time.sleep')
+    @patch('requests.Session.post')
+    def test_collections_not_resent_after_timeout(self, mock_post, mock_sleep, service):
+        """Test a Collection that may have been applied is failed instead of resent"""
+        mock_post.side_effect = requests.exceptions.ReadTimeout("read timed out")
+        result = service.batch_create_leads([{"email": "a@acme.test"}])
+        assert mock_post.call_count == 1 and result["failed"] == 1
+
+        mock_post.reset_mock()
+        mock_post.side_effect = [Mock(status_code=503)]
+        result = service.batch_create_leads([{"email": "a@acme.test"}])
+        assert mock_post.call_count == 1 and result["error"] == "Salesforce API error: 503"
+
+    @patch('requests.Session.post')
+    def test_collections_short_response_fails_missing_records(self, mock_post, service):
+        """Test records without a result in the response are reported as failed"""
+        mock_post.return_value = Mock(status_code=200, json=Mock(return_value=[{"id": "003A", "success": True, "errors": []}]))
+
+        result = service.batch_create_leads([{"email": "a@acme.test"}, {"email": "b@acme.test"}])
+
+        assert result["created"] == 1 and result["failed"] == 1
+        assert result["outcomes"][1] == {
+            "index": 1, "email": "b@acme.test", "success": False, "contact_id": None,
+            "error": "No result returned for record",
+        }
+        assert result["error"] == "No result returned for record"
+
+    @patch('requests.Session.get')
+    @patch('requests.Session.patch')
+    @patch('requests.Session.post')
+    def test_upsert_updates_existing_contacts_by_email(self, mock_post, mock_patch, mock_get, service):
+        """Test leads whose Contact already exists are updated by Id and only the rest are created"""
+        mock_get.return_value = Mock(status_code=200, json=Mock(return_value={
+            "done": True, "records": [{"Id": "003A", "Email": "A@acme.test"}],
+        }))
+        mock_patch.side_effect = [
+            requests.exceptions.ReadTimeout("read timed out"),
+            Mock(status_code=200, json=Mock(return_value=[{"id": "003A", "success": True, "errors": []}])),
+        ]
+        mock_post.return_value = Mock(status_code=200, json=Mock(return_value=[{"id": "003B", "success": True, "errors": []}]))
+
+        with patch('time.sleep'):
+            result = service.batch_upsert_leads([{"email": "a@acme.test"}, {"email": "o'b@acme.test"}])
+
+        assert "Email IN ('a@acme.test', 'o\\'b@acme.test')" in mock_get.call_args.kwargs["params"]["q"]
+        assert mock_patch.call_count == 2
+        assert mock_patch.call_args.kwargs["json"]["records"][0]["Id"] == "003A"
+        assert [r["Email"] for r in mock_post.call_args.kwargs["json"]["records"]] == ["o'b@acme.test"]
+        assert [o["contact_id"] for o in result["outcomes"]] == ["003A", "003B"] and result["success"] is True
+
+    @patch('requests.Session.get')
+    @patch('requests.Session.patch')
+    @patch('requests.Session.put')
+    @patch('requests.Session.post')
+    def test_bulk_job_for_large_batches(self, mock_post, mock_put, mock_patch, mock_get, service):
+        """Test large batches become a Bulk API 2.0 job whose results can be polled"""
+        mock_post.return_value = Mock(status_code=200, json=Mock(return_value={"id": "750JOB"}))
+        mock_put.return_value = Mock(status_code=201)
+        mock_patch.return_value = Mock(status_code=200)
+
+        with patch("app.services.salesforce_service.settings.SALESFORCE_BULK_THRESHOLD", 3):
+            submitted = service.batch_create_leads([{"email": f"l{i}@acme.test", "lastname": "L"} for i in range(3)])
+
+        assert submitted["job_ids"] == ["750JOB"]
+        assert mock_put.call_args.kwargs["data"].decode().splitlines()[0] == "Email,LastName"
+
+        mock_get.side_effect = [
+            Mock(status_code=200, json=Mock(return_value={"state": "JobComplete", "numberRecordsProcessed": 3, "numberRecordsFailed": 1})),
+            Mock(status_code=200, text="sf__Id,sf__Created,Email,LastName\n003A,true,l0@acme.test,L\n003B,true,l1@acme.test,L\n"),
+            Mock(status_code=200, text='sf__Id,sf__Error,Email,LastName\n,"REQUIRED_FIELD_MISSING",l2@acme.test,L\n'),
+        ]
+        status = service.get_bulk_job("750JOB")
+
+        assert status["done"] is True
+        assert [o["success"] for o in status["outcomes"]] == [True, True, False]
+        assert status["outcomes"][2]["email"] == "l2@acme.test"
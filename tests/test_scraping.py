@@ -0,0 +1,270 @@
+"""Unit Tests for website scraping and contact extraction"""
+import asyncio
+from unittest.mock import patch
+from app.services.contact_extractor_service import ContactExtractorService
+
+
+STATIC_PAGE = """
+<html><body>
+<h1>Acme Plumbing</h1>
+<p>Family owned plumbing company serving the city since 1985. We fix leaks,
+install water heaters and handle emergency repairs around the clock.</p>
+<p>Call us any time or drop by the shop on Main Street for a free quote on
+your next bathroom or kitchen renovation project.</p>
+<a href="mailto:info@acme.test">Email us</a>
+<a href="https://www.facebook.com/acmeplumbing">Facebook</a>
+<a href="/about">About</a>
+</body></html>
+"""
+
+SPA_SHELL = """
+<html><head><script src="/static/js/main.js"></script></head>
+<body><noscript>You need to enable JavaScript to run this app.</noscript><div id="root"></div></body></html>
+"""
+
+
+class TestTieredCrawl:
+    """Test suite for the HTTP-first crawl tier"""
+
+    def test_looks_js_rendered(self):
+        """SPA shells are escalated, content pages are not"""
+        service = ContactExtractorService()
+        text, _ = service._parse_static_page(STATIC_PAGE, "https://acme.test")
+
+        assert service._looks_js_rendered(STATIC_PAGE, text) is False
+        assert service._looks_js_rendered(SPA_SHELL, "") is True
+
+    def test_static_pages_skip_browser(self):
+        """Static pages are parsed without launching the browser"""
+        service = ContactExtractorService()
+
+        with patch.object(service.scraper, "fetch_html", return_value=STATIC_PAGE), \
+                patch.object(service, "_crawl_with_browser") as mock_browser:
+            text, links = asyncio.run(service._crawl_urls(["https://acme.test", "https://acme.test/contact"]))
+
+        mock_browser.assert_not_called()
+        assert "info@acme.test" in text
+        assert "https://www.facebook.com/acmeplumbing" in links
+        assert "https://acme.test/about" not in links
+        assert service.stats.snapshot()["browser_launches_avoided"] == 1
+
+    def test_js_pages_escalate_to_browser(self):
+        """Only JS-rendered pages are sent to the browser"""
+        service = ContactExtractorService()
+
+        async def fake_browser(urls):
+            return "rendered", [], len(urls)
+
+        pages = {"https://acme.test": SPA_SHELL, "https://acme.test/contact": STATIC_PAGE}
+
+        with patch.object(service.scraper, "fetch_html", side_effect=lambda url, attempts=3, deadline=None: pages[url]), \
+                patch.object(service, "_crawl_with_browser", side_effect=fake_browser) as mock_browser:
+            text, _ = asyncio.run(service._crawl_urls(["https://acme.test", "https://acme.test/contact"]))
+
+        mock_browser.assert_called_once_with(["https://acme.test"])
+        assert "rendered" in text
+        assert service.stats.snapshot()["browser_launches"] == 1
+
+    def test_failed_homepage_is_not_refetched_by_discovery(self):
+        """A dead homepage is fetched once; discovery and page fetches share its deadline"""
+        service = ContactExtractorService()
+        fetched = []
+
+        def fetch(url, attempts=3, deadline=None):
+            fetched.append((url, deadline))
+            return None
+
+        async def fake_browser(urls):
+            return "", [], len(urls)
+
+        with patch.object(service.scraper, "fetch_html", side_effect=fetch), \
+                patch.object(service, "_crawl_with_browser", side_effect=fake_browser) as mock_browser:
+            asyncio.run(service._crawl_site("https://dead.test"))
+
+        urls = [url for url, _ in fetched]
+        assert urls.count("https://dead.test") == 1
+        assert "https://dead.test/robots.txt" in urls
+        assert any(url.startswith("https://dead.test/") and not url.endswith(".xml") for url in urls[2:])
+        assert len({deadline for _, deadline in fetched}) == 1 and fetched[0][1] is not None
+        mock_browser.assert_called_once_with(["https://dead.test"])
+
+
+class TestContactPageProbing:
+    """Test suite for concurrent contact-page probing"""
+
+    def _service(self, failure_threshold=2):
+        from app.services.web_scraper_service import WebScraperService, _HostCircuitBreaker
+
+        service = WebScraperService()
+        service._breaker = _HostCircuitBreaker(failure_threshold=failure_threshold)
+        return service
+
+    def test_first_good_contact_page_wins(self):
+        """Missing paths are skipped by the probe and a good page is returned"""
+        from unittest.mock import Mock
+
+        service = self._service()
+
+        def head(url, **kwargs):
+            return Mock(status_code=200 if url.endswith("/about") else 404)
+
+        def scrape(url, deadline=None):
+            if url.endswith("/about"):
+                return "About us " * 50
+            return "short"
+
+        with patch.object(service, "_scrape_page", return_value=("Welcome", "")), \
+                patch.object(service, "fetch_html", return_value=None), \
+                patch.object(service.session, "head", side_effect=head), \
+                patch.object(service, "scrape_website", side_effect=scrape):
+            content = service.scrape_contact_pages("https://acme.test")
+
+        assert content.startswith("About us")
+
+    def test_discovered_pages_replace_fixed_paths(self):
+        """Homepage links to localized contact pages are crawled instead of guessed paths"""
+        from unittest.mock import Mock
+
+        service = self._service()
+        homepage = (
+            '<a href="/blog/contact-form-tips">Blog</a>'
+            '<a href="/de/kontakt">Kontakt</a>'
+            '<a href="/impressum">Impressum</a>'
+            '<a href="https://other.test/contact">Partner</a>'
+        )
+        scraped = []
+
+        def scrape(url, deadline=None):
+            scraped.append(url)
+            return "Kontakt " * 50 if url.endswith("/de/kontakt") else None
+
+        with patch.object(service, "_scrape_page", return_value=("Willkommen", homepage)), \
+                patch.object(service, "fetch_html", return_value=None), \
+                patch.object(service.session, "head", return_value=Mock(status_code=200)), \
+                patch.object(service, "scrape_website", side_effect=scrape):
+            content = service.scrape_contact_pages("https://acme.test")
+
+        assert content.startswith("Kontakt")
+        assert not any(url.endswith(("/contact", "/team", "/people")) for url in scraped)
+        assert not any("other.test" in url for url in scraped)
+
+    def test_probe_verifies_certificates_first(self):
+        """Probes verify certificates and only skip verification after an SSL error"""
+        import time
+        import requests
+        from unittest.mock import Mock
+
+        service = self._service()
+        deadline = time.monotonic() + 10
+
+        with patch.object(service.session, "head", return_value=Mock(status_code=405)) as head, \
+                patch.object(service.session, "get", return_value=Mock(status_code=200)) as get:
+            assert service._probe("https://acme.test/contact", deadline)
+        assert "verify" not in head.call_args.kwargs and "verify" not in get.call_args.kwargs
+        assert get.call_args.kwargs["stream"] is True
+
+        def head(url, **kwargs):
+            if kwargs.get("verify", True):
+                raise requests.exceptions.SSLError("incomplete chain")
+            return Mock(status_code=200)
+
+        with patch.object(service.session, "head", side_effect=head) as mock_head:
+            assert service._probe("https://acme.test/contact", deadline)
+        assert [call.kwargs.get("verify", True) for call in mock_head.call_args_list] == [True, False]
+        assert not service._breaker.is_open("acme.test")
+
+    def test_contact_url_scoring(self):
+        """Contact and imprint pages outrank blog posts and assets"""
+        from app.services.contact_discovery_service import ContactDiscoveryService
+
+        score = ContactDiscoveryService.score_url
+        assert score("https://acme.test/kontakt") > score("https://acme.test/about")
+        assert score("https://acme.test/impressum") > score("https://acme.test/blog/contact-us-today")
+        assert score("https://acme.test/brochure-contact.pdf") == 0
+        assert score("https://acme.test/services") == 0
+
+    def test_unreachable_host_skips_contact_paths(self):
+        """A host that refuses connections is not probed path by path"""
+        import requests
+
+        service = self._service(failure_threshold=1)
+
+        with patch.object(service.session, "get", side_effect=requests.exceptions.ConnectionError("refused")) as mock_get, \
+                patch.object(service.session, "head") as mock_head:
+            content = service.scrape_contact_pages("https://dead.test")
+
+        assert content is None
+        assert mock_get.call_count == 1
+        mock_head.assert_not_called()
+
+
+class TestStreamingExtraction:
+    """Test suite for streaming HTML-to-text extraction"""
+
+    class _Response:
+        def __init__(self, body, content_type="text/html"):
+            self.body = body
+            self.headers = {"Content-Type": content_type}
+            self.chunks_read = 0
+
+        def iter_content(self, chunk_size=16384):
+            for offset in range(0, len(self.body), 64):
+                self.chunks_read += 1
+                yield self.body[offset:offset + 64]
+
+    def test_stream_matches_full_parse(self):
+        """Streaming output matches the BeautifulSoup path"""
+        from app.services.web_scraper_service import WebScraperService
+
+        scraper = WebScraperService()
+        body = STATIC_PAGE.replace("<body>", "<body><style>p {}</style><script>var a = '<p>x</p>';</script>")
+        body = body.replace("Family owned", "Family ówned").encode("utf-8")
+
+        streamed = scraper.stream_text(self._Response(body, "text/html; charset=utf-8"))
+
+        assert streamed == scraper.html_to_text(body)
+        assert "var a" not in streamed
+
+    def test_stream_stops_early(self):
+        """Downloading stops once enough text has been gathered"""
+        from app.services.web_scraper_service import WebScraperService
+
+        scraper = WebScraperService()
+        body = ("<html><body>" + "<p>plumbing services</p>" * 5000 + "</body></html>").encode("utf-8")
+        response = self._Response(body)
+
+        text = scraper.stream_text(response, max_chars=500)
+
+        assert len(text) >= 500
+        assert response.chunks_read < len(body) // 64 // 10
+
+
+class TestTextSections:
+    """Test suite for keyword section extraction"""
+
+    def test_duplicate_lines_use_their_own_context(self):
+        """Repeated lines get the context around each occurrence"""
+        from app.services.web_scraper_service import WebScraperService
+
+        text = "\n".join(["Email us", "a", "b", "c", "d", "e", "f", "Email us", "g"])
+        sections = WebScraperService().find_text_sections(text, ["email"])
+
+        assert sorted((s.start_line, s.end_line) for s in sections) == [(0, 3), (5, 9)]
+
+    def test_overlapping_windows_are_merged_and_ranked(self):
+        """Overlapping windows are emitted once and busier sections rank first"""
+        from app.services.web_scraper_service import WebScraperService
+
+        scraper = WebScraperService()
+        text = "\n".join(["Phone: 555", "x", "Email: a@b.test", "y", "z", "w", "v", "u", "Team", "t"])
+        sections = scraper.find_text_sections(text, ["PHONE", "email", "team"])
+
+        assert sections[0].start_line == 0 and sections[0].hits == 2
+        assert sections[0].keywords == ["email", "phone"]
+        assert scraper.extract_text_section(text, ["phone", "email"]).count("Phone: 555") == 1
+
+    def test_no_keywords_falls_back_to_prefix(self):
+        """Without matches the first 1000 characters are returned"""
+        from app.services.web_scraper_service import WebScraperService
+
+        assert WebScraperService().extract_text_section("nothing here", ["email"]) == "nothing here"
@@ -13,3 +13,130 @@ def test_calculate_distance():
     
     # Check if distance is approximately correct (within 50 km)
     assert 3900 < distance < 4000, f"Expected distance ~3944 km, got {distance} km"
+
+
+def test_pooled_session_reuses_connections():
+    """Keep-alive requests to one host share a single connection"""
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    from app.utils.http_client import PooledSession
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"ok")
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        session = PooledSession("test", pool_maxsize=2, retries=0)
+        for _ in range(5):
+            assert session.get(f"http://127.0.0.1:{server.server_port}/", timeout=5).text == "ok"
+    finally:
+        server.shutdown()
+
+    stats = session.stats.snapshot()
+    assert stats["requests"] == 5
+    assert stats["new_connections"] == 1
+    assert stats["reuse_rate"] == 0.8
+
+
+def test_sqlite_engine_uses_wal(tmp_path):
+    """File-backed SQLite engines are tuned on every new connection"""
+    from app.db.session import create_db_engine
+
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'tuned.sqlite'}")
+    with engine.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+        assert conn.exec_driver_sql("PRAGMA synchronous").scalar() == 1
+        assert conn.exec_driver_sql("PRAGMA busy_timeout").scalar() > 0
+    engine.dispose()
+
+
+def test_async_url_replaces_sync_driver():
+    """The async driver is chosen from the backend, whatever driver the URL names"""
+    from app.db.session import _async_url
+
+    assert _async_url("sqlite:///./leadgen.sqlite") == "sqlite+aiosqlite:///./leadgen.sqlite"
+    assert _async_url("postgresql+psycopg2://u:p@db/leads") == "postgresql+asyncpg://u:p@db/leads"
+    assert _async_url("mysql+pymysql://u:p@db/leads") == "mysql+aiomysql://u:p@db/leads"
+
+
+def test_async_session_reads_and_writes(tmp_path):
+    """An AsyncSession on the derived URL is tuned like the sync engine and can write and query"""
+    import asyncio
+    from sqlalchemy import select, text
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+    from app.db import models
+    from app.db.session import Base, _async_url, create_async_db_engine
+
+    async def run():
+        engine = create_async_db_engine(_async_url(f"sqlite:///{tmp_path / 'async.sqlite'}"))
+        try:
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+                journal_mode = (await conn.execute(text("PRAGMA journal_mode"))).scalar()
+            async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+                db.add(models.User(google_sub="sub-1", email="ann@acme.test", name="Ann", credits=3))
+                await db.commit()
+                user = (await db.execute(select(models.User).where(models.User.email == "ann@acme.test"))).scalar_one()
+            return journal_mode, user.credits
+        finally:
+            await engine.dispose()
+
+    assert asyncio.run(run()) == ("wal", 3)
+
+
+def test_json_model_response_is_compact_unless_pretty():
+    """Model responses render the same document as FastAPI, compact by default"""
+    import json
+    from datetime import datetime
+    from fastapi.encoders import jsonable_encoder
+    from app.schemas.business import BusinessResponse, SearchResultsResponse
+    from app.utils.responses import JSONModelResponse
+
+    payload = SearchResultsResponse(
+        total_results=1,
+        results=[BusinessResponse(name="Café Olé", place_id="p1", latitude=1.5, longitude=-2.0)],
+        query={"query": "cafe", "at": datetime(2024, 1, 2, 3, 4, 5)},
+    )
+    compact = JSONModelResponse(payload).body
+    pretty = JSONModelResponse(payload, pretty=True).body
+
+    assert json.loads(compact) == json.loads(pretty) == jsonable_encoder(payload)
+    assert b"\n" not in compact and b'\n  "results": [' in pretty
+    assert "Café Olé".encode() in compact
+    assert json.loads(JSONModelResponse({"results": [payload.results[0]]}).body)["results"][0]["name"] == "Café Olé"
+
+
+def test_normalize_results_consistency_single_pass():
+    """Rows, columns and streamed rows share one fixed schema"""
+    from app.utils.helpers import (
+        iter_normalized_results,
+        normalize_results_columnar,
+        normalize_results_consistency,
+        result_columns,
+    )
+
+    results = [{"name": "A", "phone": None}, {"name": "B", "website": "b.test"}, {"name": "C", "phone": None}]
+
+    assert normalize_results_consistency(results) == [
+        {"name": "A", "phone": None, "website": None},
+        {"name": "B", "phone": None, "website": "b.test"},
+        {"name": "C", "phone": None, "website": None},
+    ]
+    assert normalize_results_consistency(results, ["website", "phone", "name"]) == [
+        {"website": None, "name": "A"},
+        {"website": "b.test", "name": "B"},
+        {"website": None, "name": "C"},
+    ]
+    assert normalize_results_columnar(results, ["website", "phone"]) == {"website": [None, "b.test", None]}
+    streamed = iter_normalized_results(iter(results), columns=result_columns(results))
+    assert list(streamed) == normalize_results_consistency(results)
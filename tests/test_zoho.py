@@ -0,0 +1,57 @@
+"""Unit Tests for Zoho Service"""
+import pytest
+import requests
+from unittest.mock import Mock, patch
+from app.services.zoho_service import ZohoService
+
+
+class TestZohoBatch:
+    """Test suite for Zoho batch insert/upsert"""
+
+    @pytest.fixture
+    def service(self):
+        """Create a Zoho service instance for testing"""
+        return ZohoService(access_token="zoho-test-token")
+
+    @patch('requests.Session.post')
+    def test_upsert_chunks_and_reports_per_record(self, mock_post, service):
+        """Test leads are upserted 100 at a time with Email as the duplicate check"""
+        def respond(url, json=None, **kwargs):
+            items = [
+                {"status": "success", "code": "SUCCESS", "action": "update" if i % 2 else "insert", "details": {"id": str(i)}}
+                for i in range(len(json["data"]))
+            ]
+            items[-1] = {"status": "error", "code": "MANDATORY_NOT_FOUND", "message": "required field not found"}
+            return Mock(status_code=202, json=Mock(return_value={"data": items}))
+        mock_post.side_effect = respond
+
+        leads = [{"email": f"lead{i}@acme.test", "company": "Acme"} for i in range(150)]
+        result = service.batch_upsert_leads(leads)
+
+        assert mock_post.call_count == 2
+        first = next(call for call in mock_post.call_args_list if call.kwargs["json"]["data"][0]["Email"] == "lead0@acme.test")
+        assert first.args[0].endswith("/Leads/upsert")
+        assert first.kwargs["json"]["duplicate_check_fields"] == ["Email"]
+        assert len(first.kwargs["json"]["data"]) == 100
+        assert first.kwargs["json"]["data"][0] == {"Email": "lead0@acme.test", "Company": "Acme", "Last_Name": "Acme"}
+        assert result["failed"] == 2
+        assert result["created"] + result["updated"] == 148
+        assert result["outcomes"][99]["error"].startswith("MANDATORY_NOT_FOUND")
+
+    @patch('time.sleep')
+    @patch('requests.Session.post')
+    def test_short_response_fails_missing_records(self, mock_post, mock_sleep, service):
+        """Test records without a result are failed and inserts are not resent after a timeout"""
+        mock_post.return_value = Mock(status_code=201, json=Mock(return_value={
+            "data": [{"status": "success", "code": "SUCCESS", "action": "insert", "details": {"id": "1"}}]
+        }))
+        result = service.batch_upsert_leads([{"email": "a@acme.test"}, {"email": "b@acme.test"}])
+
+        assert result["created"] == 1 and result["failed"] == 1
+        assert result["outcomes"][1]["success"] is False
+        assert result["error"] == "No result returned for record"
+
+        mock_post.reset_mock()
+        mock_post.side_effect = requests.exceptions.ReadTimeout("read timed out")
+        inserted = service.batch_create_leads([{"email": "a@acme.test"}])
+        assert mock_post.call_count == 1 and inserted["failed"] == 1